@@ -0,0 +1,427 @@
+"""
+WGS84 Geodesy
+
+Precise ellipsoidal conversions for long-range targeting:
+- Geodetic <-> ECEF (closed-form Heikkinen inverse, no iteration)
+- ECEF <-> local ENU/NED tangent plane
+- Vincenty inverse (distance, bearings) and direct (destination) solutions
+
+Array functions accept scalars or NumPy arrays and broadcast. For hot scalar
+paths, LocalTangentPlane precomputes the per-reference-point coefficients once
+and then converts single points with plain `math` calls.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_B = WGS84_A * (1.0 - WGS84_F)
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)          # first eccentricity squared
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)       # second eccentricity squared
+
+VINCENTY_MAX_ITERATIONS = 200
+VINCENTY_TOLERANCE = 1e-12
+
+
+# ====================================================================
+# Radii of curvature
+# ====================================================================
+
+def radii_of_curvature(lat_deg):
+    """Meridian (M) and prime vertical (N) radii of curvature in meters."""
+    sin_lat = np.sin(np.radians(lat_deg))
+    w2 = 1.0 - WGS84_E2 * sin_lat * sin_lat
+    n = WGS84_A / np.sqrt(w2)
+    m = n * (1.0 - WGS84_E2) / w2
+    return m, n
+
+
+def ray_coefficients(lat0_deg, alt0_m, north, east):
+    """
+    Local expansion of rays leaving (lat0, alt0) along unit NED directions.
+
+    Returns (dlat_dt, dlon_dt, curvature) such that, for ray length t,
+    lat ~ lat0 + t*dlat_dt, lon ~ lon0 + t*dlon_dt and the ray height above
+    the ellipsoid is alt0 - t*down + curvature*t**2 (the Earth falling away
+    under a straight line of sight). Vectorized counterpart of
+    LocalTangentPlane.ray_coefficients.
+    """
+    m, n = radii_of_curvature(lat0_deg)
+    meridian = m + alt0_m
+    normal = n + alt0_m
+    dlat_dt = np.degrees(north / meridian)
+    dlon_dt = np.degrees(east / (normal * np.maximum(1e-9, np.cos(np.radians(lat0_deg)))))
+    # Euler's formula: normal section radius along the ray azimuth, times h^2/2
+    curvature = 0.5 * (north * north / meridian + east * east / normal)
+    return dlat_dt, dlon_dt, curvature
+
+
+# ====================================================================
+# Geodetic <-> ECEF
+# ====================================================================
+
+def geodetic_to_ecef(lat_deg, lon_deg, alt_m):
+    """Convert geodetic coordinates (degrees, meters) to ECEF (meters)."""
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+    x = (n + alt_m) * cos_lat * np.cos(lon)
+    y = (n + alt_m) * cos_lat * np.sin(lon)
+    z = (n * (1.0 - WGS84_E2) + alt_m) * sin_lat
+    return x, y, z
+
+
+def ecef_to_geodetic(x, y, z):
+    """Convert ECEF (meters) to geodetic coordinates (degrees, degrees, meters).
+
+    Uses Heikkinen's closed-form solution (sub-millimetre on Earth's surface).
+    """
+    p = np.hypot(x, y)
+    z2 = z * z
+    f = 54.0 * WGS84_B * WGS84_B * z2
+    g = p * p + (1.0 - WGS84_E2) * z2 - WGS84_E2 * (WGS84_A * WGS84_A - WGS84_B * WGS84_B)
+    c = WGS84_E2 * WGS84_E2 * f * p * p / (g * g * g)
+    s = np.cbrt(1.0 + c + np.sqrt(c * c + 2.0 * c))
+    k = s + 1.0 + 1.0 / s
+    pp = f / (3.0 * k * k * g * g)
+    q = np.sqrt(1.0 + 2.0 * WGS84_E2 * WGS84_E2 * pp)
+    r0 = (-(pp * WGS84_E2 * p) / (1.0 + q)
+          + np.sqrt(np.maximum(0.0, 0.5 * WGS84_A * WGS84_A * (1.0 + 1.0 / q)
+                               - pp * (1.0 - WGS84_E2) * z2 / (q * (1.0 + q))
+                               - 0.5 * pp * p * p)))
+    u = np.hypot(p - WGS84_E2 * r0, z)
+    v = np.sqrt((p - WGS84_E2 * r0) ** 2 + (1.0 - WGS84_E2) * z2)
+    z0 = WGS84_B * WGS84_B * z / (WGS84_A * v)
+    alt = u * (1.0 - WGS84_B * WGS84_B / (WGS84_A * v))
+    lat = np.degrees(np.arctan2(z + WGS84_EP2 * z0, p))
+    lon = np.degrees(np.arctan2(y, x))
+    return lat, lon, alt
+
+
+# ====================================================================
+# Local tangent plane (ENU / NED)
+# ====================================================================
+
+def _enu_rotation(lat0_deg, lon0_deg):
+    lat0 = np.radians(lat0_deg)
+    lon0 = np.radians(lon0_deg)
+    return np.sin(lat0), np.cos(lat0), np.sin(lon0), np.cos(lon0)
+
+
+def ecef_to_enu(x, y, z, lat0_deg, lon0_deg, alt0_m):
+    """ECEF point to East/North/Up offsets from a geodetic reference."""
+    x0, y0, z0 = geodetic_to_ecef(lat0_deg, lon0_deg, alt0_m)
+    dx, dy, dz = x - x0, y - y0, z - z0
+    sin_lat, cos_lat, sin_lon, cos_lon = _enu_rotation(lat0_deg, lon0_deg)
+    east = -sin_lon * dx + cos_lon * dy
+    north = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+    up = cos_lat * cos_lon * dx + cos_lat * sin_lon * dy + sin_lat * dz
+    return east, north, up
+
+
+def enu_to_ecef(east, north, up, lat0_deg, lon0_deg, alt0_m):
+    """East/North/Up offsets from a geodetic reference to ECEF."""
+    x0, y0, z0 = geodetic_to_ecef(lat0_deg, lon0_deg, alt0_m)
+    sin_lat, cos_lat, sin_lon, cos_lon = _enu_rotation(lat0_deg, lon0_deg)
+    x = x0 - sin_lon * east - sin_lat * cos_lon * north + cos_lat * cos_lon * up
+    y = y0 + cos_lon * east - sin_lat * sin_lon * north + cos_lat * sin_lon * up
+    z = z0 + cos_lat * north + sin_lat * up
+    return x, y, z
+
+
+def geodetic_to_ned(lat_deg, lon_deg, alt_m, lat0_deg, lon0_deg, alt0_m):
+    """Geodetic point to North/East/Down offsets from a geodetic reference."""
+    east, north, up = ecef_to_enu(*geodetic_to_ecef(lat_deg, lon_deg, alt_m),
+                                  lat0_deg, lon0_deg, alt0_m)
+    return north, east, -up
+
+
+def ned_to_geodetic(north, east, down, lat0_deg, lon0_deg, alt0_m):
+    """North/East/Down offsets from a geodetic reference to geodetic coordinates."""
+    return ecef_to_geodetic(*enu_to_ecef(east, north, -down, lat0_deg, lon0_deg, alt0_m))
+
+
+class LocalTangentPlane:
+    """NED tangent plane at a fixed reference with precomputed coefficients.
+
+    Scalar conversions use only `math` and the cached reference ECEF origin,
+    rotation terms and radii of curvature, so they are as cheap as the old
+    spherical approximation while exact on the WGS84 ellipsoid.
+    """
+
+    def __init__(self, lat0_deg: float, lon0_deg: float, alt0_m: float = 0.0):
+        self.lat0 = lat0_deg
+        self.lon0 = lon0_deg
+        self.alt0 = alt0_m
+
+        lat0 = math.radians(lat0_deg)
+        lon0 = math.radians(lon0_deg)
+        self.sin_lat = math.sin(lat0)
+        self.cos_lat = math.cos(lat0)
+        self.sin_lon = math.sin(lon0)
+        self.cos_lon = math.cos(lon0)
+
+        w2 = 1.0 - WGS84_E2 * self.sin_lat * self.sin_lat
+        n = WGS84_A / math.sqrt(w2)
+        self.meridian_radius = n * (1.0 - WGS84_E2) / w2
+        self.normal_radius = n
+        self.x0 = (n + alt0_m) * self.cos_lat * self.cos_lon
+        self.y0 = (n + alt0_m) * self.cos_lat * self.sin_lon
+        self.z0 = (n * (1.0 - WGS84_E2) + alt0_m) * self.sin_lat
+
+    def matches(self, lat0_deg: float, lon0_deg: float, alt0_m: float) -> bool:
+        return lat0_deg == self.lat0 and lon0_deg == self.lon0 and alt0_m == self.alt0
+
+    def ned_to_geodetic(self, north: float, east: float, down: float) -> Tuple[float, float, float]:
+        """NED offset (meters) to (lat, lon, alt) in degrees/meters."""
+        up = -down
+        x = self.x0 - self.sin_lon * east - self.sin_lat * self.cos_lon * north + self.cos_lat * self.cos_lon * up
+        y = self.y0 + self.cos_lon * east - self.sin_lat * self.sin_lon * north + self.cos_lat * self.sin_lon * up
+        z = self.z0 + self.cos_lat * north + self.sin_lat * up
+        return _ecef_to_geodetic_scalar(x, y, z)
+
+    def geodetic_to_ned(self, lat_deg: float, lon_deg: float, alt_m: float) -> Tuple[float, float, float]:
+        """(lat, lon, alt) to NED offset (meters) from the reference."""
+        lat = math.radians(lat_deg)
+        lon = math.radians(lon_deg)
+        sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+        n = WGS84_A / math.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+        dx = (n + alt_m) * cos_lat * math.cos(lon) - self.x0
+        dy = (n + alt_m) * cos_lat * math.sin(lon) - self.y0
+        dz = (n * (1.0 - WGS84_E2) + alt_m) * sin_lat - self.z0
+        east = -self.sin_lon * dx + self.cos_lon * dy
+        north = -self.sin_lat * self.cos_lon * dx - self.sin_lat * self.sin_lon * dy + self.cos_lat * dz
+        up = self.cos_lat * self.cos_lon * dx + self.cos_lat * self.sin_lon * dy + self.sin_lat * dz
+        return north, east, -up
+
+    def ray_coefficients(self, north: float, east: float) -> Tuple[float, float, float]:
+        """Local expansion of a ray leaving the reference along unit (north, east, down).
+
+        Returns (dlat_dt, dlon_dt, curvature) such that, for ray length t,
+        lat ~ lat0 + t*dlat_dt, lon ~ lon0 + t*dlon_dt and the height above
+        the ellipsoid is alt0 - t*down + curvature*t**2 (Earth falling away).
+        """
+        meridian = self.meridian_radius + self.alt0
+        normal = self.normal_radius + self.alt0
+        dlat_dt = math.degrees(north / meridian)
+        dlon_dt = math.degrees(east / (normal * max(1e-9, self.cos_lat)))
+        curvature = 0.5 * (north * north / meridian + east * east / normal)
+        return dlat_dt, dlon_dt, curvature
+
+
+def _ecef_to_geodetic_scalar(x: float, y: float, z: float) -> Tuple[float, float, float]:
+    """Scalar (math-only) version of ecef_to_geodetic."""
+    a2 = WGS84_A * WGS84_A
+    b2 = WGS84_B * WGS84_B
+    p2 = x * x + y * y
+    p = math.sqrt(p2)
+    z2 = z * z
+    f = 54.0 * b2 * z2
+    g = p2 + (1.0 - WGS84_E2) * z2 - WGS84_E2 * (a2 - b2)
+    c = WGS84_E2 * WGS84_E2 * f * p2 / (g * g * g)
+    s = (1.0 + c + math.sqrt(c * c + 2.0 * c)) ** (1.0 / 3.0)
+    k = s + 1.0 + 1.0 / s
+    pp = f / (3.0 * k * k * g * g)
+    q = math.sqrt(1.0 + 2.0 * WGS84_E2 * WGS84_E2 * pp)
+    r0 = (-(pp * WGS84_E2 * p) / (1.0 + q)
+          + math.sqrt(max(0.0, 0.5 * a2 * (1.0 + 1.0 / q)
+                          - pp * (1.0 - WGS84_E2) * z2 / (q * (1.0 + q))
+                          - 0.5 * pp * p2)))
+    t = p - WGS84_E2 * r0
+    u = math.sqrt(t * t + z2)
+    v = math.sqrt(t * t + (1.0 - WGS84_E2) * z2)
+    z0 = b2 * z / (WGS84_A * v)
+    alt = u * (1.0 - b2 / (WGS84_A * v))
+    lat = math.degrees(math.atan2(z + WGS84_EP2 * z0, p))
+    lon = math.degrees(math.atan2(y, x))
+    return lat, lon, alt
+
+
+# ====================================================================
+# Geodesics (Vincenty)
+# ====================================================================
+
+def vincenty_inverse(lat1_deg, lon1_deg, lat2_deg, lon2_deg):
+    """
+    Geodesic distance and bearings between points on the WGS84 ellipsoid.
+
+    Vectorized Vincenty inverse solution. Nearly antipodal pairs that do not
+    converge fall back to the spherical (haversine) result.
+
+    Returns:
+        (distance_m, initial_bearing_deg, final_bearing_deg), bearings in [0, 360)
+    """
+    if all(isinstance(v, (int, float)) for v in (lat1_deg, lon1_deg, lat2_deg, lon2_deg)):
+        return _vincenty_inverse_scalar(lat1_deg, lon1_deg, lat2_deg, lon2_deg)
+
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (lat1_deg, lon1_deg, lat2_deg, lon2_deg))
+    )
+    scalar = lat1.ndim == 0
+
+    u1 = np.arctan((1.0 - WGS84_F) * np.tan(np.radians(lat1)))
+    u2 = np.arctan((1.0 - WGS84_F) * np.tan(np.radians(lat2)))
+    sin_u1, cos_u1 = np.sin(u1), np.cos(u1)
+    sin_u2, cos_u2 = np.sin(u2), np.cos(u2)
+    big_l = np.radians(lon2 - lon1)
+
+    lam = big_l.copy()
+    converged = np.zeros(lam.shape, dtype=bool)
+    for _ in range(VINCENTY_MAX_ITERATIONS):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        safe_sin_sigma = np.where(sin_sigma == 0.0, 1.0, sin_sigma)
+        sin_alpha = cos_u1 * cos_u2 * sin_lam / safe_sin_sigma
+        cos2_alpha = 1.0 - sin_alpha * sin_alpha
+        safe_cos2_alpha = np.where(cos2_alpha == 0.0, 1.0, cos2_alpha)
+        cos_2sigma_m = np.where(cos2_alpha == 0.0, 0.0,
+                                cos_sigma - 2.0 * sin_u1 * sin_u2 / safe_cos2_alpha)
+        c = WGS84_F / 16.0 * cos2_alpha * (4.0 + WGS84_F * (4.0 - 3.0 * cos2_alpha))
+        lam_prev = lam
+        lam = big_l + (1.0 - c) * WGS84_F * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2))
+        )
+        converged = np.abs(lam - lam_prev) < VINCENTY_TOLERANCE
+        if converged.all():
+            break
+
+    u_sq = cos2_alpha * WGS84_EP2
+    big_a = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+    big_b = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+    delta_sigma = big_b * sin_sigma * (cos_2sigma_m + big_b / 4.0 * (
+        cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2)
+        - big_b / 6.0 * cos_2sigma_m * (-3.0 + 4.0 * sin_sigma ** 2) * (-3.0 + 4.0 * cos_2sigma_m ** 2)
+    ))
+    distance = WGS84_B * big_a * (sigma - delta_sigma)
+
+    sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+    initial = np.degrees(np.arctan2(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)) % 360.0
+    final = np.degrees(np.arctan2(cos_u1 * sin_lam, -sin_u1 * cos_u2 + cos_u1 * sin_u2 * cos_lam)) % 360.0
+
+    if not converged.all():
+        distance = np.where(converged, distance, _haversine(lat1, lon1, lat2, lon2))
+
+    if scalar:
+        return float(distance), float(initial), float(final)
+    return distance, initial, final
+
+
+def _vincenty_inverse_scalar(lat1_deg: float, lon1_deg: float,
+                             lat2_deg: float, lon2_deg: float) -> Tuple[float, float, float]:
+    """Scalar (math-only) version of vincenty_inverse for per-point hot paths."""
+    u1 = math.atan((1.0 - WGS84_F) * math.tan(math.radians(lat1_deg)))
+    u2 = math.atan((1.0 - WGS84_F) * math.tan(math.radians(lat2_deg)))
+    sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+    sin_u2, cos_u2 = math.sin(u2), math.cos(u2)
+    big_l = math.radians(lon2_deg - lon1_deg)
+
+    lam = big_l
+    for _ in range(VINCENTY_MAX_ITERATIONS):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        if sin_sigma == 0.0:
+            return 0.0, 0.0, 0.0  # coincident points
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cos_u1 * cos_u2 * sin_lam / sin_sigma
+        cos2_alpha = 1.0 - sin_alpha * sin_alpha
+        cos_2sigma_m = cos_sigma - 2.0 * sin_u1 * sin_u2 / cos2_alpha if cos2_alpha != 0.0 else 0.0
+        c = WGS84_F / 16.0 * cos2_alpha * (4.0 + WGS84_F * (4.0 - 3.0 * cos2_alpha))
+        lam_prev = lam
+        lam = big_l + (1.0 - c) * WGS84_F * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2))
+        )
+        if abs(lam - lam_prev) < VINCENTY_TOLERANCE:
+            break
+    else:
+        # Nearly antipodal: no convergence, spherical fallback
+        return float(_haversine(lat1_deg, lon1_deg, lat2_deg, lon2_deg)), 0.0, 0.0
+
+    u_sq = cos2_alpha * WGS84_EP2
+    big_a = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+    big_b = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+    delta_sigma = big_b * sin_sigma * (cos_2sigma_m + big_b / 4.0 * (
+        cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2)
+        - big_b / 6.0 * cos_2sigma_m * (-3.0 + 4.0 * sin_sigma ** 2) * (-3.0 + 4.0 * cos_2sigma_m ** 2)
+    ))
+    distance = WGS84_B * big_a * (sigma - delta_sigma)
+
+    sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+    initial = math.degrees(math.atan2(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)) % 360.0
+    final = math.degrees(math.atan2(cos_u1 * sin_lam, -sin_u1 * cos_u2 + cos_u1 * sin_u2 * cos_lam)) % 360.0
+    return distance, initial, final
+
+
+def vincenty_direct(lat_deg, lon_deg, bearing_deg, distance_m):
+    """
+    Destination point given start, initial bearing and geodesic distance.
+
+    Vectorized Vincenty direct solution on the WGS84 ellipsoid.
+
+    Returns:
+        (lat_deg, lon_deg, final_bearing_deg)
+    """
+    lat, lon, bearing, distance = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (lat_deg, lon_deg, bearing_deg, distance_m))
+    )
+    scalar = lat.ndim == 0
+
+    alpha1 = np.radians(bearing)
+    sin_alpha1, cos_alpha1 = np.sin(alpha1), np.cos(alpha1)
+    tan_u1 = (1.0 - WGS84_F) * np.tan(np.radians(lat))
+    cos_u1 = 1.0 / np.sqrt(1.0 + tan_u1 * tan_u1)
+    sin_u1 = tan_u1 * cos_u1
+    sigma1 = np.arctan2(tan_u1, cos_alpha1)
+    sin_alpha = cos_u1 * sin_alpha1
+    cos2_alpha = 1.0 - sin_alpha * sin_alpha
+    u_sq = cos2_alpha * WGS84_EP2
+    big_a = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+    big_b = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+
+    sigma = distance / (WGS84_B * big_a)
+    for _ in range(VINCENTY_MAX_ITERATIONS):
+        cos_2sigma_m = np.cos(2.0 * sigma1 + sigma)
+        sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+        delta_sigma = big_b * sin_sigma * (cos_2sigma_m + big_b / 4.0 * (
+            cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2)
+            - big_b / 6.0 * cos_2sigma_m * (-3.0 + 4.0 * sin_sigma ** 2) * (-3.0 + 4.0 * cos_2sigma_m ** 2)
+        ))
+        sigma_prev = sigma
+        sigma = distance / (WGS84_B * big_a) + delta_sigma
+        if np.all(np.abs(sigma - sigma_prev) < VINCENTY_TOLERANCE):
+            break
+
+    cos_2sigma_m = np.cos(2.0 * sigma1 + sigma)
+    sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+    tmp = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alpha1
+    lat2 = np.arctan2(sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alpha1,
+                      (1.0 - WGS84_F) * np.hypot(sin_alpha, tmp))
+    lam = np.arctan2(sin_sigma * sin_alpha1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alpha1)
+    c = WGS84_F / 16.0 * cos2_alpha * (4.0 + WGS84_F * (4.0 - 3.0 * cos2_alpha))
+    big_l = lam - (1.0 - c) * WGS84_F * sin_alpha * (
+        sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2))
+    )
+    lon2 = (lon + np.degrees(big_l) + 540.0) % 360.0 - 180.0
+    final = np.degrees(np.arctan2(sin_alpha, -tmp)) % 360.0
+
+    if scalar:
+        return float(np.degrees(lat2)), float(lon2), float(final)
+    return np.degrees(lat2), lon2, final
+
+
+def geodesic_distance(lat1_deg, lon1_deg, lat2_deg, lon2_deg):
+    """Geodesic distance in meters (Vincenty)."""
+    return vincenty_inverse(lat1_deg, lon1_deg, lat2_deg, lon2_deg)[0]
+
+
+def _haversine(lat1_deg, lon1_deg, lat2_deg, lon2_deg):
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1_deg, lon1_deg, lat2_deg, lon2_deg))
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 2.0 * WGS84_A * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
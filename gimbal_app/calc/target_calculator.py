@@ -1,5 +1,8 @@
 from ..shared import *
+import functools
 import numpy as np
+from . import geodesy
+from .geodesy import LocalTangentPlane
 from typing import Protocol
 from dataclasses import dataclass
 
@@ -30,6 +33,46 @@ class GimbalAngles:
     pitch: float  # radians, negative = down
     yaw: float    # radians, positive = right
 
+@dataclass
+class TargetingSigmas:
+    """1-sigma input errors used for target uncertainty propagation."""
+    gps_horizontal_m: float = 2.5   # per axis (north, east)
+    altitude_m: float = 3.0
+    attitude_deg: float = 0.5       # UAV roll and pitch
+    heading_deg: float = 2.0        # UAV yaw
+    gimbal_deg: float = 0.3         # gimbal pitch and yaw
+    dem_m: float = 8.0              # DEM vertical accuracy
+    
+    @classmethod
+    def from_config(cls) -> 'TargetingSigmas':
+        return cls(
+            gps_horizontal_m=Config.TARGET_SIGMA_GPS_M,
+            altitude_m=Config.TARGET_SIGMA_ALT_M,
+            attitude_deg=Config.TARGET_SIGMA_ATTITUDE_DEG,
+            heading_deg=Config.TARGET_SIGMA_HEADING_DEG,
+            gimbal_deg=Config.TARGET_SIGMA_GIMBAL_DEG,
+            dem_m=Config.TARGET_SIGMA_DEM_M
+        )
+
+@dataclass
+class TargetUncertainty:
+    """Horizontal error ellipse of a target fix (north/east plane)."""
+    semi_major_m: float      # 1-sigma
+    semi_minor_m: float      # 1-sigma
+    orientation_deg: float   # bearing of the major axis from true north, [0, 180)
+    cep50_m: float           # radius containing 50% of fixes around the nominal target
+    bias_north_m: float      # mean sample offset from the nominal target
+    bias_east_m: float
+    samples: int             # Monte Carlo samples that hit terrain
+    hit_fraction: float      # share of samples that hit terrain
+    
+    def ellipse_axes(self, scale: float = 1.0) -> tuple[float, float]:
+        """Semi-axes scaled e.g. by CONFIDENCE_95_SCALE for the 95% ellipse."""
+        return self.semi_major_m * scale, self.semi_minor_m * scale
+
+# Chi-square (2 dof) scale from 1-sigma to 95% error ellipse: sqrt(-2 ln 0.05)
+CONFIDENCE_95_SCALE = math.sqrt(-2.0 * math.log(0.05))
+
 @dataclass
 class TargetingResult:
     """Result of 3D targeting calculation."""
@@ -39,6 +82,66 @@ class TargetingResult:
     converged: bool
     final_error: float  # meters
     processing_time: float  # seconds
+    uncertainty: Optional[TargetUncertainty] = None  # set when sigmas are given
+
+@dataclass
+class BatchTargetingResult:
+    """Result of a batched 3D targeting calculation (arrays, one entry per pose)."""
+    lat: np.ndarray          # degrees, NaN where no intersection was found
+    lon: np.ndarray          # degrees, NaN where no intersection was found
+    alt: np.ndarray          # terrain altitude at target, NaN where not found
+    raw_lat: np.ndarray      # flat earth estimate
+    raw_lon: np.ndarray
+    raw_alt: np.ndarray
+    converged: np.ndarray    # bool
+    iterations: np.ndarray   # terrain samples taken per ray
+    final_error: np.ndarray  # meters, inf where not converged
+    processing_time: float   # seconds for the whole batch
+
+# Pointing vector in NED (north, east, down), unit length
+PointingVector = Tuple[float, float, float]
+
+# Memoized pointing vectors: angle quantum (~0.6 millidegree, ~6 cm at 6 km)
+# and number of distinct attitudes kept
+POINTING_CACHE_QUANTUM_RAD = 1e-5
+POINTING_CACHE_SIZE = 4096
+_POINTING_CACHE_INV_QUANTUM = 1.0 / POINTING_CACHE_QUANTUM_RAD
+
+def pointing_vector_ned(gimbal_pitch: float, gimbal_yaw: float,
+                        roll: float, pitch: float, yaw: float) -> PointingVector:
+    """
+    Closed-form NED pointing vector of the gimbal +X axis (angles in radians).
+    
+    Equivalent to R_uav(roll, pitch, yaw) @ R_gimbal(0, gimbal_pitch, gimbal_yaw) @ [1, 0, 0]
+    with ZYX rotations, expanded so no matrices are built.
+    """
+    cos, sin = math.cos, math.sin
+    cgp = cos(gimbal_pitch)
+    gx = cgp * cos(gimbal_yaw)
+    gy = cgp * sin(gimbal_yaw)
+    gz = -sin(gimbal_pitch)
+    
+    cr, sr = cos(roll), sin(roll)
+    cp, sp = cos(pitch), sin(pitch)
+    cy, sy = cos(yaw), sin(yaw)
+    
+    north = cy*cp*gx + (cy*sp*sr - sy*cr)*gy + (cy*sp*cr + sy*sr)*gz
+    east = sy*cp*gx + (sy*sp*sr + cy*cr)*gy + (sy*sp*cr - cy*sr)*gz
+    down = -sp*gx + cp*sr*gy + cp*cr*gz
+    return north, east, down
+
+@functools.lru_cache(maxsize=POINTING_CACHE_SIZE)
+def _quantized_pointing_vector(gimbal_pitch_q: int, gimbal_yaw_q: int,
+                               roll_q: int, pitch_q: int, yaw_q: int) -> PointingVector:
+    q = POINTING_CACHE_QUANTUM_RAD
+    return pointing_vector_ned(gimbal_pitch_q * q, gimbal_yaw_q * q, roll_q * q, pitch_q * q, yaw_q * q)
+
+def cached_pointing_vector_ned(gimbal_pitch: float, gimbal_yaw: float,
+                               roll: float, pitch: float, yaw: float) -> PointingVector:
+    """pointing_vector_ned memoized on angles quantized to POINTING_CACHE_QUANTUM_RAD."""
+    inv_q = _POINTING_CACHE_INV_QUANTUM
+    return _quantized_pointing_vector(round(gimbal_pitch * inv_q), round(gimbal_yaw * inv_q),
+                                      round(roll * inv_q), round(pitch * inv_q), round(yaw * inv_q))
 
 class TerrainService(Protocol):
     """Protocol for terrain elevation services."""
@@ -49,21 +152,47 @@ class TerrainService(Protocol):
 class TargetCalculator:
     """Enhanced target position calculation with 3D corrections and terrain awareness"""
     
-    # Earth radius in meters (WGS84)
-    EARTH_RADIUS = 6378137.0
+    # WGS84 semi-major axis in meters
+    EARTH_RADIUS = geodesy.WGS84_A
+    
+    # Fixed-step batch solver (terrain services without a min/max pyramid): ray
+    # step (about half an SRTM1 post) and steps sampled per pass. Terrain that
+    # rises above the ray for less than one step can be stepped over.
+    BATCH_STEP_M = 15.0
+    BATCH_CHUNK_STEPS = 64
+    
+    # Lowest land surface on Earth is ~-430 m; rays below this cannot hit terrain
+    MIN_TERRAIN_ALT = -500.0
+    
+    # Monte Carlo samples per uncertainty estimate
+    UNCERTAINTY_SAMPLES = 128
     
     def __init__(self, terrain_service: Optional[TerrainService] = None, 
-                 max_iterations: int = 10, tolerance_meters: float = 0.5):
-        """Initialize with optional terrain service."""
+                 max_iterations: int = 10, tolerance_meters: float = 0.5,
+                 memoize_pointing: bool = False, max_range_m: Optional[float] = None):
+        """Initialize with optional terrain service.
+        
+        memoize_pointing reuses pointing vectors for repeated (quantized) angle
+        sets, e.g. a gimbal held on a target from a slowly changing attitude.
+        max_range_m is the largest horizontal distance at which a target is
+        resolved (default Config.MAX_DISTANCE_KM); rays that do not meet the
+        terrain within it do not converge.
+        """
         self.terrain_service = terrain_service or self._default_terrain_service()
         self.max_iterations = max_iterations
         self.tolerance = tolerance_meters
+        self.max_range_m = max_range_m if max_range_m is not None else Config.MAX_DISTANCE_KM * 1000.0
+        self._pointing_vector = cached_pointing_vector_ned if memoize_pointing else pointing_vector_ned
+        # Per-thread tangent plane of the last reference position (reused while
+        # the UAV position is unchanged, e.g. across fixed-point iterations); the
+        # shared calculator is called from the GUI and worker threads
+        self._local = threading.local()
     
     def _default_terrain_service(self):
-        """Default terrain service using offline SRTM tiles."""
+        """Default terrain service: the shared offline SRTM service."""
         try:
-            from ..elevation import OfflineSRTMService
-            return OfflineSRTMService()
+            from ..elevation import get_terrain_service
+            return get_terrain_service()
         except ImportError as e:
             print(f"[TERRAIN] Could not import offline SRTM service: {e}")
             # Fallback to simple sea-level service
@@ -76,7 +205,8 @@ class TargetCalculator:
     def calculate_target_3d(self, aircraft_lat: float, aircraft_lon: float, aircraft_alt_agl: float,
                            pitch_deg: float, yaw_deg: float, 
                            aircraft_roll_deg: float = 0.0, aircraft_pitch_deg: float = 0.0, 
-                           aircraft_yaw_deg: float = 0.0) -> TargetingResult:
+                           aircraft_yaw_deg: float = 0.0,
+                           sigmas: Optional[TargetingSigmas] = None) -> TargetingResult:
         """
         Calculate target location using 3D ray-terrain intersection with UAV attitude correction.
         
@@ -84,6 +214,8 @@ class TargetCalculator:
             aircraft_lat, aircraft_lon, aircraft_alt_agl: UAV position
             pitch_deg, yaw_deg: Gimbal angles in degrees
             aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg: UAV attitude in degrees
+            sigmas: Input errors; when given, a converged result carries an uncertainty
+                ellipse (a Monte Carlo batch: use UncertaintyEstimator on a per-tick path)
         
         Returns:
             TargetingResult: Complete 3D targeting result
@@ -91,17 +223,14 @@ class TargetCalculator:
         import time
         start_time = time.time()
         
-        # Convert to proper data structures
         uav_position = Position(lat=aircraft_lat, lon=aircraft_lon, alt=aircraft_alt_agl)
-        gimbal_angles = GimbalAngles(pitch=math.radians(pitch_deg), yaw=math.radians(yaw_deg))
-        uav_attitude = EulerAngles(
-            roll=math.radians(aircraft_roll_deg),
-            pitch=math.radians(aircraft_pitch_deg), 
-            yaw=math.radians(aircraft_yaw_deg)
-        )
         
         # Get 3D pointing vector in NED frame
-        pointing_vector = self._gimbal_to_ned_rotation(gimbal_angles, uav_attitude)
+        pointing_vector = self._pointing_vector(
+            math.radians(pitch_deg), math.radians(yaw_deg),
+            math.radians(aircraft_roll_deg), math.radians(aircraft_pitch_deg),
+            math.radians(aircraft_yaw_deg)
+        )
         
         # Check if pointing down
         if pointing_vector[2] <= 0:
@@ -125,8 +254,15 @@ class TargetCalculator:
             uav_position, pointing_vector
         )
         
-        processing_time = time.time() - start_time
         converged = target_position is not None
+        uncertainty = None
+        if converged and sigmas is not None:
+            uncertainty = self.estimate_uncertainty(
+                aircraft_lat, aircraft_lon, aircraft_alt_agl, pitch_deg, yaw_deg,
+                aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg,
+                sigmas, nominal=target_position
+            )
+        processing_time = time.time() - start_time
         
         return TargetingResult(
             target_position=target_position,
@@ -134,7 +270,149 @@ class TargetCalculator:
             iterations=iterations,
             converged=converged,
             final_error=final_error,
-            processing_time=processing_time
+            processing_time=processing_time,
+            uncertainty=uncertainty
+        )
+    
+    def estimate_uncertainty(self, aircraft_lat: float, aircraft_lon: float, aircraft_alt_agl: float,
+                             pitch_deg: float, yaw_deg: float,
+                             aircraft_roll_deg: float = 0.0, aircraft_pitch_deg: float = 0.0,
+                             aircraft_yaw_deg: float = 0.0,
+                             sigmas: Optional[TargetingSigmas] = None,
+                             nominal: Optional[Position] = None,
+                             samples: Optional[int] = None,
+                             rng: Optional[np.random.Generator] = None) -> Optional[TargetUncertainty]:
+        """
+        Horizontal error ellipse and CEP of a target fix by Monte Carlo.
+        
+        Perturbs the inputs with Gaussian errors and pushes all samples through
+        the batch solver in one call, so the terrain shape (slopes, ridges,
+        grazing angles) is reflected in the ellipse. A DEM bias is equivalent
+        to an aircraft altitude error and is folded into the altitude sigma.
+        Each call draws from its own generator unless rng is given, so
+        concurrent callers never share generator state.
+        
+        Returns:
+            TargetUncertainty, or None if too few samples hit the terrain
+        """
+        sigmas = sigmas or TargetingSigmas()
+        count = samples or self.UNCERTAINTY_SAMPLES
+        rng = rng if rng is not None else np.random.default_rng()
+        
+        if nominal is None:
+            nominal_result = self.calculate_targets_3d(
+                aircraft_lat, aircraft_lon, aircraft_alt_agl, pitch_deg, yaw_deg,
+                aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg
+            )
+            if not nominal_result.converged[0]:
+                return None
+            nominal = Position(float(nominal_result.lat[0]), float(nominal_result.lon[0]),
+                               float(nominal_result.alt[0]))
+        
+        meridian, normal = geodesy.radii_of_curvature(aircraft_lat)
+        cos_lat = max(1e-9, math.cos(math.radians(aircraft_lat)))
+        gps_north = rng.normal(0.0, sigmas.gps_horizontal_m, count)
+        gps_east = rng.normal(0.0, sigmas.gps_horizontal_m, count)
+        vertical_sigma = math.hypot(sigmas.altitude_m, sigmas.dem_m)
+        
+        batch = self.calculate_targets_3d(
+            aircraft_lat + np.degrees(gps_north / meridian),
+            aircraft_lon + np.degrees(gps_east / (normal * cos_lat)),
+            aircraft_alt_agl + rng.normal(0.0, vertical_sigma, count),
+            pitch_deg + rng.normal(0.0, sigmas.gimbal_deg, count),
+            yaw_deg + rng.normal(0.0, sigmas.gimbal_deg, count),
+            aircraft_roll_deg + rng.normal(0.0, sigmas.attitude_deg, count),
+            aircraft_pitch_deg + rng.normal(0.0, sigmas.attitude_deg, count),
+            aircraft_yaw_deg + rng.normal(0.0, sigmas.heading_deg, count)
+        )
+        
+        hits = batch.converged
+        hit_count = int(np.count_nonzero(hits))
+        if hit_count < 3:
+            return None
+        
+        north, east, _ = geodesy.geodetic_to_ned(
+            batch.lat[hits], batch.lon[hits], batch.alt[hits], nominal.lat, nominal.lon, nominal.alt
+        )
+        
+        # Principal axes of the 2x2 north/east covariance
+        cov = np.cov(np.vstack([north, east]))
+        c_nn, c_ee, c_ne = cov[0, 0], cov[1, 1], cov[0, 1]
+        half_trace = 0.5 * (c_nn + c_ee)
+        spread = math.hypot(0.5 * (c_nn - c_ee), c_ne)
+        orientation = math.degrees(0.5 * math.atan2(2.0 * c_ne, c_nn - c_ee)) % 180.0
+        
+        return TargetUncertainty(
+            semi_major_m=math.sqrt(max(0.0, half_trace + spread)),
+            semi_minor_m=math.sqrt(max(0.0, half_trace - spread)),
+            orientation_deg=orientation,
+            cep50_m=float(np.median(np.hypot(north, east))),
+            bias_north_m=float(np.mean(north)),
+            bias_east_m=float(np.mean(east)),
+            samples=hit_count,
+            hit_fraction=hit_count / count
+        )
+    
+    def calculate_targets_3d(self, aircraft_lat, aircraft_lon, aircraft_alt_agl,
+                             pitch_deg, yaw_deg,
+                             aircraft_roll_deg=0.0, aircraft_pitch_deg=0.0,
+                             aircraft_yaw_deg=0.0) -> BatchTargetingResult:
+        """
+        Vectorized calculate_target_3d over N poses.
+        
+        All arguments are array-like and broadcast against each other. The N
+        rotation matrices are built at once. Each ray then goes through the
+        terrain service's min/max pyramid when it has one, as in
+        calculate_target_3d; otherwise all rays are marched together in
+        BATCH_STEP_M steps against the batch elevation lookup and refined by a
+        vectorized bisection (which can step over ridges thinner than a step).
+        
+        Args:
+            aircraft_lat, aircraft_lon, aircraft_alt_agl: UAV positions
+            pitch_deg, yaw_deg: Gimbal angles in degrees
+            aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg: UAV attitudes in degrees
+        
+        Returns:
+            BatchTargetingResult: Arrays of results, one per pose
+        """
+        import time
+        start_time = time.time()
+        
+        lat, lon, alt, g_pitch, g_yaw, roll, pitch, yaw = (
+            np.ravel(a).astype(np.float64) for a in np.broadcast_arrays(
+                aircraft_lat, aircraft_lon, aircraft_alt_agl, pitch_deg, yaw_deg,
+                aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg
+            )
+        )
+        
+        vectors = self._gimbal_to_ned_vectors(
+            np.radians(g_pitch), np.radians(g_yaw),
+            np.radians(roll), np.radians(pitch), np.radians(yaw)
+        )
+        
+        # Raw estimate (flat earth at sea level); directly below UAV if not pointing down
+        pointing_down = vectors[:, 2] > 0
+        t_raw = np.where(pointing_down, alt / np.where(pointing_down, vectors[:, 2], 1.0), 0.0)
+        raw_lat, raw_lon, raw_alt = self._ned_to_lla_arrays(
+            t_raw * vectors[:, 0], t_raw * vectors[:, 1], t_raw * vectors[:, 2], lat, lon, alt
+        )
+        raw_alt = np.where(pointing_down, raw_alt, 0.0)
+        
+        target_lat, target_lon, target_alt, iterations, final_error = self._batch_intersection(
+            lat, lon, alt, vectors
+        )
+        
+        return BatchTargetingResult(
+            lat=target_lat,
+            lon=target_lon,
+            alt=target_alt,
+            raw_lat=raw_lat,
+            raw_lon=raw_lon,
+            raw_alt=raw_alt,
+            converged=np.isfinite(target_lat),
+            iterations=iterations,
+            final_error=final_error,
+            processing_time=time.time() - start_time
         )
     
     @staticmethod
@@ -149,17 +427,11 @@ class TargetCalculator:
         
         # Convert gimbal yaw to absolute bearing (add aircraft heading)
         absolute_bearing_deg = (aircraft_heading_deg + yaw_deg) % 360.0
-        bearing_rad = math.radians(absolute_bearing_deg)
         
-        # Calculate lat/lon offsets using spherical earth approximation
-        lat_rad = math.radians(aircraft_lat)
-        
-        # Distance calculations
-        lat_offset = horizontal_distance * math.cos(bearing_rad) / 111320.0  # meters to degrees lat
-        lon_offset = horizontal_distance * math.sin(bearing_rad) / (111320.0 * math.cos(lat_rad))  # meters to degrees lon
-        
-        target_lat = aircraft_lat + lat_offset
-        target_lon = aircraft_lon + lon_offset
+        # Walk the geodesic on the WGS84 ellipsoid
+        target_lat, target_lon, _ = geodesy.vincenty_direct(
+            aircraft_lat, aircraft_lon, absolute_bearing_deg, horizontal_distance
+        )
         
         return {
             'lat': target_lat,
@@ -177,8 +449,8 @@ class TargetCalculator:
                         pitch_deg: float, yaw_deg: float, 
                         aircraft_roll_deg: float = 0.0, aircraft_pitch_deg: float = 0.0, 
                         aircraft_yaw_deg: float = 0.0) -> Optional[Dict[str, Any]]:
-        """Legacy interface - creates calculator instance and returns simplified result."""
-        calculator = TargetCalculator()
+        """Legacy interface - uses the shared calculator and returns simplified result."""
+        calculator = get_target_calculator()
         result = calculator.calculate_target_3d(
             aircraft_lat, aircraft_lon, aircraft_alt_agl,
             pitch_deg, yaw_deg, aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg
@@ -215,20 +487,13 @@ class TargetCalculator:
         if None in [aircraft_lat, aircraft_lon, target_lat, target_lon]:
             return None
         
-        # Calculate distance and bearing to target
-        distance_2d = calculate_distance(aircraft_lat, aircraft_lon, target_lat, target_lon)
+        # Geodesic distance and initial bearing to target (true north = 0°)
+        distance_2d, bearing_deg, _ = geodesy.vincenty_inverse(
+            aircraft_lat, aircraft_lon, target_lat, target_lon
+        )
         if distance_2d == 0:
             return None
         
-        # Calculate bearing from aircraft to target (true north = 0°)
-        lat1, lon1, lat2, lon2 = map(math.radians, [aircraft_lat, aircraft_lon, target_lat, target_lon])
-        dlon = lon2 - lon1
-        
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-        bearing_rad = math.atan2(y, x)
-        bearing_deg = math.degrees(bearing_rad) % 360.0
-        
         # Calculate pitch angle (vertical angle to target)
         # Positive pitch = looking down, negative pitch = looking up
         altitude_diff = aircraft_alt_agl - target_alt  # Height above target
@@ -279,70 +544,222 @@ class TargetCalculator:
     def _gimbal_to_ned_rotation(self, gimbal_angles: GimbalAngles, 
                                uav_attitude: EulerAngles) -> np.ndarray:
         """Convert gimbal angles to NED pointing vector through UAV attitude."""
-        # UAV attitude rotation matrix (body to NED)
-        R_uav = self._euler_to_rotation_matrix(uav_attitude)
-        
-        # Gimbal rotation matrix (gimbal to body)
-        gimbal_euler = EulerAngles(roll=0, pitch=gimbal_angles.pitch, yaw=gimbal_angles.yaw)
-        R_gimbal = self._euler_to_rotation_matrix(gimbal_euler)
-        
-        # Combined rotation (gimbal to NED)
-        R_total = R_uav @ R_gimbal
-        
-        # Gimbal points along +X axis in its own frame
-        gimbal_vector = np.array([1.0, 0.0, 0.0])
+        return np.array(pointing_vector_ned(
+            gimbal_angles.pitch, gimbal_angles.yaw,
+            uav_attitude.roll, uav_attitude.pitch, uav_attitude.yaw
+        ))
+    
+    def _euler_to_rotation_matrices(self, roll: np.ndarray, pitch: np.ndarray,
+                                    yaw: np.ndarray) -> np.ndarray:
+        """Vectorized _euler_to_rotation_matrix: (N,) angles in radians -> (N, 3, 3)."""
+        cr, sr = np.cos(roll), np.sin(roll)
+        cp, sp = np.cos(pitch), np.sin(pitch)
+        cy, sy = np.cos(yaw), np.sin(yaw)
+        
+        R = np.empty(roll.shape + (3, 3))
+        R[:, 0, 0] = cy*cp
+        R[:, 0, 1] = cy*sp*sr - sy*cr
+        R[:, 0, 2] = cy*sp*cr + sy*sr
+        R[:, 1, 0] = sy*cp
+        R[:, 1, 1] = sy*sp*sr + cy*cr
+        R[:, 1, 2] = sy*sp*cr - cy*sr
+        R[:, 2, 0] = -sp
+        R[:, 2, 1] = cp*sr
+        R[:, 2, 2] = cp*cr
+        return R
+    
+    def _gimbal_to_ned_vectors(self, gimbal_pitch: np.ndarray, gimbal_yaw: np.ndarray,
+                               roll: np.ndarray, pitch: np.ndarray, yaw: np.ndarray) -> np.ndarray:
+        """Vectorized _gimbal_to_ned_rotation: (N,) angles in radians -> (N, 3) NED vectors."""
+        R_uav = self._euler_to_rotation_matrices(roll, pitch, yaw)
+        
+        # Gimbal +X axis in body frame (gimbal roll is zero): first column of R_gimbal
+        cgp = np.cos(gimbal_pitch)
+        gimbal_vectors = np.stack([
+            np.cos(gimbal_yaw) * cgp,
+            np.sin(gimbal_yaw) * cgp,
+            -np.sin(gimbal_pitch)
+        ], axis=-1)
+        
+        return np.einsum('nij,nj->ni', R_uav, gimbal_vectors)
+    
+    def _ned_to_lla_arrays(self, north: np.ndarray, east: np.ndarray, down: np.ndarray,
+                           ref_lat: np.ndarray, ref_lon: np.ndarray,
+                           ref_alt: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized _ned_to_lla (WGS84 tangent plane via ECEF)."""
+        return geodesy.ned_to_geodetic(north, east, down, ref_lat, ref_lon, ref_alt)
+    
+    def _terrain_elevations(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Batch terrain lookup, falling back to per-point queries."""
+        if hasattr(self.terrain_service, 'get_elevations'):
+            return self.terrain_service.get_elevations(lats, lons)
         
-        # Transform to NED frame
-        return R_total @ gimbal_vector
+        elevations = np.zeros(np.shape(lats))
+        for index in np.ndindex(elevations.shape):
+            try:
+                elevations[index] = self.terrain_service.get_elevation(lats[index], lons[index])
+            except Exception:
+                elevations[index] = 0.0
+        return elevations
+    
+    def _batch_intersection(self, lat: np.ndarray, lon: np.ndarray, alt: np.ndarray,
+                            vectors: np.ndarray) -> tuple:
+        """Intersect N rays with the terrain (per-ray pyramid march when available)."""
+        if hasattr(self.terrain_service, 'intersect_ray'):
+            try:
+                return self._batch_pyramid_intersection(lat, lon, alt, vectors)
+            except Exception as e:
+                print(f"[TERRAIN] Pyramid intersection failed, using fixed-step solver: {e}")
+        return self._batch_march_intersection(lat, lon, alt, vectors)
+    
+    def _batch_pyramid_intersection(self, lat: np.ndarray, lon: np.ndarray, alt: np.ndarray,
+                                    vectors: np.ndarray) -> tuple:
+        """Run each ray through the terrain min/max pyramid (same solver as the scalar path)."""
+        count = lat.shape[0]
+        target_lat = np.full(count, np.nan)
+        target_lon = np.full(count, np.nan)
+        target_alt = np.full(count, np.nan)
+        iterations = np.zeros(count, dtype=np.int64)
+        final_error = np.full(count, np.inf)
+        if count == 0:
+            return target_lat, target_lon, target_alt, iterations, final_error
+        
+        north, east, down = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+        _, _, curvature = geodesy.ray_coefficients(lat, alt, north, east)
+        for i in np.flatnonzero(down > 0):
+            hit = self.terrain_service.intersect_ray(
+                float(lat[i]), float(lon[i]), float(alt[i]),
+                (float(north[i]), float(east[i]), float(down[i])),
+                self.max_range_m, self.tolerance
+            )
+            if hit is None:
+                continue
+            hit_lat, hit_lon, terrain_alt, ray_length, steps = hit
+            ray_alt = alt[i] - ray_length * down[i] + curvature[i] * ray_length ** 2
+            target_lat[i], target_lon[i], target_alt[i] = hit_lat, hit_lon, terrain_alt
+            iterations[i] = steps
+            final_error[i] = abs(ray_alt - terrain_alt)
+        
+        return target_lat, target_lon, target_alt, iterations, final_error
+    
+    def _batch_march_intersection(self, lat: np.ndarray, lon: np.ndarray, alt: np.ndarray,
+                                  vectors: np.ndarray) -> tuple:
+        """March all rays together in fixed steps, then bisect each bracketed crossing."""
+        count = lat.shape[0]
+        target_lat = np.full(count, np.nan)
+        target_lon = np.full(count, np.nan)
+        target_alt = np.full(count, np.nan)
+        iterations = np.zeros(count, dtype=np.int64)
+        final_error = np.full(count, np.inf)
+        if count == 0:
+            return target_lat, target_lon, target_alt, iterations, final_error
+        
+        north, east, down = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+        dlat_dt, dlon_dt, curvature = geodesy.ray_coefficients(lat, alt, north, east)
+        
+        # Search limits: maximum horizontal range, or ray below any terrain
+        # (the Earth's curvature only raises the ray, so this bound is conservative)
+        pointing_down = down > 0
+        safe_down = np.where(pointing_down, down, 1.0)
+        horizontal = np.hypot(north, east)
+        t_end = (alt - self.MIN_TERRAIN_ALT) / safe_down
+        t_end = np.where(horizontal > 1e-9,
+                         np.minimum(t_end, self.max_range_m / np.maximum(horizontal, 1e-9)),
+                         t_end)
+        
+        # Rays that start below the terrain have no meaningful intersection
+        clearance_0 = alt - self._terrain_elevations(lat, lon)
+        active = pointing_down & (clearance_0 > 0)
+        
+        t_start = np.zeros(count)
+        t_lo = np.zeros(count)
+        t_hi = np.full(count, np.nan)
+        offsets = self.BATCH_STEP_M * np.arange(1, self.BATCH_CHUNK_STEPS + 1)
+        
+        # Coarse march: BATCH_CHUNK_STEPS samples per active ray per terrain query
+        while active.any():
+            idx = np.flatnonzero(active)
+            ts = np.minimum(t_start[idx, None] + offsets[None, :], t_end[idx, None])
+            lats = lat[idx, None] + ts * dlat_dt[idx, None]
+            lons = lon[idx, None] + ts * dlon_dt[idx, None]
+            ray_alt = alt[idx, None] - ts * down[idx, None] + curvature[idx, None] * ts * ts
+            clearance = ray_alt - self._terrain_elevations(lats, lons)
+            iterations[idx] += self.BATCH_CHUNK_STEPS
+            
+            below = clearance <= 0
+            found = below.any(axis=1)
+            first = np.argmax(below, axis=1)
+            
+            hit = idx[found]
+            hit_first = first[found]
+            t_hi[hit] = ts[found, hit_first]
+            previous = ts[found, np.maximum(hit_first - 1, 0)]
+            t_lo[hit] = np.where(hit_first > 0, previous, t_start[hit])
+            active[hit] = False
+            
+            missed = idx[~found]
+            t_start[missed] = ts[~found, -1]
+            active[missed[t_start[missed] >= t_end[missed]]] = False
+        
+        # Vectorized bisection on the bracketed rays
+        refine = np.flatnonzero(np.isfinite(t_hi))
+        lo, hi = t_lo[refine], t_hi[refine]
+        mid = hi.copy()
+        error = np.full(refine.shape, np.inf)
+        terrain_alt = np.zeros(refine.shape)
+        pending = np.ones(refine.shape, dtype=bool)
+        for _ in range(32):
+            if not pending.any():
+                break
+            mid = np.where(pending, 0.5 * (lo + hi), mid)
+            mid_lat = lat[refine] + mid * dlat_dt[refine]
+            mid_lon = lon[refine] + mid * dlon_dt[refine]
+            terrain_alt = np.where(pending, self._terrain_elevations(mid_lat, mid_lon), terrain_alt)
+            diff = alt[refine] - mid * down[refine] + curvature[refine] * mid * mid - terrain_alt
+            error = np.where(pending, np.abs(diff), error)
+            iterations[refine[pending]] += 1
+            
+            pending &= error >= self.tolerance
+            lo = np.where(pending & (diff > 0), mid, lo)
+            hi = np.where(pending & (diff <= 0), mid, hi)
+        
+        converged = error < self.tolerance
+        done = refine[converged]
+        target_lat[done] = lat[done] + mid[converged] * dlat_dt[done]
+        target_lon[done] = lon[done] + mid[converged] * dlon_dt[done]
+        target_alt[done] = terrain_alt[converged]
+        final_error[done] = error[converged]
+        
+        return target_lat, target_lon, target_alt, iterations, final_error
+    
+    def _reference_plane(self, reference_pos: Position) -> LocalTangentPlane:
+        """Tangent plane at reference_pos, reusing the cached one when unchanged."""
+        plane = getattr(self._local, 'plane', None)
+        if plane is None or not plane.matches(reference_pos.lat, reference_pos.lon, reference_pos.alt):
+            plane = LocalTangentPlane(reference_pos.lat, reference_pos.lon, reference_pos.alt)
+            self._local.plane = plane
+        return plane
     
     def _lla_to_ned(self, current_pos: Position, reference_pos: Position) -> NEDPosition:
-        """Convert LLA position to NED relative to reference position."""
-        lat1 = math.radians(reference_pos.lat)
-        lon1 = math.radians(reference_pos.lon)
-        lat2 = math.radians(current_pos.lat)
-        lon2 = math.radians(current_pos.lon)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        north = dlat * self.EARTH_RADIUS
-        east = dlon * self.EARTH_RADIUS * math.cos(lat1)
-        down = reference_pos.alt - current_pos.alt
-        
+        """Convert LLA position to NED relative to reference position (WGS84)."""
+        north, east, down = self._reference_plane(reference_pos).geodetic_to_ned(
+            current_pos.lat, current_pos.lon, current_pos.alt
+        )
         return NEDPosition(north=north, east=east, down=down)
     
     def _ned_to_lla(self, ned_pos: NEDPosition, reference_pos: Position) -> Position:
-        """Convert NED position to LLA using reference position."""
-        ref_lat_rad = math.radians(reference_pos.lat)
-        ref_lon_rad = math.radians(reference_pos.lon)
-        
-        dlat = ned_pos.north / self.EARTH_RADIUS
-        dlon = ned_pos.east / (self.EARTH_RADIUS * math.cos(ref_lat_rad))
-        
-        new_lat = math.degrees(ref_lat_rad + dlat)
-        new_lon = math.degrees(ref_lon_rad + dlon)
-        new_alt = reference_pos.alt - ned_pos.down
-        
-        return Position(lat=new_lat, lon=new_lon, alt=new_alt)
+        """Convert NED position to LLA using reference position (WGS84)."""
+        lat, lon, alt = self._reference_plane(reference_pos).ned_to_geodetic(
+            float(ned_pos.north), float(ned_pos.east), float(ned_pos.down)
+        )
+        return Position(lat=lat, lon=lon, alt=alt)
     
     def _distance_2d(self, pos1: Position, pos2: Position) -> float:
-        """Calculate 2D distance between two LLA positions."""
-        lat1 = math.radians(pos1.lat)
-        lon1 = math.radians(pos1.lon)
-        lat2 = math.radians(pos2.lat)
-        lon2 = math.radians(pos2.lon)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = (math.sin(dlat/2)**2 + 
-             math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        
-        return self.EARTH_RADIUS * c
+        """Calculate 2D geodesic distance between two LLA positions."""
+        return geodesy.vincenty_inverse(pos1.lat, pos1.lon, pos2.lat, pos2.lon)[0]
     
     def _calculate_raw_estimate(self, uav_position: Position, 
-                              pointing_vector: np.ndarray) -> Position:
+                              pointing_vector: PointingVector) -> Position:
         """Calculate target position assuming flat earth at sea level."""
         if pointing_vector[2] <= 0:
             # Default to position below UAV if not pointing down
@@ -350,34 +767,53 @@ class TargetCalculator:
         
         t = uav_position.alt / pointing_vector[2]
         
-        # Calculate impact point in NED
-        impact_ned = t * pointing_vector
-        
-        # Convert to LLA
-        ned_position = NEDPosition(
-            north=impact_ned[0],
-            east=impact_ned[1], 
-            down=impact_ned[2]
-        )
+        # Impact point in NED, converted to LLA
+        north, east, down = pointing_vector
+        ned_position = NEDPosition(north=t * north, east=t * east, down=t * down)
         
         return self._ned_to_lla(ned_position, uav_position)
     
     def _iterative_intersection(self, uav_position: Position,
-                              pointing_vector: np.ndarray) -> tuple[Optional[Position], int, float]:
-        """Perform iterative ray-terrain intersection."""
+                              pointing_vector: PointingVector) -> tuple[Optional[Position], int, float]:
+        """Perform ray-terrain intersection (hierarchical if the terrain service supports it)."""
+        if hasattr(self.terrain_service, 'intersect_ray'):
+            return self._pyramid_intersection(uav_position, pointing_vector)
+        return self._fixed_point_intersection(uav_position, pointing_vector)
+    
+    def _pyramid_intersection(self, uav_position: Position,
+                              pointing_vector: PointingVector) -> tuple[Optional[Position], int, float]:
+        """March the ray through the terrain min/max pyramid to the first intersection."""
+        try:
+            hit = self.terrain_service.intersect_ray(
+                uav_position.lat, uav_position.lon, uav_position.alt,
+                pointing_vector,
+                self.max_range_m, self.tolerance
+            )
+        except Exception as e:
+            print(f"[TERRAIN] Pyramid intersection failed, using fixed-point solver: {e}")
+            return self._fixed_point_intersection(uav_position, pointing_vector)
+        
+        if hit is None:
+            return None, 0, float('inf')
+        
+        lat, lon, terrain_alt, ray_length, steps = hit
+        _, _, curvature = self._reference_plane(uav_position).ray_coefficients(
+            pointing_vector[0], pointing_vector[1]
+        )
+        ray_alt = uav_position.alt - ray_length * pointing_vector[2] + curvature * ray_length ** 2
+        return Position(lat=lat, lon=lon, alt=terrain_alt), steps, float(abs(ray_alt - terrain_alt))
+    
+    def _fixed_point_intersection(self, uav_position: Position,
+                                  pointing_vector: PointingVector) -> tuple[Optional[Position], int, float]:
+        """Perform iterative (fixed-point) ray-terrain intersection."""
+        north, east, down = pointing_vector
+        
         # Initial estimate (flat earth assumption)
-        t = uav_position.alt / pointing_vector[2]
+        t = uav_position.alt / down
         
         for iteration in range(self.max_iterations):
-            # Calculate impact point in NED
-            impact_ned = t * pointing_vector
-            
-            # Convert to lat/lon
-            ned_position = NEDPosition(
-                north=impact_ned[0],
-                east=impact_ned[1],
-                down=impact_ned[2]
-            )
+            # Calculate impact point in NED and convert to lat/lon
+            ned_position = NEDPosition(north=t * north, east=t * east, down=t * down)
             current_position = self._ned_to_lla(ned_position, uav_position)
             
             # Get terrain elevation at this point
@@ -395,6 +831,8 @@ class TargetCalculator:
             # Check convergence
             error = abs(ray_alt - terrain_alt)
             if error < self.tolerance:
+                if t * math.hypot(north, east) > self.max_range_m:
+                    break
                 final_position = Position(
                     lat=current_position.lat,
                     lon=current_position.lon,
@@ -404,7 +842,7 @@ class TargetCalculator:
             
             # Refine estimate
             altitude_error = ray_alt - terrain_alt
-            t = t + (altitude_error / pointing_vector[2])
+            t = t + (altitude_error / down)
             
             # Safety check - don't let t go negative
             if t < 0:
@@ -412,3 +850,114 @@ class TargetCalculator:
         
         # Failed to converge
         return None, self.max_iterations, float('inf')
+
+class UncertaintyEstimator:
+    """Keeps a live target's error ellipse current without blocking the caller.
+    
+    update() records the newest pose and nominal fix and returns at once; a
+    daemon worker runs the Monte Carlo estimate_uncertainty on the latest pose
+    about once per refresh_s, or sooner (but not more often than
+    min_interval_s) when the fix has moved more than move_threshold_m.
+    latest() returns the most recent ellipse.
+    """
+    
+    def __init__(self, calculator: TargetCalculator, sigmas: TargetingSigmas,
+                 refresh_s: float = 1.0, min_interval_s: float = 0.25,
+                 move_threshold_m: float = 25.0):
+        self.calculator = calculator
+        self.sigmas = sigmas
+        self.refresh_s = refresh_s
+        self.min_interval_s = min_interval_s
+        self.move_threshold_m = move_threshold_m
+        self.estimates = 0
+        self.last_compute_s = 0.0
+        self._uncertainty: Optional[TargetUncertainty] = None
+        self._pose: Optional[tuple] = None
+        self._nominal: Optional[Position] = None
+        self._estimated_at: Optional[Position] = None
+        self._last_run = 0.0
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="target-uncertainty", daemon=True)
+        self._thread.start()
+    
+    def update(self, aircraft_lat: float, aircraft_lon: float, aircraft_alt_agl: float,
+               pitch_deg: float, yaw_deg: float, aircraft_roll_deg: float,
+               aircraft_pitch_deg: float, aircraft_yaw_deg: float, nominal: Position):
+        """Record the current pose and its converged fix (any thread, non-blocking)"""
+        with self._cond:
+            self._pose = (aircraft_lat, aircraft_lon, aircraft_alt_agl, pitch_deg, yaw_deg,
+                          aircraft_roll_deg, aircraft_pitch_deg, aircraft_yaw_deg)
+            self._nominal = nominal
+            self._cond.notify()
+    
+    def clear(self):
+        """Forget the pose and ellipse (target lost)"""
+        with self._cond:
+            self._pose = self._nominal = self._estimated_at = None
+            self._uncertainty = None
+    
+    def latest(self) -> Optional[TargetUncertainty]:
+        return self._uncertainty
+    
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(2.0)
+    
+    def _due_in(self, now: float) -> float:
+        """Seconds until the pending pose should be estimated (caller holds the lock)"""
+        elapsed = now - self._last_run
+        if self._estimated_at is None:
+            return 0.0
+        moved = self.calculator._distance_2d(self._estimated_at, self._nominal)
+        if moved >= self.move_threshold_m:
+            return max(0.0, self.min_interval_s - elapsed)
+        return max(0.0, self.refresh_s - elapsed)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    if self._pose is not None:
+                        wait = self._due_in(time.time())
+                        if wait <= 0.0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+                pose, nominal = self._pose, self._nominal
+                self._last_run = time.time()
+            started = time.perf_counter()
+            try:
+                uncertainty = self.calculator.estimate_uncertainty(*pose, sigmas=self.sigmas, nominal=nominal)
+            except Exception as e:
+                print(f"[TARGET] Uncertainty estimate failed: {e}")
+                uncertainty = None
+            self.last_compute_s = time.perf_counter() - started
+            self.estimates += 1
+            with self._cond:
+                if self._pose is not None:   # not cleared meanwhile
+                    self._uncertainty = uncertainty
+                    self._estimated_at = nominal
+
+# Process-wide calculator bound to the shared terrain service
+_target_calculator: Optional[TargetCalculator] = None
+_target_calculator_lock = threading.Lock()
+
+def get_target_calculator() -> TargetCalculator:
+    """Get or create the shared target calculator"""
+    global _target_calculator
+    with _target_calculator_lock:
+        if _target_calculator is None:
+            _target_calculator = TargetCalculator()
+        return _target_calculator
+
+def reset_target_calculator():
+    """Drop the shared calculator (e.g. after the terrain service is shut down)"""
+    global _target_calculator
+    with _target_calculator_lock:
+        _target_calculator = None
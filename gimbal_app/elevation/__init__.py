@@ -3,6 +3,6 @@ Elevation services for terrain-aware target calculations.
 Provides SRTM-based elevation data for accurate altitude calculations.
 """
 
-from .srtm_service import OfflineSRTMService
+from .srtm_service import OfflineSRTMService, get_terrain_service, shutdown_terrain_service
 
-__all__ = ['OfflineSRTMService']
\ No newline at end of file
+__all__ = ['OfflineSRTMService', 'get_terrain_service', 'shutdown_terrain_service']
\ No newline at end of file
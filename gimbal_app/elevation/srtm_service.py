@@ -3,23 +3,81 @@ SRTM Elevation Service
 
 Provides elevation data from SRTM (Shuttle Radar Topography Mission) tiles.
 Supports offline operation using local .hgt files.
+
+Tiles are memory-mapped as big-endian int16 NumPy arrays rather than read into
+memory, so opening a tile is near-instant and the OS page cache is shared with
+any other process (e.g. the session analysis tools) reading the same files.
+
+Samples can be interpolated (nearest, bilinear or bicubic) and voids are filled
+from their neighbours when a tile is loaded, so the terrain surface seen by the
+ray-terrain solver is continuous. Each tile's void positions and filled samples
+(none for a void-free tile) are recorded on disk next to it (e.g.
+N47E008.voidfill.npz), so a tile is scanned and filled once rather than on
+every load, and a cold load of a void-free tile stays a bare mapping.
+
+Loaded tiles live in an LRU cache bounded by a byte budget. An optional
+background prefetcher loads the tiles around and ahead of the aircraft so that
+lookups from the GUI thread never stall on a cold tile.
+
+Ray-terrain intersection is delegated to a per-tile min/max pyramid (see
+terrain_pyramid), which is built once and cached on disk next to each tile.
 """
 
 import os
-import struct
 import math
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+
+from .terrain_pyramid import TerrainPyramid, intersect_ray
+
+# SRTM samples are big-endian signed 16-bit integers
+HGT_DTYPE = np.dtype('>i2')
+SRTM_VOID = -32768
+
+# Supported tile sizes (samples per side) keyed by file size in bytes
+SRTM_TILE_SIZES = {
+    3601 * 3601 * 2: 3601,  # SRTM1 (1 arc-second)
+    1201 * 1201 * 2: 1201,  # SRTM3 (3 arc-second)
+}
+
+INTERPOLATION_MODES = ('nearest', 'bilinear', 'bicubic')
+
+# Upper bound on neighbour-averaging passes when filling voids
+VOID_FILL_MAX_PASSES = 512
+
+# Format version stored in cached void-fill files (2: written for void-free tiles too)
+VOID_FILL_VERSION = 2
+
+# Default tile cache budget (~10 SRTM1 tiles)
+DEFAULT_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+
+# How long stop_prefetch waits for the worker to finish the tile it is on
+PREFETCH_STOP_TIMEOUT_S = 5.0
+
+METERS_PER_DEG_LAT = 111320.0
 
 class OfflineSRTMService:
     """Offline SRTM elevation service using local .hgt files"""
     
-    def __init__(self, data_dir: str = "dem_data"):
+    def __init__(self, data_dir: str = "dem_data", interpolation: str = "bilinear",
+                 cache_budget_bytes: int = DEFAULT_CACHE_BUDGET_BYTES):
         """
         Initialize SRTM service with local data directory.
         
         Args:
             data_dir: Directory containing .hgt files (default: "dem_data")
+            interpolation: Sampling mode - "nearest", "bilinear" or "bicubic"
+            cache_budget_bytes: Maximum total size of cached tiles before the
+                least recently used ones are evicted
         """
+        if interpolation not in INTERPOLATION_MODES:
+            raise ValueError(f"Unknown interpolation mode: {interpolation} "
+                             f"(expected one of {', '.join(INTERPOLATION_MODES)})")
+        self.interpolation = interpolation
+
         # Get absolute path relative to project root
         if not os.path.isabs(data_dir):
             # Assume data_dir is relative to project root
@@ -28,8 +86,23 @@ class OfflineSRTMService:
         else:
             self.data_dir = data_dir
         
-        self.tile_cache = {}  # Cache for loaded tiles
-        self.tile_size = 3601  # SRTM1 tile size (1 arc-second resolution)
+        # LRU cache of loaded tiles (tile name -> 2D ndarray), most recent last
+        self.tile_cache = OrderedDict()
+        self.cache_budget_bytes = cache_budget_bytes
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        
+        # Min/max pyramids for ray marching (small, kept for every tile used)
+        self.pyramid_cache = {}
+        self._pyramid_lock = threading.Lock()
+        
+        # Background prefetch state (see start_prefetch)
+        self._prefetch_thread = None
+        self._prefetch_wakeup = threading.Event()
+        self._prefetch_stop = False
+        self._prefetch_state = None
+        self.prefetch_radius_m = 5000.0
+        self.prefetch_lookahead_m = 10000.0
         
         # Scan for available tiles
         self.available_tiles = self._scan_available_tiles()
@@ -65,10 +138,13 @@ class OfflineSRTMService:
         
         return f"{lat_str}{lon_str}"
     
-    def _load_tile(self, tile_name: str) -> Optional[bytes]:
-        """Load SRTM tile data from .hgt file"""
-        if tile_name in self.tile_cache:
-            return self.tile_cache[tile_name]
+    def _load_tile(self, tile_name: str) -> Optional[np.ndarray]:
+        """Memory-map SRTM tile data from .hgt file as a 2D int16 array"""
+        with self._cache_lock:
+            tile_data = self.tile_cache.get(tile_name)
+            if tile_data is not None:
+                self.tile_cache.move_to_end(tile_name)
+                return tile_data
         
         if tile_name not in self.available_tiles:
             print(f"[SRTM] Tile not available: {tile_name}")
@@ -77,22 +153,326 @@ class OfflineSRTMService:
         tile_path = os.path.join(self.data_dir, f"{tile_name}.hgt")
         
         try:
-            with open(tile_path, 'rb') as f:
-                tile_data = f.read()
+            # Detect resolution from file size (SRTM1 3601x3601, SRTM3 1201x1201)
+            file_size = os.path.getsize(tile_path)
+            tile_size = SRTM_TILE_SIZES.get(file_size)
+            if tile_size is None:
+                print(f"[SRTM] Warning: {tile_name} has unexpected size {file_size}, "
+                      f"expected one of {sorted(SRTM_TILE_SIZES)}")
+                return None
             
-            # Verify tile size (SRTM3 should be 1201x1201 = 2,884,802 bytes)
-            expected_size = self.tile_size * self.tile_size * 2  # 2 bytes per elevation point
-            if len(tile_data) != expected_size:
-                print(f"[SRTM] Warning: {tile_name} has unexpected size {len(tile_data)}, expected {expected_size}")
+            # Read-only mapping: pages are faulted in on demand and shared via the OS page cache
+            tile_data = np.memmap(tile_path, dtype=HGT_DTYPE, mode='r',
+                                  shape=(tile_size, tile_size))
             
-            self.tile_cache[tile_name] = tile_data
-            print(f"[SRTM] Loaded tile: {tile_name}")
-            return tile_data
+            # Voids need a private, filled copy; void-free tiles stay memory-mapped
+            void_index, values = self._void_fill_record(tile_name, tile_path, tile_data)
+            if void_index.size:
+                tile_data = np.array(tile_data, dtype=np.int16)
+                tile_data.ravel()[void_index] = values
+            
+            print(f"[SRTM] Mapped tile: {tile_name} ({tile_size}x{tile_size})")
+            return self._cache_insert(tile_name, tile_data)
             
         except Exception as e:
             print(f"[SRTM] Error loading tile {tile_name}: {e}")
             return None
     
+    def _void_fill_record(self, tile_name: str, tile_path: str,
+                          tile_data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat void indices and their filled values for a tile.
+
+        Read from the on-disk record when it matches the tile's size and
+        mtime; otherwise the tile is scanned (reading every page), filled and
+        the record rewritten.
+        """
+        fill_path = os.path.join(self.data_dir, f"{tile_name}.voidfill.npz")
+        record = _load_void_fill(fill_path, tile_path)
+        if record is not None:
+            void_index, values = record
+            if void_index.size:
+                print(f"[SRTM] Restored {void_index.size} filled void samples in {tile_name}")
+            return void_index, values
+        
+        void_index = np.flatnonzero(tile_data == SRTM_VOID)
+        if void_index.size:
+            values = self._fill_voids(tile_data).ravel()[void_index]
+            print(f"[SRTM] Filled {void_index.size} void samples in {tile_name}")
+        else:
+            values = np.empty(0, dtype=np.int16)
+        if _save_void_fill(fill_path, tile_path, void_index, values) and void_index.size:
+            print(f"[SRTM] Built void-fill cache: {fill_path}")
+        return void_index, values
+    
+    def _cache_insert(self, tile_name: str, tile_data: np.ndarray) -> np.ndarray:
+        """Add a tile to the LRU cache, evicting old tiles to stay within budget."""
+        with self._cache_lock:
+            # Another thread (e.g. the prefetcher) may have loaded it meanwhile
+            existing = self.tile_cache.get(tile_name)
+            if existing is not None:
+                self.tile_cache.move_to_end(tile_name)
+                return existing
+            
+            self.tile_cache[tile_name] = tile_data
+            self._cache_bytes += tile_data.nbytes
+            
+            # Never evict the tile that was just requested
+            while self._cache_bytes > self.cache_budget_bytes and len(self.tile_cache) > 1:
+                evicted_name, evicted = self.tile_cache.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+                print(f"[SRTM] Evicted tile: {evicted_name}")
+            
+            return tile_data
+    
+    def get_cache_stats(self) -> Dict[str, object]:
+        """Get current tile cache usage"""
+        with self._cache_lock:
+            return {
+                'tiles': list(self.tile_cache.keys()),
+                'bytes': self._cache_bytes,
+                'budget_bytes': self.cache_budget_bytes,
+            }
+    
+    # ====================================================================
+    # Background prefetch along the flight path
+    # ====================================================================
+    
+    def start_prefetch(self, radius_m: Optional[float] = None, lookahead_m: Optional[float] = None):
+        """
+        Start the background prefetch worker.
+        
+        Args:
+            radius_m: Ground range around each track point to keep loaded
+                (typically the maximum gimbal ray distance)
+            lookahead_m: Distance ahead of the aircraft along its heading
+        """
+        if radius_m is not None:
+            self.prefetch_radius_m = radius_m
+        if lookahead_m is not None:
+            self.prefetch_lookahead_m = lookahead_m
+        thread = self._prefetch_thread
+        if thread and thread.is_alive():
+            if not self._prefetch_stop:
+                return
+            # A stop is still in progress: never run two workers side by side
+            thread.join(timeout=PREFETCH_STOP_TIMEOUT_S)
+            if thread.is_alive():
+                print("[SRTM] Previous prefetch worker still busy, not starting another")
+                return
+        self._prefetch_stop = False
+        self._prefetch_thread = threading.Thread(target=self._prefetch_worker, name="srtm-prefetch", daemon=True)
+        self._prefetch_thread.start()
+    
+    def stop_prefetch(self, timeout_s: float = PREFETCH_STOP_TIMEOUT_S) -> bool:
+        """
+        Stop the background prefetch worker and wait for it to exit, so no
+        tile or cache file is still being written afterwards.
+        
+        Returns:
+            False if the worker was still busy after timeout_s
+        """
+        self._prefetch_stop = True
+        self._prefetch_wakeup.set()
+        thread = self._prefetch_thread
+        if thread is None or thread is threading.current_thread():
+            return True
+        thread.join(timeout=timeout_s)
+        if thread.is_alive():
+            print(f"[SRTM] Prefetch worker did not stop within {timeout_s:.1f}s")
+            return False
+        self._prefetch_thread = None
+        return True
+    
+    def update_aircraft_state(self, aircraft_state: Dict[str, float]):
+        """Update aircraft position/heading used to pick tiles to prefetch"""
+        if not aircraft_state or aircraft_state.get('lat') is None or aircraft_state.get('lon') is None:
+            return
+        self._prefetch_state = (
+            aircraft_state['lat'], aircraft_state['lon'], aircraft_state.get('heading', 0.0) or 0.0
+        )
+        self._prefetch_wakeup.set()
+    
+    def _tiles_along_track(self, lat: float, lon: float, heading_deg: float) -> List[str]:
+        """List tiles within prefetch radius of the track ahead, nearest first."""
+        radius = self.prefetch_radius_m
+        step = max(radius, 1000.0)
+        steps = int(math.ceil(self.prefetch_lookahead_m / step))
+        heading = math.radians(heading_deg)
+        
+        tiles = []
+        for i in range(steps + 1):
+            distance = min(i * step, self.prefetch_lookahead_m)
+            point_lat = lat + distance * math.cos(heading) / METERS_PER_DEG_LAT
+            cos_lat = max(1e-6, math.cos(math.radians(point_lat)))
+            point_lon = lon + distance * math.sin(heading) / (METERS_PER_DEG_LAT * cos_lat)
+            
+            dlat = radius / METERS_PER_DEG_LAT
+            dlon = radius / (METERS_PER_DEG_LAT * cos_lat)
+            for tile_lat in range(int(math.floor(point_lat - dlat)), int(math.floor(point_lat + dlat)) + 1):
+                for tile_lon in range(int(math.floor(point_lon - dlon)), int(math.floor(point_lon + dlon)) + 1):
+                    tile_name = self._get_tile_name(tile_lat, tile_lon)
+                    if tile_name not in tiles:
+                        tiles.append(tile_name)
+        return tiles
+    
+    def _prefetch_worker(self):
+        """Background worker that loads tiles ahead of the aircraft"""
+        while not self._prefetch_stop:
+            self._prefetch_wakeup.wait(timeout=1.0)
+            self._prefetch_wakeup.clear()
+            if self._prefetch_stop or self._prefetch_state is None:
+                continue
+            try:
+                lat, lon, heading = self._prefetch_state
+
+                # Only prefetch as many tiles (nearest first) as fit in the budget,
+                # otherwise the prefetcher would evict the tiles it just loaded
+                wanted = []
+                wanted_bytes = 0
+                for tile_name in self._tiles_along_track(lat, lon, heading):
+                    if tile_name not in self.available_tiles:
+                        continue
+                    tile_bytes = os.path.getsize(os.path.join(self.data_dir, f"{tile_name}.hgt"))
+                    if wanted_bytes + tile_bytes > self.cache_budget_bytes:
+                        break
+                    wanted.append(tile_name)
+                    wanted_bytes += tile_bytes
+
+                for tile_name in wanted:
+                    if self._prefetch_stop:
+                        break
+                    if tile_name not in self.tile_cache:
+                        self._load_tile(tile_name)
+                    if tile_name not in self.pyramid_cache:
+                        self.get_pyramid(tile_name)
+
+                # Touch wanted tiles farthest first so the nearest are evicted last
+                for tile_name in reversed(wanted):
+                    self._load_tile(tile_name)
+            except Exception as e:
+                print(f"[SRTM] Prefetch error: {e}")
+    
+    @staticmethod
+    def _fill_voids(tile_data: np.ndarray) -> np.ndarray:
+        """Return an int16 copy of tile_data with voids filled from their neighbours.
+
+        Voids separated by a fully valid row or column do not affect each
+        other, so each such cluster is filled on its own box (see
+        _fill_void_window) and a few large voids do not make every small one
+        pay for their passes. Anything still void after VOID_FILL_MAX_PASSES
+        (e.g. an all-void tile) becomes sea level.
+        """
+        filled = np.array(tile_data, dtype=np.float32)
+        void = np.asarray(tile_data) == SRTM_VOID
+        rows, cols = void.shape
+
+        for r0, r1, c0, c1 in OfflineSRTMService._void_clusters(void):
+            # One valid sample of margin to grow in from (views: fills land in place)
+            window = (slice(max(r0 - 1, 0), min(r1 + 1, rows)), slice(max(c0 - 1, 0), min(c1 + 1, cols)))
+            OfflineSRTMService._fill_void_window(filled[window], void[window])
+
+        filled[void] = 0.0
+        # Same footprint as the mapped tile so cache budgeting stays accurate
+        return np.rint(filled).astype(np.int16)
+
+    @staticmethod
+    def _void_clusters(void: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Bounding boxes (r0, r1, c0, c1) of void groups split apart by fully valid rows/columns."""
+        boxes = []
+        stack = [(0, void.shape[0], 0, void.shape[1])]
+        while stack:
+            r0, r1, c0, c1 = stack.pop()
+            box = void[r0:r1, c0:c1]
+            rows = np.flatnonzero(box.any(axis=1))
+            if rows.size == 0:
+                continue
+            cols = np.flatnonzero(box.any(axis=0))
+            row_gaps = np.flatnonzero(np.diff(rows) > 1) + 1
+            col_gaps = np.flatnonzero(np.diff(cols) > 1) + 1
+            if row_gaps.size:
+                for band in np.split(rows, row_gaps):
+                    stack.append((r0 + band[0], r0 + band[-1] + 1, c0 + cols[0], c0 + cols[-1] + 1))
+            elif col_gaps.size:
+                for band in np.split(cols, col_gaps):
+                    stack.append((r0 + rows[0], r0 + rows[-1] + 1, c0 + band[0], c0 + band[-1] + 1))
+            else:
+                boxes.append((r0 + rows[0], r0 + rows[-1] + 1, c0 + cols[0], c0 + cols[-1] + 1))
+        return boxes
+
+    @staticmethod
+    def _fill_void_window(window: np.ndarray, window_void: np.ndarray):
+        """Fill voids in window in place, clearing window_void as they are filled.
+
+        Each pass replaces every void that touches valid data with the mean of
+        its valid 8-neighbours, growing inwards until the void is closed.
+        """
+        h, w = window.shape
+        for _ in range(VOID_FILL_MAX_PASSES):
+            if not window_void.any():
+                break
+            valid = ~window_void
+            padded_values = np.pad(np.where(valid, window, 0.0), 1)
+            padded_valid = np.pad(valid, 1).astype(np.float32)
+
+            sums = np.zeros_like(window)
+            counts = np.zeros_like(window)
+            for dr in (0, 1, 2):
+                for dc in (0, 1, 2):
+                    if dr == 1 and dc == 1:
+                        continue
+                    sums += padded_values[dr:dr + h, dc:dc + w]
+                    counts += padded_valid[dr:dr + h, dc:dc + w]
+
+            frontier = window_void & (counts > 0)
+            if not frontier.any():
+                break
+            window[frontier] = sums[frontier] / counts[frontier]
+            window_void[frontier] = False
+
+    def _sample_tile(self, tile_data: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Sample a tile at fractional pixel coordinates using the configured interpolation."""
+        last = tile_data.shape[0] - 1
+        rows = np.clip(rows, 0.0, last)
+        cols = np.clip(cols, 0.0, last)
+
+        if self.interpolation == 'nearest':
+            r = np.rint(rows).astype(np.int64)
+            c = np.rint(cols).astype(np.int64)
+            return tile_data[r, c].astype(np.float64)
+
+        r0 = np.minimum(np.floor(rows).astype(np.int64), last - 1)
+        c0 = np.minimum(np.floor(cols).astype(np.int64), last - 1)
+        fr = rows - r0
+        fc = cols - c0
+
+        if self.interpolation == 'bilinear':
+            z00 = tile_data[r0, c0].astype(np.float64)
+            z01 = tile_data[r0, c0 + 1].astype(np.float64)
+            z10 = tile_data[r0 + 1, c0].astype(np.float64)
+            z11 = tile_data[r0 + 1, c0 + 1].astype(np.float64)
+            top = z00 + (z01 - z00) * fc
+            bottom = z10 + (z11 - z10) * fc
+            return top + (bottom - top) * fr
+
+        # Bicubic (Catmull-Rom) over the 4x4 neighbourhood, edges replicated
+        offsets = np.arange(-1, 3)
+        r_idx = np.clip(r0[:, None] + offsets, 0, last)
+        c_idx = np.clip(c0[:, None] + offsets, 0, last)
+        patch = tile_data[r_idx[:, :, None], c_idx[:, None, :]].astype(np.float64)
+        return np.einsum('ni,nij,nj->n', self._cubic_weights(fr), patch, self._cubic_weights(fc))
+
+    @staticmethod
+    def _cubic_weights(t: np.ndarray) -> np.ndarray:
+        """Catmull-Rom weights for the four samples around fractional offset t."""
+        t2 = t * t
+        t3 = t2 * t
+        return np.stack([
+            -0.5 * t3 + t2 - 0.5 * t,
+            1.5 * t3 - 2.5 * t2 + 1.0,
+            -1.5 * t3 + 2.0 * t2 + 0.5 * t,
+            0.5 * t3 - 0.5 * t2,
+        ], axis=-1)
+    
     def get_elevation(self, lat: float, lon: float) -> float:
         """
         Get elevation at given coordinates.
@@ -120,35 +500,124 @@ class OfflineSRTMService:
             lat_frac = lat - lat_int
             lon_frac = lon - lon_int
             
-            # Convert to pixel coordinates (0-3600 for SRTM1)
+            # Convert to fractional pixel coordinates (0-3600 for SRTM1, 0-1200 for SRTM3)
             # Note: SRTM data is stored with (0,0) at top-left (north-west corner)
-            row = int((1.0 - lat_frac) * (self.tile_size - 1))  # Flip Y axis
-            col = int(lon_frac * (self.tile_size - 1))
+            last = tile_data.shape[0] - 1
+            row = (1.0 - lat_frac) * last  # Flip Y axis
+            col = lon_frac * last
             
-            # Bounds check
-            row = max(0, min(self.tile_size - 1, row))
-            col = max(0, min(self.tile_size - 1, col))
-            
-            # Calculate byte offset (2 bytes per sample, big-endian)
-            offset = (row * self.tile_size + col) * 2
-            
-            if offset + 1 >= len(tile_data):
-                print(f"[SRTM] Offset out of bounds: {offset} >= {len(tile_data)}")
-                return 0.0
-            
-            # Read elevation value (big-endian signed 16-bit integer)
-            elevation_bytes = tile_data[offset:offset + 2]
-            elevation = struct.unpack('>h', elevation_bytes)[0]  # >h = big-endian signed short
-            
-            # Handle void data (SRTM uses -32768 for no data)
-            if elevation == -32768:
-                return 0.0
+            # Voids were filled at load time, so every sample is usable
+            elevation = self._sample_tile(tile_data, np.array([row]), np.array([col]))[0]
             
             return float(elevation)
             
         except Exception as e:
             print(f"[SRTM] Error getting elevation for {lat:.6f}, {lon:.6f}: {e}")
             return 0.0
+
+    def get_elevations(self, lats, lons) -> np.ndarray:
+        """
+        Get elevations for many coordinates in one call.
+
+        Points are grouped by tile and sampled with a single fancy-indexing
+        gather per tile, using the same grid convention and interpolation
+        as get_elevation().
+
+        Args:
+            lats: Latitudes in degrees (array-like)
+            lons: Longitudes in degrees (array-like, same shape as lats)
+
+        Returns:
+            Float64 array of elevations in meters, shaped like the inputs
+            (0.0 where no data is available)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        lats, lons = np.broadcast_arrays(lats, lons)
+        shape = lats.shape
+        lats = lats.ravel()
+        lons = lons.ravel()
+
+        elevations = np.zeros(lats.size, dtype=np.float64)
+        if lats.size == 0:
+            return elevations.reshape(shape)
+
+        valid = np.isfinite(lats) & np.isfinite(lons)
+        lats = np.where(valid, lats, 0.0)
+        lons = np.where(valid, lons, 0.0)
+        lat_int = np.floor(lats).astype(np.int64)
+        lon_int = np.floor(lons).astype(np.int64)
+
+        # Group points by tile: one key per (lat_int, lon_int) pair
+        keys = np.where(valid, lat_int * 1000 + lon_int, np.iinfo(np.int64).max)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        groups = np.split(order, starts[1:])
+
+        for members in groups:
+            if not valid[members[0]]:
+                continue
+            first = members[0]
+            tile_name = self._get_tile_name(float(lat_int[first]), float(lon_int[first]))
+            tile_data = self._load_tile(tile_name)
+            if tile_data is None:
+                continue
+
+            # Fractional pixel coordinates ((0,0) is the north-west corner)
+            last = tile_data.shape[0] - 1
+            rows = (1.0 - (lats[members] - lat_int[members])) * last
+            cols = (lons[members] - lon_int[members]) * last
+
+            try:
+                elevations[members] = self._sample_tile(tile_data, rows, cols)
+            except Exception as e:
+                print(f"[SRTM] Error sampling tile {tile_name}: {e}")
+
+        return elevations.reshape(shape)
+
+    def get_pyramid(self, tile_name: str) -> Optional[TerrainPyramid]:
+        """Get the min/max pyramid for a tile, loading it from disk or building it."""
+        pyramid = self.pyramid_cache.get(tile_name)
+        if pyramid is not None or tile_name not in self.available_tiles:
+            return pyramid
+        
+        with self._pyramid_lock:
+            pyramid = self.pyramid_cache.get(tile_name)
+            if pyramid is not None:
+                return pyramid
+            
+            tile_path = os.path.join(self.data_dir, f"{tile_name}.hgt")
+            pyramid_path = os.path.join(self.data_dir, f"{tile_name}.minmax.npz")
+            pyramid = TerrainPyramid.load(pyramid_path, tile_path, self.interpolation)
+            if pyramid is None:
+                tile_data = self._load_tile(tile_name)
+                if tile_data is None:
+                    return None
+                pyramid = TerrainPyramid.build(tile_data, interpolation=self.interpolation)
+                if pyramid.save(pyramid_path, tile_path):
+                    print(f"[SRTM] Built pyramid cache: {pyramid_path}")
+            
+            self.pyramid_cache[tile_name] = pyramid
+            return pyramid
+    
+    def intersect_ray(self, lat: float, lon: float, alt: float,
+                      direction_ned: Tuple[float, float, float], max_range_m: float,
+                      tolerance_m: float = 0.5) -> Optional[Tuple[float, float, float, float, int]]:
+        """
+        Find the first terrain intersection of a ray using the min/max pyramids.
+        
+        Args:
+            lat, lon, alt: Ray origin (degrees, degrees, meters)
+            direction_ned: Unit pointing vector (north, east, down)
+            max_range_m: Maximum horizontal distance to search
+            tolerance_m: Vertical tolerance of the intersection
+            
+        Returns:
+            (lat, lon, terrain_alt, ray_length_m, steps) or None if the ray
+            does not reach the terrain within range
+        """
+        return intersect_ray(self, lat, lon, alt, direction_ned, max_range_m, tolerance_m)
     
     def is_tile_available(self, lat: float, lon: float) -> bool:
         """Check if SRTM tile is available for given coordinates"""
@@ -164,4 +633,57 @@ class OfflineSRTMService:
         info += f"Data directory: {self.data_dir}\n"
         info += f"Available tiles: {', '.join(sorted(self.available_tiles))}"
         
-        return info
\ No newline at end of file
+        return info
+
+def _load_void_fill(path: str, source_path: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Cached (void_index, values) for source_path, or None if missing or stale."""
+    if not os.path.exists(path):
+        return None
+    try:
+        source = os.stat(source_path)
+        with np.load(path) as data:
+            version, size, mtime_ns = (int(v) for v in data['header'])
+            if version != VOID_FILL_VERSION or size != source.st_size or mtime_ns != source.st_mtime_ns:
+                return None
+            return data['index'], data['values']
+    except Exception as e:
+        print(f"[SRTM] Could not read void-fill cache {path}: {e}")
+        return None
+
+def _save_void_fill(path: str, source_path: str, void_index: np.ndarray, values: np.ndarray) -> bool:
+    """Write the filled void samples next to their source tile (atomic replace)."""
+    try:
+        source = os.stat(source_path)
+        header = np.array([VOID_FILL_VERSION, source.st_size, source.st_mtime_ns], dtype=np.int64)
+        # Per-process/thread temporary name: the prefetcher and a caller may fill the same tile
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(tmp_path, header=header, index=void_index.astype(np.int64), values=values.astype(np.int16))
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"[SRTM] Could not write void-fill cache {path}: {e}")
+        return False
+
+# Process-wide terrain service shared by the GUI, workers and calculators
+_terrain_service: Optional[OfflineSRTMService] = None
+_terrain_service_lock = threading.Lock()
+
+def get_terrain_service(**kwargs) -> OfflineSRTMService:
+    """Get or create the shared terrain service.
+
+    Keyword arguments are passed to OfflineSRTMService on first creation only,
+    so the application should call this early with its configuration.
+    """
+    global _terrain_service
+    with _terrain_service_lock:
+        if _terrain_service is None:
+            _terrain_service = OfflineSRTMService(**kwargs)
+        return _terrain_service
+
+def shutdown_terrain_service():
+    """Stop the shared terrain service's prefetcher and release its tiles"""
+    global _terrain_service
+    with _terrain_service_lock:
+        if _terrain_service is not None:
+            _terrain_service.stop_prefetch()
+            _terrain_service = None
\ No newline at end of file
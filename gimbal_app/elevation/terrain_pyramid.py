@@ -0,0 +1,345 @@
+"""
+Min/Max Terrain Pyramid
+
+Per-tile quadtree of terrain minimum/maximum elevations used to march a ray
+through the DEM hierarchically. Large blocks the ray passes over are skipped
+in one step, and only the blocks it may touch are sampled finely, so the first
+real intersection is found in bounded time even at grazing angles.
+
+Pyramids are built once per tile and cached on disk next to the .hgt file
+(e.g. N47E008.minmax.npz).
+"""
+
+import os
+import math
+import threading
+from typing import Optional, List, Tuple
+
+import numpy as np
+
+from ..calc.geodesy import LocalTangentPlane
+
+# Number of DEM cells per side of a level-0 block (~240 m for SRTM1)
+BASE_BLOCK_CELLS = 8
+
+# Format version stored in cached pyramid files
+PYRAMID_VERSION = 2
+
+# Catmull-Rom weights have |w| summing to at most 1.25 per axis, so a bicubic
+# sample lies within (1.25^2 - 1) / 2 of its 4x4 neighbourhood's spread below
+# the neighbourhood minimum or above its maximum
+CATMULL_ROM_OVERSHOOT = (1.25 ** 2 - 1.0) / 2.0
+
+EARTH_RADIUS = 6378137.0
+
+# Lowest land surface on Earth is ~-430 m (Dead Sea); no terrain below this
+MIN_TERRAIN_ALT = -500.0
+
+
+def _sliding_4(values: np.ndarray, op, axis: int) -> np.ndarray:
+    """op over 4 consecutive entries along axis (output is 3 shorter)"""
+    n = values.shape[axis] - 3
+    take = lambda k: values[k:k + n] if axis == 0 else values[:, k:k + n]
+    return op.reduce([take(0), take(1), take(2), take(3)])
+
+
+def _cell_bounds(posts: np.ndarray, bicubic: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Lowest/highest interpolated elevation inside each DEM cell.
+
+    Nearest and bilinear sampling stay within a cell's four corner posts.
+    Catmull-Rom uses the 4x4 posts around the cell (edges replicated) and
+    can overshoot them, by up to CATMULL_ROM_OVERSHOOT of their spread.
+    """
+    if not bicubic:
+        corners = [posts[:-1, :-1], posts[1:, :-1], posts[:-1, 1:], posts[1:, 1:]]
+        return np.minimum.reduce(corners), np.maximum.reduce(corners)
+    padded = np.pad(posts.astype(np.int32), 1, mode='edge')
+    low = _sliding_4(_sliding_4(padded, np.minimum, 0), np.minimum, 1)
+    high = _sliding_4(_sliding_4(padded, np.maximum, 0), np.maximum, 1)
+    overshoot = np.ceil(CATMULL_ROM_OVERSHOOT * (high - low)).astype(np.int32)
+    limits = np.iinfo(np.int16)
+    return (np.clip(low - overshoot, limits.min, limits.max).astype(np.int16),
+            np.clip(high + overshoot, limits.min, limits.max).astype(np.int16))
+
+
+def _reduce_2x2(values: np.ndarray, op) -> np.ndarray:
+    """Combine 2x2 blocks with op, replicating the last row/column for odd sizes."""
+    rows, cols = values.shape
+    if rows % 2 or cols % 2:
+        values = np.pad(values, ((0, rows % 2), (0, cols % 2)), mode='edge')
+    return op.reduce([values[0::2, 0::2], values[1::2, 0::2],
+                      values[0::2, 1::2], values[1::2, 1::2]])
+
+
+class TerrainPyramid:
+    """Min/max elevation pyramid for one SRTM tile"""
+
+    def __init__(self, tile_size: int, mins: List[np.ndarray], maxs: List[np.ndarray],
+                 base_block: int = BASE_BLOCK_CELLS, bicubic: bool = False):
+        """
+        Args:
+            tile_size: Posts per tile side (3601 or 1201)
+            mins, maxs: Per-level block min/max elevations, finest level first
+            base_block: DEM cells per side of a level-0 block
+            bicubic: Bounds cover Catmull-Rom overshoot (built for bicubic sampling)
+        """
+        self.tile_size = tile_size
+        self.mins = mins
+        self.maxs = maxs
+        self.base_block = base_block
+        self.bicubic = bicubic
+
+    @property
+    def levels(self) -> int:
+        return len(self.maxs)
+
+    def block_cells(self, level: int) -> int:
+        """DEM cells per side of a block at the given level"""
+        return self.base_block << level
+
+    @classmethod
+    def build(cls, tile_data: np.ndarray, base_block: int = BASE_BLOCK_CELLS,
+              interpolation: str = 'bilinear') -> 'TerrainPyramid':
+        """Build the pyramid from a (void-filled) tile array for the given sampling mode."""
+        posts = np.asarray(tile_data, dtype=np.int16)
+        tile_size = posts.shape[0]
+        bicubic = interpolation == 'bicubic'
+
+        # Bounds of the interpolated surface over each DEM cell
+        cell_min, cell_max = _cell_bounds(posts, bicubic)
+
+        # Level 0: base_block x base_block cells per block
+        cells = tile_size - 1
+        blocks = int(math.ceil(cells / base_block))
+        pad = blocks * base_block - cells
+        if pad:
+            cell_min = np.pad(cell_min, ((0, pad), (0, pad)), mode='edge')
+            cell_max = np.pad(cell_max, ((0, pad), (0, pad)), mode='edge')
+        mins = [cell_min.reshape(blocks, base_block, blocks, base_block).min(axis=(1, 3))]
+        maxs = [cell_max.reshape(blocks, base_block, blocks, base_block).max(axis=(1, 3))]
+
+        while maxs[-1].shape[0] > 1:
+            mins.append(_reduce_2x2(mins[-1], np.minimum))
+            maxs.append(_reduce_2x2(maxs[-1], np.maximum))
+
+        return cls(tile_size, mins, maxs, base_block, bicubic)
+
+    @classmethod
+    def load(cls, path: str, source_path: str,
+             interpolation: str = 'bilinear') -> Optional['TerrainPyramid']:
+        """Load a cached pyramid, or None if missing, stale for source_path or
+        built for a different sampling mode."""
+        if not os.path.exists(path):
+            return None
+        try:
+            source = os.stat(source_path)
+            with np.load(path) as data:
+                header = data['header']
+                if int(header[0]) != PYRAMID_VERSION:
+                    return None
+                _, tile_size, base_block, levels, size, mtime_ns, bicubic = (int(v) for v in header)
+                if (size != source.st_size or mtime_ns != source.st_mtime_ns or
+                        bool(bicubic) != (interpolation == 'bicubic')):
+                    return None
+                mins = [data[f'min{i}'] for i in range(levels)]
+                maxs = [data[f'max{i}'] for i in range(levels)]
+            return cls(tile_size, mins, maxs, base_block, bool(bicubic))
+        except Exception as e:
+            print(f"[SRTM] Could not read pyramid cache {path}: {e}")
+            return None
+
+    def save(self, path: str, source_path: str) -> bool:
+        """Write the pyramid next to its source tile (atomic replace)."""
+        try:
+            source = os.stat(source_path)
+            header = np.array([PYRAMID_VERSION, self.tile_size, self.base_block, self.levels,
+                               source.st_size, source.st_mtime_ns, int(self.bicubic)], dtype=np.int64)
+            arrays = {'header': header}
+            for i in range(self.levels):
+                arrays[f'min{i}'] = self.mins[i]
+                arrays[f'max{i}'] = self.maxs[i]
+            # Per-process/thread temporary name: the prefetcher and a caller may build the same tile
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"[SRTM] Could not write pyramid cache {path}: {e}")
+            return False
+
+
+def _exit_distance(row: float, col: float, drow: float, dcol: float,
+                   r0: float, r1: float, c0: float, c1: float) -> float:
+    """Ray parameter from (row, col) to where it leaves box [r0,r1]x[c0,c1]."""
+    t = math.inf
+    if drow > 0:
+        t = (r1 - row) / drow
+    elif drow < 0:
+        t = (r0 - row) / drow
+    if dcol > 0:
+        t = min(t, (c1 - col) / dcol)
+    elif dcol < 0:
+        t = min(t, (c0 - col) / dcol)
+    return max(t, 0.0)
+
+
+def _descent_to(alt0: float, down: float, curvature: float, level: float) -> float:
+    """Smallest ray length at which alt0 - down*t + curvature*t^2 reaches level."""
+    height = alt0 - level
+    if curvature <= 0.0:
+        return height / down
+    discriminant = down * down - 4.0 * curvature * height
+    if discriminant < 0.0:
+        return math.inf  # the Earth curves away faster than the ray descends
+    return 2.0 * height / (down + math.sqrt(discriminant))
+
+
+def intersect_ray(terrain, lat0: float, lon0: float, alt0: float,
+                  direction_ned: Tuple[float, float, float], max_range_m: float,
+                  tolerance_m: float = 0.5, margin_m: float = 0.5,
+                  max_steps: int = 20000) -> Optional[Tuple[float, float, float, float, int]]:
+    """
+    Find the first intersection of a ray with the terrain surface.
+
+    The ray starts at (lat0, lon0, alt0) and follows the unit NED direction
+    as a straight line of sight over the WGS84 ellipsoid (ellipsoidal radii
+    of curvature, with the Earth's curvature drop applied to the ray height).
+    At each step the coarsest pyramid block that the ray clears is skipped;
+    blocks it may touch are sampled at half-post spacing and the crossing is
+    refined by bisection.
+
+    Args:
+        terrain: OfflineSRTMService (provides get_pyramid/get_elevation(s))
+        lat0, lon0, alt0: Ray origin (degrees, degrees, meters)
+        direction_ned: Unit pointing vector (north, east, down)
+        max_range_m: Maximum horizontal distance to search
+        tolerance_m: Vertical tolerance of the refined intersection
+        margin_m: Safety margin added to block maxima (rounding only; the
+            pyramid bounds already include interpolation overshoot)
+        max_steps: Hard limit on marching steps
+
+    Returns:
+        (lat, lon, terrain_alt, ray_length_m, steps) or None if no intersection
+    """
+    north, east, down = direction_ned
+    if down <= 0:
+        return None
+
+    dlat_dt, dlon_dt, curvature = LocalTangentPlane(lat0, lon0, alt0).ray_coefficients(north, east)
+
+    horizontal = math.hypot(north, east)
+    t_end = _descent_to(alt0, down, curvature, MIN_TERRAIN_ALT)
+    if horizontal > 1e-9:
+        t_end = min(t_end, max_range_m / horizontal)
+    if math.isinf(t_end):
+        return None
+
+    def ray_alt(t):
+        return alt0 - down * t + curvature * t * t
+
+    # Ray height is convex in t; its lowest point is at the vertex when reached
+    t_vertex = down / (2.0 * curvature) if curvature > 0.0 else math.inf
+
+    def ray_low(t_a: float, t_b: float) -> float:
+        return ray_alt(min(max(t_vertex, t_a), t_b))
+
+    # A ray starting below the terrain has no meaningful first intersection
+    if ray_alt(0.0) <= terrain.get_elevation(lat0, lon0):
+        return None
+
+    eps = 1e-3
+    t = 0.0
+    steps = 0
+    while t < t_end and steps < max_steps:
+        steps += 1
+        lat = lat0 + t * dlat_dt
+        lon = lon0 + t * dlon_dt
+        tile_lat = math.floor(lat)
+        tile_lon = math.floor(lon)
+
+        # Ray parameter at which it leaves the current 1x1 degree tile
+        t_tile_exit = t + _exit_distance(lat, lon, dlat_dt, dlon_dt,
+                                         tile_lat, tile_lat + 1, tile_lon, tile_lon + 1)
+        t_tile_exit = min(t_tile_exit, t_end)
+
+        pyramid = terrain.get_pyramid(terrain._get_tile_name(lat, lon))
+        if pyramid is None:
+            # Missing tiles read as sea level, so the crossing is analytic
+            t_hit = _descent_to(alt0, down, curvature, 0.0)
+            if t <= t_hit <= t_tile_exit:
+                return lat0 + t_hit * dlat_dt, lon0 + t_hit * dlon_dt, 0.0, t_hit, steps
+            t = t_tile_exit + eps
+            continue
+
+        # Position and direction in tile cell coordinates ((0,0) = north-west corner)
+        cells = pyramid.tile_size - 1
+        row = (tile_lat + 1 - lat) * cells
+        col = (lon - tile_lon) * cells
+        drow = -dlat_dt * cells
+        dcol = dlon_dt * cells
+
+        t_block_exit = t_tile_exit
+        skipped = False
+        for level in range(pyramid.levels - 1, -1, -1):
+            size = pyramid.block_cells(level)
+            maxs = pyramid.maxs[level]
+            bi = min(max(int(row // size), 0), maxs.shape[0] - 1)
+            bj = min(max(int(col // size), 0), maxs.shape[1] - 1)
+            t_block_exit = min(t + _exit_distance(row, col, drow, dcol,
+                                                  bi * size, (bi + 1) * size,
+                                                  bj * size, (bj + 1) * size),
+                               t_tile_exit)
+            if ray_low(t, t_block_exit) > maxs[bi, bj] + margin_m:
+                skipped = True
+                break
+        if skipped:
+            t = t_block_exit + eps
+            continue
+
+        # Level-0 block may contain terrain at ray height: sample it finely
+        hit = _refine_in_segment(terrain, t, t_block_exit, lat0, lon0, dlat_dt, dlon_dt,
+                                 ray_alt, cells, tolerance_m)
+        if hit is not None:
+            hit_lat, hit_lon, terrain_alt, t_hit = hit
+            return hit_lat, hit_lon, terrain_alt, t_hit, steps
+        t = t_block_exit + eps
+
+    return None
+
+
+def _refine_in_segment(terrain, t_a: float, t_b: float, lat0: float, lon0: float,
+                       dlat_dt: float, dlon_dt: float, ray_alt, cells: int,
+                       tolerance_m: float) -> Optional[Tuple[float, float, float, float]]:
+    """Sample [t_a, t_b] at half-post spacing and bisect the first crossing."""
+    post_spacing_m = math.radians(1.0 / cells) * EARTH_RADIUS
+    count = max(2, int(math.ceil((t_b - t_a) / (0.5 * post_spacing_m))) + 1)
+    ts = np.linspace(t_a, t_b, count)
+    lats = lat0 + ts * dlat_dt
+    lons = lon0 + ts * dlon_dt
+    clearance = ray_alt(ts) - terrain.get_elevations(lats, lons)
+
+    below = np.flatnonzero(clearance <= 0.0)
+    if below.size == 0:
+        return None
+    i = int(below[0])
+    if i == 0:
+        terrain_alt = ray_alt(t_a) - clearance[0]
+        return lats[0], lons[0], terrain_alt, t_a
+
+    lo, hi = ts[i - 1], ts[i]
+    for _ in range(32):
+        mid = 0.5 * (lo + hi)
+        mid_lat = lat0 + mid * dlat_dt
+        mid_lon = lon0 + mid * dlon_dt
+        terrain_alt = terrain.get_elevation(mid_lat, mid_lon)
+        error = ray_alt(mid) - terrain_alt
+        if abs(error) < tolerance_m:
+            return mid_lat, mid_lon, terrain_alt, mid
+        if error > 0:
+            lo = mid
+        else:
+            hi = mid
+
+    mid_lat = lat0 + hi * dlat_dt
+    mid_lon = lon0 + hi * dlon_dt
+    return mid_lat, mid_lon, terrain.get_elevation(mid_lat, mid_lon), hi
@@ -0,0 +1,187 @@
+"""
+Timed gimbal command sequences
+
+A CommandSequence is a list of steps (one-shot actions, waits, and actions
+repeated at a fixed period until a condition or deadline) that a
+SequenceRunner executes on the gimbal event loop with call_later, so a
+multi-second manoeuvre never blocks the caller or the control loop. A runner
+executes one sequence at a time; starting another or calling cancel() stops
+the current one between steps and runs its on_cancel cleanup.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, List, Optional
+
+from .siyi_link import get_gimbal_event_loop
+
+Action = Callable[[], None]
+Condition = Callable[[], bool]
+
+
+class _Step:
+    __slots__ = ('action', 'period_s', 'duration_s', 'until')
+
+    def __init__(self, action: Optional[Action], period_s: float = 0.0,
+                 duration_s: Optional[float] = None, until: Optional[Condition] = None):
+        self.action = action
+        self.period_s = period_s
+        self.duration_s = duration_s
+        self.until = until
+
+
+class CommandSequence:
+    """Builder for a named multi-step gimbal manoeuvre"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.steps: List[_Step] = []
+        self.on_done: Optional[Callable[[bool], None]] = None
+        self.on_cancel: Optional[Action] = None
+
+    def then(self, action: Action, wait_s: float = 0.0) -> 'CommandSequence':
+        """Run action once, then wait wait_s before the next step"""
+        self.steps.append(_Step(action, period_s=wait_s))
+        return self
+
+    def wait(self, seconds: float) -> 'CommandSequence':
+        self.steps.append(_Step(None, period_s=seconds))
+        return self
+
+    def repeat(self, action: Action, period_s: float, duration_s: Optional[float] = None,
+               until: Optional[Condition] = None) -> 'CommandSequence':
+        """
+        Run action every period_s until `until()` is true or duration_s elapses.
+
+        With `until`, duration_s is a timeout and the sequence reports failure
+        if it expires first; at least one of the two must be given.
+        """
+        if duration_s is None and until is None:
+            raise ValueError("repeat() needs a duration or an until condition")
+        self.steps.append(_Step(action, period_s, duration_s, until))
+        return self
+
+    def finally_(self, on_done: Callable[[bool], None]) -> 'CommandSequence':
+        """Called with True/False when the sequence completes or times out"""
+        self.on_done = on_done
+        return self
+
+    def cleanup(self, on_cancel: Action) -> 'CommandSequence':
+        """Called if the sequence is cancelled (e.g. send a stop command)"""
+        self.on_cancel = on_cancel
+        return self
+
+
+class SequenceRunner:
+    """Runs one CommandSequence at a time on an asyncio loop (thread-safe API)"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._sequence: Optional[CommandSequence] = None
+        self._generation = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or self._loop.is_closed():
+            self._loop = get_gimbal_event_loop()
+        return self._loop
+
+    @property
+    def active(self) -> Optional[str]:
+        """Name of the running sequence, or None"""
+        sequence = self._sequence
+        return sequence.name if sequence is not None else None
+
+    def run(self, sequence: CommandSequence):
+        """Start sequence, cancelling any sequence already running"""
+        with self._lock:
+            previous = self._sequence
+            self._generation += 1
+            generation = self._generation
+            self._sequence = sequence
+        self.loop.call_soon_threadsafe(self._begin, previous, sequence, generation)
+
+    def cancel(self, reason: str = "") -> bool:
+        """Stop the running sequence between steps; returns False if none was running"""
+        with self._lock:
+            sequence = self._sequence
+            if sequence is None:
+                return False
+            self._generation += 1
+            self._sequence = None
+        print(f"[GIMBAL] Sequence '{sequence.name}' cancelled" + (f": {reason}" if reason else ""))
+        self.loop.call_soon_threadsafe(self._abort, sequence)
+        return True
+
+    # ---- event loop side ----
+
+    def _abort(self, sequence: CommandSequence):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if sequence.on_cancel:
+            try:
+                sequence.on_cancel()
+            except Exception as e:
+                print(f"[GIMBAL] Sequence '{sequence.name}' cleanup failed: {e}")
+
+    def _begin(self, previous: Optional[CommandSequence], sequence: CommandSequence, generation: int):
+        if previous is not None and previous is not sequence:
+            print(f"[GIMBAL] Sequence '{previous.name}' superseded by '{sequence.name}'")
+            self._abort(previous)
+        self._run_step(sequence, generation, 0, None)
+
+    def _run_step(self, sequence: CommandSequence, generation: int, index: int,
+                  deadline: Optional[float]):
+        self._handle = None
+        if generation != self._generation:
+            return
+        if index >= len(sequence.steps):
+            self._finish(sequence, generation, True)
+            return
+
+        step = sequence.steps[index]
+        now = time.monotonic()
+        try:
+            if step.duration_s is None and step.until is None:
+                # One-shot action (or plain wait)
+                if step.action:
+                    step.action()
+                self._schedule(step.period_s, sequence, generation, index + 1, None)
+                return
+
+            # Repeating step
+            if deadline is None:
+                deadline = now + step.duration_s if step.duration_s is not None else float('inf')
+            if step.until is not None and step.until():
+                self._schedule(0.0, sequence, generation, index + 1, None)
+                return
+            if now >= deadline:
+                if step.until is not None:
+                    print(f"[GIMBAL] Sequence '{sequence.name}' timed out")
+                    self._finish(sequence, generation, False)
+                else:
+                    self._schedule(0.0, sequence, generation, index + 1, None)
+                return
+            step.action()
+            self._schedule(step.period_s, sequence, generation, index, deadline)
+        except Exception as e:
+            print(f"[GIMBAL] Sequence '{sequence.name}' step {index} failed: {e}")
+            self._finish(sequence, generation, False)
+
+    def _schedule(self, delay: float, *args):
+        self._handle = self.loop.call_later(max(0.0, delay), self._run_step, *args)
+
+    def _finish(self, sequence: CommandSequence, generation: int, ok: bool):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._sequence = None
+        if sequence.on_done:
+            try:
+                sequence.on_done(ok)
+            except Exception as e:
+                print(f"[GIMBAL] Sequence '{sequence.name}' completion callback failed: {e}")
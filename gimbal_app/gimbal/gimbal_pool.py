@@ -0,0 +1,142 @@
+"""
+Several SIYI gimbals in one process
+
+GimbalPool owns N SiyiGimbal instances (and a GimbalLocker for each) that
+share one UDP socket on the gimbal event loop. Incoming datagrams are routed
+to their gimbal by source address, and every keepalive, request timer and
+sequence step is a call_later on the same loop, so adding a gimbal adds its
+own traffic and timers but no extra socket, thread or per-datagram scan.
+"""
+
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..shared import Config, GimbalLogger
+from .siyi_gimbal import SiyiGimbal
+from .siyi_link import SiyiSharedEndpoint, get_gimbal_event_loop
+from .locker import GimbalLocker
+
+
+class GimbalPool:
+    """Named SIYI gimbals sharing one socket and event loop"""
+
+    def __init__(self, bind: Tuple[str, int] = ("0.0.0.0", 0), loop=None):
+        """
+        Args:
+            bind: Local address for the shared socket (port 0 = any)
+            loop: Event loop; defaults to the shared gimbal loop
+        """
+        self.endpoint = SiyiSharedEndpoint(bind, loop or get_gimbal_event_loop())
+        self._gimbals: Dict[str, SiyiGimbal] = {}
+        self._lockers: Dict[str, GimbalLocker] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, ip: str, port: int = Config.SIYI_PORT,
+            with_locker: bool = True, logger: Optional[GimbalLogger] = None) -> SiyiGimbal:
+        """Create (but do not start) a gimbal; names and addresses must be unique.
+
+        Each gimbal logs through its own named logger, to gimbal_log_<name>.txt
+        unless a logger is given.
+        """
+        with self._lock:
+            if name in self._gimbals:
+                raise ValueError(f"Gimbal '{name}' already exists")
+            for other_name, other in self._gimbals.items():
+                if (other.ip, other.port) == (ip, port):
+                    raise ValueError(f"Gimbal '{other_name}' already uses {ip}:{port}")
+            logger = logger or GimbalLogger(f"gimbal_log_{name}.txt", name=name)
+            gimbal = SiyiGimbal(ip, port, endpoint=self.endpoint, logger=logger)
+            self._gimbals[name] = gimbal
+            if with_locker:
+                self._lockers[name] = GimbalLocker(gimbal)
+        print(f"[GIMBAL POOL] Added '{name}' at {ip}:{port}")
+        return gimbal
+
+    def add_from_config(self, entries: List[Dict[str, Any]]) -> List[SiyiGimbal]:
+        """Add gimbals from [{'name': ..., 'ip': ..., 'port': ...}, ...] (bad entries are skipped)"""
+        added = []
+        for entry in entries or []:
+            try:
+                added.append(self.add(entry['name'], entry['ip'], int(entry.get('port', Config.SIYI_PORT))))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"[GIMBAL POOL] Skipping gimbal entry {entry!r}: {e}")
+        return added
+
+    def remove(self, name: str):
+        """Stop and forget a gimbal"""
+        with self._lock:
+            gimbal = self._gimbals.pop(name, None)
+            locker = self._lockers.pop(name, None)
+        if locker is not None:
+            locker.cleanup()
+        if gimbal is not None:
+            gimbal.stop()
+
+    def get(self, name: str) -> Optional[SiyiGimbal]:
+        return self._gimbals.get(name)
+
+    def locker(self, name: str) -> Optional[GimbalLocker]:
+        return self._lockers.get(name)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._gimbals)
+
+    def __len__(self) -> int:
+        return len(self._gimbals)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._gimbals
+
+    def __iter__(self) -> Iterator[Tuple[str, SiyiGimbal]]:
+        return iter(list(self._gimbals.items()))
+
+    # ---- lifecycle ----
+
+    def start(self, name: str) -> bool:
+        gimbal = self._gimbals.get(name)
+        return gimbal.start() if gimbal is not None else False
+
+    def start_all(self) -> Dict[str, bool]:
+        """Start every gimbal; returns success per name"""
+        return {name: gimbal.start() for name, gimbal in self}
+
+    def stop_all(self):
+        for name, gimbal in self:
+            locker = self._lockers.get(name)
+            if locker is not None:
+                locker.stop_locking()
+            gimbal.stop()
+
+    def shutdown(self):
+        """Stop all gimbals and their locker threads"""
+        for locker in list(self._lockers.values()):
+            locker.cleanup()
+        self.stop_all()
+
+    # ---- state ----
+
+    def get_state(self, name: str) -> Optional[Dict[str, Any]]:
+        gimbal = self._gimbals.get(name)
+        if gimbal is None:
+            return None
+        locker = self._lockers.get(name)
+        return {
+            'ip': gimbal.ip,
+            'port': gimbal.port,
+            'connected': gimbal.is_connected,
+            'yaw': gimbal.yaw_abs,
+            'pitch': gimbal.pitch_norm,
+            'roll': gimbal.roll,
+            'last_update': gimbal.last_update,
+            'control_mode': gimbal.active_control_mode,
+            'lock_active': bool(locker and locker.active),
+            'link': gimbal.get_link_stats(),
+        }
+
+    def get_states(self) -> Dict[str, Dict[str, Any]]:
+        """Per-gimbal state snapshot, keyed by name"""
+        return {name: self.get_state(name) for name, _ in self}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.endpoint.get_stats()
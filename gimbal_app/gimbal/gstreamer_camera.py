@@ -60,6 +60,7 @@ class GStreamerCameraStream(QObject if PYSIDE_AVAILABLE else object):
         # Overlay text properties
         self.overlay_text = ""
         self.target_coords = None
+        self.target_uncertainty = None
         
         # Status checking timer
         self.status_timer = QTimer() if PYSIDE_AVAILABLE else None
@@ -263,6 +264,11 @@ class GStreamerCameraStream(QObject if PYSIDE_AVAILABLE else object):
                             lines.append(f"DIST: {distance:04.0f}m")
                         else:
                             lines.append("DIST: CALCULATING")
+                        uncertainty = getattr(self, 'target_uncertainty', None)
+                        if uncertainty:
+                            lines.append(f"CEP: {uncertainty.cep50_m:.0f}m  "
+                                         f"ELL: {uncertainty.semi_major_m:.0f}x{uncertainty.semi_minor_m:.0f}m "
+                                         f"@{uncertainty.orientation_deg:03.0f}°")
                     else:
                         lines.append("NO TARGET SET")
                 except Exception:
@@ -282,6 +288,10 @@ class GStreamerCameraStream(QObject if PYSIDE_AVAILABLE else object):
         """Set target coordinates for overlay display"""
         self.target_coords = (lat, lon, distance)
     
+    def set_target_uncertainty(self, uncertainty):
+        """Set target error ellipse (TargetUncertainty or None) for overlay display"""
+        self.target_uncertainty = uncertainty
+    
     def set_aircraft_state(self, aircraft_state):
         """Set aircraft state for overlay display"""
         self.aircraft_state = aircraft_state
@@ -25,6 +25,7 @@ class GimbalLocker:
     
     def start_locking(self, target_lat: float, target_lon: float, target_alt: float = 0.0):
         """Start gimbal lock on target coordinates"""
+        self.gimbal.cancel_sequence("new lock target")
         self.target_lat = target_lat
         self.target_lon = target_lon
         self.target_alt = target_alt
@@ -40,6 +41,8 @@ class GimbalLocker:
             print("[GIMBAL LOCK] Cannot start position lock - gimbal not connected")
             return False
             
+        self.gimbal.cancel_sequence("position lock")
+        
         # Get current gimbal angles
         current_yaw = self.gimbal.yaw_abs if self.gimbal.yaw_abs is not None else 0
         current_pitch = self.gimbal.pitch_norm if self.gimbal.pitch_norm is not None else 0
@@ -68,6 +71,8 @@ class GimbalLocker:
         
     def update_target(self, target_lat: float, target_lon: float, target_alt: float = 0.0):
         """Update target coordinates during active lock"""
+        if (target_lat, target_lon, target_alt) != (self.target_lat, self.target_lon, self.target_alt):
+            self.gimbal.cancel_sequence("target updated")
         self.target_lat = target_lat
         self.target_lon = target_lon
         self.target_alt = target_alt
@@ -76,6 +81,10 @@ class GimbalLocker:
         """Background worker that continuously updates gimbal angles"""
         while not self._stop:
             try:
+                if self.active:
+                    # Keep the attitude stream at the high rate while locked
+                    self.gimbal.note_activity()
+                
                 if (self.active and 
                     self.aircraft_state and
                     self.target_lat is not None and
@@ -1,14 +1,47 @@
 from ..shared import *
+from typing import Callable, List
+from .siyi_protocol import (
+    SiyiFrameEncoder, SiyiFrameDecoder, SiyiFrame, JOG_PAYLOAD, ZOOM_PAYLOAD, STREAM_PAYLOAD,
+    SET_ANGLES_PAYLOAD, CMD_ZOOM, CMD_GIMBAL_ROTATION, CMD_CENTER, CMD_GIMBAL_CONFIG,
+    CMD_GIMBAL_ATTITUDE, CMD_SET_ANGLES, CMD_DATA_STREAM, STREAM_RATE_CODES, STREAM_RATES_HZ
+)
+from .siyi_link import SiyiLink, SiyiSharedEndpoint, RequestStats
+from .command_sequence import CommandSequence, SequenceRunner
+from ..ring_buffer import TimestampedRingBuffer
 
 class SiyiGimbal:
     """SIYI ZR10 gimbal communication handler"""
     
-    def __init__(self, ip: str = Config.SIYI_IP, port: int = Config.SIYI_PORT):
+    CONTROL_MODES = ("absolute", "jog")
+    ABSOLUTE_TIMEOUT_S = 0.5     # wait for the 0x0E attitude reply
+    ABSOLUTE_MAX_FAILURES = 3    # unanswered 0x0E commands before jog fallback
+    STREAM_IDLE_HZ = 10
+    STREAM_ACTIVE_HZ = 100
+    STREAM_MIN_ACTIVE_HZ = 20        # loss never pushes the active rate below this
+    STREAM_ACTIVE_HOLD_S = 2.0       # stay fast this long after the last activity
+    STREAM_LOSS_WINDOW_S = 3.0       # loss measurement window
+    STREAM_SETTLE_S = 0.5            # ignore this long after a rate change
+    STREAM_LOSS_HIGH = 0.20          # step the ceiling down above this loss
+    STREAM_LOSS_LOW = 0.05           # count a window as clean below this loss
+    STREAM_RECOVER_WINDOWS = 3       # clean windows before stepping back up
+    ATTITUDE_HISTORY_SIZE = 1024          # ~10 s at 100 Hz
+    ATTITUDE_MAX_EXTRAPOLATION_S = 0.5    # hold the newest sample this long
+    CONFIG_TIMEOUT_S = 0.5
+    CONFIG_RETRIES = 2
+    ATTITUDE_TIMEOUT_S = 0.5
+    
+    def __init__(self, ip: str = Config.SIYI_IP, port: int = Config.SIYI_PORT,
+                 endpoint: Optional[SiyiSharedEndpoint] = None,
+                 logger: Optional[GimbalLogger] = None):
         self.ip, self.port = ip, port
-        self.sock = None
-        self.seq = 1
-        self._rx_alive = False
-        self._rx_thread = None
+        self.endpoint = endpoint     # shared socket (GimbalPool), or None for a private one
+        self.link: Optional[SiyiLink] = None
+        self._encoder = SiyiFrameEncoder()
+        self._decoder = SiyiFrameDecoder({
+            CMD_GIMBAL_ATTITUDE: self._on_attitude,
+            CMD_GIMBAL_CONFIG: self._on_config,
+            CMD_SET_ANGLES: self._on_attitude,
+        })
         
         # State
         self.yaw_abs = None
@@ -16,108 +49,267 @@ class SiyiGimbal:
         self.roll = None
         self.last_update = 0
         
-        # Logger
-        self.logger = GimbalLogger()
+        # Logger (defaults to gimbal_log.txt in the working directory)
+        self.logger = logger or GimbalLogger()
         self.mount_dir = None
         self.motion_mode = None
 
         # Stream keepalive
         self._last_enable = 0.0
-        self._stream_hz = 10
+        self._stream_hz = self.STREAM_IDLE_HZ
+        
+        # Adaptive stream rate: high while active, capped by measured loss
+        self._active_until = 0.0
+        self._stream_ceiling_hz = self.STREAM_ACTIVE_HZ
+        self._stream_window_start = time.monotonic()
+        self._stream_window_frames = 0
+        self._stream_settling = False
+        self._clean_windows = 0
+        self.stream_loss = 0.0
+        
+        # Timestamped attitude samples for time-aligned lookups
+        self.attitude_history = TimestampedRingBuffer(
+            self.ATTITUDE_HISTORY_SIZE, ("yaw", "pitch", "roll"),
+            angle_fields=("yaw",), signed_angle_fields=("pitch", "roll"),
+            max_extrapolation_s=self.ATTITUDE_MAX_EXTRAPOLATION_S
+        )
+        self._one_way_delay_s = 0.0
+        
+        # Timed multi-step manoeuvres (recovery, centering) on the gimbal loop
+        self.sequences = SequenceRunner(endpoint.loop if endpoint is not None else None)
+        
+        # Angle control path (absolute falls back to jog if 0x0E goes unanswered)
+        self.control_mode = Config.GIMBAL_CONTROL_MODE if Config.GIMBAL_CONTROL_MODE in self.CONTROL_MODES else "jog"
+        self._absolute_supported = True
+        self._absolute_failures = 0
+        
+        # Request counters and latency histograms, kept across reconnects
+        self.request_stats: Dict[int, RequestStats] = {}
+    
+    @property
+    def seq(self) -> int:
+        return self._encoder.seq
+    
+    @property
+    def link_open(self) -> bool:
+        return self.link is not None and self.link.is_open
     
     def _create_frame(self, cmd: int, payload: bytes = b"") -> bytes:
-        stx = b"\x55\x66"
-        ctrl = b"\x00"
-        dlen = struct.pack("<H", len(payload))
-        seq = struct.pack("<H", self.seq & 0xFFFF); self.seq = (self.seq + 1) & 0xFFFF
-        body = stx + ctrl + dlen + seq + bytes([cmd]) + payload
-        return body + struct.pack("<H", crc16_ccitt(body))
+        return self._encoder.encode(cmd, payload)
+    
+    def _send(self, frame: bytes):
+        """Queue a frame on the link (no-op while disconnected)"""
+        if self.link is not None:
+            self.link.send(frame)
+    
+    def _send_jog(self, yaw_speed: int, pitch_speed: int):
+        """Send a 0x07 rotation command (speeds -100..100)"""
+        self._send(self._encoder.encode_struct(CMD_GIMBAL_ROTATION, JOG_PAYLOAD, yaw_speed, pitch_speed))
 
     def _enable_stream(self, hz: Optional[int] = None):
-        if not self.sock:
+        if not self.link_open:
             return
         try:
             hz = hz or self._stream_hz
-            freq_map = {0:0, 2:1, 4:2, 5:3, 10:4, 20:5, 50:6, 100:7}
-            req = min(freq_map.keys(), key=lambda f: abs(f - hz))
-            payload = bytes([1, freq_map[req]])  # data_type=1 (attitude)
-            self.sock.sendto(self._create_frame(0x25, payload), (self.ip, self.port))
+            req = min(STREAM_RATE_CODES.keys(), key=lambda f: abs(f - hz))
+            self._send(self._encoder.encode_struct(CMD_DATA_STREAM, STREAM_PAYLOAD, 1, STREAM_RATE_CODES[req]))  # data_type=1 (attitude)
             self._last_enable = time.time()
         except Exception:
             pass
+    
+    def note_activity(self, hold_s: float = STREAM_ACTIVE_HOLD_S):
+        """Ask for the high attitude rate for the next hold_s seconds (lock, jog, ...)"""
+        was_idle = time.monotonic() >= self._active_until
+        self._active_until = max(self._active_until, time.monotonic() + hold_s)
+        if was_idle and self.link_open:
+            # Switch up now rather than at the next keepalive
+            self.link.loop.call_soon_threadsafe(self._update_stream_rate)
+    
+    def _update_stream_rate(self):
+        """Pick the attitude rate from demand and measured loss (runs on the event loop)"""
+        now = time.monotonic()
+        window = now - self._stream_window_start
+        if window >= self.STREAM_LOSS_WINDOW_S and not self._stream_settling:
+            expected = self._stream_hz * window
+            received = self._stream_window_frames
+            self.stream_loss = max(0.0, 1.0 - received / expected) if expected > 0 else 0.0
+            self._adapt_rate_ceiling()
+            self._reset_stream_window(now)
+        elif self._stream_settling and window >= self.STREAM_SETTLE_S:
+            # Ignore frames from before the last rate change
+            self._stream_settling = False
+            self._reset_stream_window(now)
+        
+        active = now < self._active_until or self.sequences.active is not None
+        desired = min(self.STREAM_ACTIVE_HZ, self._stream_ceiling_hz) if active else self.STREAM_IDLE_HZ
+        if desired != self._stream_hz:
+            print(f"[GIMBAL] Attitude stream {self._stream_hz} -> {desired} Hz "
+                  f"({'active' if active else 'idle'}, loss {self.stream_loss:.0%})")
+            self._stream_hz = desired
+            self._enable_stream(desired)
+            self._stream_settling = True
+            self._reset_stream_window(now)
+    
+    def _adapt_rate_ceiling(self):
+        # Step the active-rate ceiling down on heavy loss, back up after sustained clean windows
+        rates = [r for r in STREAM_RATES_HZ if self.STREAM_MIN_ACTIVE_HZ <= r <= self.STREAM_ACTIVE_HZ]
+        index = rates.index(self._stream_ceiling_hz) if self._stream_ceiling_hz in rates else len(rates) - 1
+        if self._stream_hz != min(self.STREAM_ACTIVE_HZ, self._stream_ceiling_hz):
+            return  # only judge the ceiling while streaming at it
+        if self.stream_loss > self.STREAM_LOSS_HIGH and index > 0:
+            self._stream_ceiling_hz = rates[index - 1]
+            self._clean_windows = 0
+            print(f"[GIMBAL] Attitude stream loss {self.stream_loss:.0%}, lowering ceiling to {self._stream_ceiling_hz} Hz")
+        elif self.stream_loss < self.STREAM_LOSS_LOW:
+            self._clean_windows += 1
+            if self._clean_windows >= self.STREAM_RECOVER_WINDOWS and index < len(rates) - 1:
+                self._stream_ceiling_hz = rates[index + 1]
+                self._clean_windows = 0
+        else:
+            self._clean_windows = 0
+    
+    def _reset_stream_window(self, now: float):
+        self._stream_window_start = now
+        self._stream_window_frames = 0
+    
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """Current attitude stream rate, active-rate ceiling and measured loss"""
+        return {
+            'rate_hz': self._stream_hz,
+            'ceiling_hz': self._stream_ceiling_hz,
+            'loss': self.stream_loss,
+            'active': time.monotonic() < self._active_until,
+        }
 
     def _probe_attitude(self):
-        if not self.sock:
+        if not self.link_open:
             return
         try:
-            self.sock.sendto(self._create_frame(0x0D), (self.ip, self.port))
+            self.link.submit(self._create_frame(CMD_GIMBAL_ATTITUDE), CMD_GIMBAL_ATTITUDE,
+                             self.ATTITUDE_TIMEOUT_S)
         except Exception:
             pass
     
+    def _keepalive(self):
+        """Scheduled by the link every KEEPALIVE_INTERVAL_S on the event loop"""
+        self._update_stream_rate()
+        self._enable_stream(self._stream_hz)
+        # Config query doubles as a round-trip latency probe
+        self.request_config()
+        config_stats = self.request_stats.get(CMD_GIMBAL_CONFIG)
+        if config_stats is not None:
+            rtt_ms = config_stats.latency.percentile_ms(50)
+            if rtt_ms is not None:
+                self._one_way_delay_s = rtt_ms / 2000.0
+        # Probe when the attitude stream has gone quiet
+        if time.time() - self.last_update > 1.0:
+            self._probe_attitude()
+    
+    def _on_link_open(self):
+        """Called on the event loop whenever the socket is (re)opened"""
+        self.request_config()
+        self._enable_stream(self._stream_hz)
+    
     def start(self) -> bool:
-        if self.sock:
+        if self.link_open:
             return True
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            # Increased timeout from 0.2 to 1.0 seconds for better stability
-            self.sock.settimeout(1.0)
-            # Set socket buffer sizes to handle network issues
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
-            self._rx_alive = True
-            self._rx_thread = threading.Thread(target=self._rx_loop, daemon=True)
-            self._rx_thread.start()
-            self.request_config()
-            self._enable_stream(self._stream_hz)
+            self._absolute_supported = True
+            self._absolute_failures = 0
+            self.link = SiyiLink(self.ip, self.port, self._decoder,
+                                 keepalive=self._keepalive, on_open=self._on_link_open,
+                                 request_stats=self.request_stats, endpoint=self.endpoint)
+            if not self.link.start():
+                self.link = None
+                return False
             print(f"[GIMBAL] Successfully connected to {self.ip}:{self.port}")
             return True
         except Exception as e:
             print(f"[GIMBAL] Failed to start connection: {e}")
+            self.link = None
             return False
     
     def stop(self):
-        self._rx_alive = False
-        if self.sock:
-            try:
-                self.sock.close()
-            except Exception:
-                pass
-            self.sock = None
+        if self.sequences.cancel("gimbal stopped"):
+            self.stop_movement()
+        if self.link is not None:
+            self.link.stop()
+            self.link = None
     
     def request_attitude(self):
-        if self.sock:
-            try:
-                self.sock.sendto(self._create_frame(0x0D), (self.ip, self.port))
-            except Exception:
-                pass
+        """Tracked 0x0D attitude request (latency recorded, no retry)"""
+        self._probe_attitude()
     
     def request_config(self):
-        if self.sock:
+        """Tracked 0x0A config request (latency recorded, retried on timeout)"""
+        if self.link_open:
             try:
-                self.sock.sendto(self._create_frame(0x0A), (self.ip, self.port))
+                self.link.submit(self._create_frame(CMD_GIMBAL_CONFIG), CMD_GIMBAL_CONFIG,
+                                 self.CONFIG_TIMEOUT_S, self.CONFIG_RETRIES)
             except Exception:
                 pass
     
+    async def query_config(self, timeout: float = CONFIG_TIMEOUT_S,
+                           retries: int = CONFIG_RETRIES) -> Optional[Dict[str, str]]:
+        """Await a 0x0A config response (call on the gimbal event loop)"""
+        if not self.link_open:
+            return None
+        frame = await self.link.request(self._create_frame(CMD_GIMBAL_CONFIG), CMD_GIMBAL_CONFIG,
+                                        timeout, retries)
+        if frame is None:
+            return None
+        return {'motion_mode': self.motion_mode, 'mount_dir': self.mount_dir}
+    
+    def get_config(self, timeout: float = CONFIG_TIMEOUT_S,
+                   retries: int = CONFIG_RETRIES) -> Optional[Dict[str, str]]:
+        """Blocking 0x0A config query for callers outside the event loop"""
+        if not self.link_open:
+            return None
+        frame = self.link.request_sync(self._create_frame(CMD_GIMBAL_CONFIG), CMD_GIMBAL_CONFIG,
+                                       timeout, retries)
+        if frame is None:
+            return None
+        return {'motion_mode': self.motion_mode, 'mount_dir': self.mount_dir}
+    
     def jog(self, yaw_speed: int, pitch_speed: int):
-        if self.sock:
+        if self.link_open:
+            if yaw_speed or pitch_speed:
+                self.note_activity()
+                if self.sequences.active:
+                    self.cancel_sequence("manual movement")
             try:
                 y = clamp(yaw_speed, -100, 100)
                 p = clamp(pitch_speed, -100, 100)
-                payload = struct.pack("<bb", int(y), int(p))
-                self.sock.sendto(self._create_frame(0x07, payload), (self.ip, self.port))
+                self._send_jog(int(y), int(p))
             except Exception:
                 pass
     
     def center(self):
-        if self.sock:
+        if self.link_open:
             try:
-                self.sock.sendto(self._create_frame(0x08, b"\x01"), (self.ip, self.port))
+                self._send(self._create_frame(CMD_CENTER, b"\x01"))
             except Exception:
                 pass
     
+    def set_control_mode(self, mode: str):
+        """Select "absolute" (0x0E with jog fallback) or "jog" (0x07) angle control"""
+        if mode not in self.CONTROL_MODES:
+            raise ValueError(f"Unknown gimbal control mode: {mode}")
+        self.control_mode = mode
+        self._absolute_supported = True
+        self._absolute_failures = 0
+        print(f"[GIMBAL] Control mode: {mode}")
+    
+    @property
+    def active_control_mode(self) -> str:
+        """Control path set_angle currently uses ("jog" after an absolute fallback)"""
+        if self.control_mode == "absolute" and self._absolute_supported:
+            return "absolute"
+        return "jog"
+    
     def set_angle(self, yaw_deg: float, pitch_deg: float, speed: int = 50):
-        """Set gimbal to specific angles using controlled jogging"""
-        if not self.sock or not self.is_connected:
+        """Set gimbal to specific angles using the session's control mode"""
+        if not self.link_open or not self.is_connected:
             print(f"[GIMBAL] Cannot set angle - not connected")
             return
         
@@ -127,7 +319,71 @@ class SiyiGimbal:
         
         # UPSIDE-DOWN MOUNTING: Invert pitch for upside-down gimbal
         pitch_deg = -pitch_deg  # Flip pitch direction for upside-down mount
+        
+        self.note_activity()
+        
+        # A running recovery/centering sequence owns the gimbal until it ends
+        if self.sequences.active:
+            return
+        
+        if self.active_control_mode == "absolute":
+            # 0x0E moves the gimbal off its pitch limit by itself
+            self._set_angle_absolute(yaw_deg, pitch_deg)
+        elif not self._recover_if_stuck(pitch_deg):
+            # Jog speeds cannot drive a gimbal stuck at its pitch limit
+            self._set_angle_jog(yaw_deg, pitch_deg, speed)
+    
+    def _recover_if_stuck(self, pitch_deg: float) -> bool:
+        """Start force_pitch_recovery if the gimbal sits at its pitch limit far from the target.
+
+        Returns True only if a recovery sequence was started (jog path only).
+        """
+        current_pitch = self.pitch_norm if self.pitch_norm is not None else 0
+        if abs(current_pitch) < 90.0:
+            return False
+        pitch_diff = pitch_deg - current_pitch
+        print(f"[GIMBAL] Warning: Gimbal at pitch limit ({current_pitch:.1f}°), target clamped to {pitch_deg:.1f}°")
+        # Attempt automatic recovery with stronger commands
+        if abs(pitch_diff) <= 50.0:
+            return False
+        # Large pitch difference suggests it's stuck
+        print(f"[GIMBAL] Attempting automatic recovery - large pitch difference: {pitch_diff:.1f}°")
+        self.logger.log_recovery_attempt("Large pitch difference", current_pitch, pitch_diff)
+        return self.force_pitch_recovery()
+    
+    def _set_angle_absolute(self, yaw_deg: float, pitch_deg: float):
+        """Send one 0x0E set-angles command; the gimbal closes the loop itself"""
+        try:
+            # Express the target in the raw frame _on_attitude decodes
+            yaw_raw = (yaw_deg + 180.0) % 360.0 - 180.0
+            pitch_raw = (pitch_deg + 180.0 + 180.0) % 360.0 - 180.0
+            frame = self._encoder.encode_struct(CMD_SET_ANGLES, SET_ANGLES_PAYLOAD,
+                                                int(round(yaw_raw * 10)), int(round(pitch_raw * 10)))
+            
+            current_yaw = self.yaw_abs if self.yaw_abs is not None else 0
+            current_pitch = self.pitch_norm if self.pitch_norm is not None else 0
+            self.logger.log_gimbal_command(yaw_deg, pitch_deg, current_yaw, current_pitch, 0, 0)
             
+            future = self.link.submit(frame, CMD_SET_ANGLES, self.ABSOLUTE_TIMEOUT_S)
+            if future is not None:
+                future.add_done_callback(self._on_set_angles_done)
+        except Exception as e:
+            print(f"[GIMBAL] Error in absolute set_angle: {e}")
+    
+    def _on_set_angles_done(self, future):
+        reply = None if future.cancelled() or future.exception() else future.result()
+        if reply is not None:
+            self._absolute_failures = 0
+            return
+        self._absolute_failures += 1
+        if self._absolute_failures >= self.ABSOLUTE_MAX_FAILURES and self._absolute_supported:
+            self._absolute_supported = False
+            print(f"[GIMBAL] No reply to {self._absolute_failures} absolute angle commands - "
+                  f"falling back to jog control for this session")
+            self.logger.log_warning("Absolute angle control unanswered, using jog fallback")
+    
+    def _set_angle_jog(self, yaw_deg: float, pitch_deg: float, speed: int):
+        """Reach the target with proportional 0x07 speed jogs (one step per call)"""
         try:
             current_yaw = self.yaw_abs if self.yaw_abs is not None else 0
             current_pitch = self.pitch_norm if self.pitch_norm is not None else 0
@@ -157,23 +413,12 @@ class SiyiGimbal:
             pitch_direction = "UP" if pitch_diff > 0 else "DOWN" if pitch_diff < 0 else "NONE"
             print(f"[GIMBAL] Direction needed: Yaw {yaw_direction}, Pitch {pitch_direction}")
             
-            # Check if gimbal is stuck at limits and attempt recovery
-            if abs(current_pitch) >= 90.0:
-                print(f"[GIMBAL] Warning: Gimbal at pitch limit ({current_pitch:.1f}°), target clamped to {pitch_deg:.1f}°")
-                # Attempt automatic recovery with stronger commands
-                if abs(pitch_diff) > 50.0:  # Large pitch difference suggests it's stuck
-                    print(f"[GIMBAL] Attempting automatic recovery - large pitch difference: {pitch_diff:.1f}°")
-                    self.logger.log_recovery_attempt("Large pitch difference", current_pitch, pitch_diff)
-                    self.force_pitch_recovery()
-                    return
-                
             # Yaw movement issue detection and recovery
             if abs(yaw_diff) > 150.0:
                 print(f"[GIMBAL] Large yaw difference detected ({yaw_diff:.1f}°), using stepped approach")
                 # For very large yaw differences, use reduced speed to avoid overshooting
                 step_yaw_speed = 60 if yaw_diff > 0 else -60  # Reduced from 100 to 60
-                payload = struct.pack("<bb", step_yaw_speed, 0)  # Moderate yaw speed, no pitch
-                self.sock.sendto(self._create_frame(0x07, payload), (self.ip, self.port))
+                self._send_jog(step_yaw_speed, 0)  # Moderate yaw speed, no pitch
                 return
             
             # Only move if difference is significant
@@ -246,214 +491,219 @@ class SiyiGimbal:
                 self.logger.log_warning(f"Large yaw difference ({yaw_diff:.1f}°) with strong command ({yaw_speed})")
             
             # Send jog command  
-            payload = struct.pack("<bb", yaw_speed, pitch_speed)
-            self.sock.sendto(self._create_frame(0x07, payload), (self.ip, self.port))
+            self._send_jog(yaw_speed, pitch_speed)
             
         except Exception as e:
             print(f"[GIMBAL] Error in set_angle: {e}")
     
     def stop_movement(self):
         """Stop any gimbal movement"""
-        if self.sock:
+        if self.link_open:
             try:
-                payload = struct.pack("<bb", 0, 0)  # Stop all movement
-                self.sock.sendto(self._create_frame(0x07, payload), (self.ip, self.port))
+                self._send_jog(0, 0)  # Stop all movement
             except Exception:
                 pass
     
     def center_gimbal(self):
         """Center the gimbal (manual recovery from stuck positions)"""
-        if self.sock:
+        if self.link_open:
             try:
                 print("[GIMBAL] Sending center/home command")
-                # Send gimbal center command (if supported by firmware)
-                self.sock.sendto(self._create_frame(0x05, b""), (self.ip, self.port))
+                # 0x08 one-key centering, payload 1 = center
+                self._send(self._create_frame(CMD_CENTER, b"\x01"))
             except Exception as e:
                 print(f"[GIMBAL] Center command failed: {e}")
                 
-    def force_pitch_recovery(self):
-        """Force strong upward pitch movement to break free from -90° limit"""
-        if self.sock and self.pitch_norm and self.pitch_norm <= -89.5:
-            try:
-                print("[GIMBAL] Force recovery: sending maximum upward pitch command")
-                self.logger.log_recovery_attempt("Force recovery start", self.pitch_norm, 0)
-                
-                # Send maximum upward pitch for 2 seconds  
-                # Use negative pitch speed to go UP (protocol: negative = up, positive = down)
-                for i in range(20):  # 20 x 0.1s = 2 seconds
-                    payload = struct.pack("<bb", 0, -100)  # 0 yaw, NEGATIVE pitch for upward
-                    self.sock.sendto(self._create_frame(0x07, payload), (self.ip, self.port))
-                    if i % 5 == 0:  # Log every 0.5 seconds
-                        self.logger.log_gimbal_command(0, -89, 0, self.pitch_norm or -90, 0, -100)
-                    time.sleep(0.1)
-                    
-                # Stop movement
-                self.stop_movement()
-                print("[GIMBAL] Force recovery completed")
-                self.logger.log_recovery_attempt("Force recovery completed", self.pitch_norm, 0)
-            except Exception as e:
-                print(f"[GIMBAL] Force recovery failed: {e}")
-                self.logger.log_error("Force recovery failed", e)
+    def force_pitch_recovery(self) -> bool:
+        """Force strong upward pitch movement to break free from -90° limit (non-blocking).
+
+        Returns True if a recovery sequence was started.
+        """
+        if not (self.link_open and self.pitch_norm and self.pitch_norm <= -89.5):
+            return False
+        if self.sequences.active == "pitch_recovery":
+            return False
+        print("[GIMBAL] Force recovery: sending maximum upward pitch command")
+        self.logger.log_recovery_attempt("Force recovery start", self.pitch_norm, 0)
+        
+        sends = [0]
+        def push_up():
+            # Use negative pitch speed to go UP (protocol: negative = up, positive = down)
+            self._send_jog(0, -100)
+            if sends[0] % 5 == 0:  # Log every 0.5 seconds
+                self.logger.log_gimbal_command(0, -89, 0, self.pitch_norm or -90, 0, -100)
+            sends[0] += 1
+        
+        def done(ok: bool):
+            self.stop_movement()
+            print("[GIMBAL] Force recovery completed")
+            self.logger.log_recovery_attempt("Force recovery completed", self.pitch_norm, 0)
+        
+        # Maximum upward pitch for 2 seconds, then stop
+        self.sequences.run(CommandSequence("pitch_recovery")
+                           .repeat(push_up, period_s=0.1, duration_s=2.0)
+                           .finally_(done)
+                           .cleanup(self.stop_movement))
+        return True
+    
+    def start_centering(self, on_done: Optional[Callable[[bool], None]] = None,
+                        timeout_s: float = 15.0):
+        """
+        Drive the gimbal to yaw 0° / pitch 0° (non-blocking).
+        
+        Sends the built-in center command, then jogs toward center every
+        200 ms until within 2° or timeout_s, and stops.
+        """
+        if not self.link_open:
+            return
+        center_speed = 50
+        creep_speed = 15
+        
+        def centering_errors() -> Tuple[float, float]:
+            # Shortest path for yaw (handle 360° wraparound)
+            yaw_error = -(self.yaw_abs or 0)
+            if yaw_error > 180:
+                yaw_error -= 360
+            elif yaw_error < -180:
+                yaw_error += 360
+            return yaw_error, -(self.pitch_norm or 0)
+        
+        def centered() -> bool:
+            yaw_error, pitch_error = centering_errors()
+            return abs(yaw_error) <= 2 and abs(pitch_error) <= 2
+        
+        def axis_speed(error: float) -> int:
+            # Full speed far out, creep speed inside 5° so the 2° band is reachable
+            if abs(error) <= 2:
+                return 0
+            speed = center_speed if abs(error) > 5 else creep_speed
+            return speed if error > 0 else -speed
+        
+        def jog_toward_center():
+            yaw_error, pitch_error = centering_errors()
+            # Protocol: negative pitch speed = up (same convention as set_angle)
+            self._send_jog(axis_speed(yaw_error), -axis_speed(pitch_error))
+        
+        def done(ok: bool):
+            self.stop_movement()
+            print("[GIMBAL] Centering completed" if ok else "[GIMBAL] Centering timed out")
+            if on_done:
+                on_done(ok)
+        
+        self.sequences.run(CommandSequence("center")
+                           .then(self.center_gimbal, wait_s=0.1)
+                           .repeat(jog_toward_center, period_s=0.2, duration_s=timeout_s, until=centered)
+                           .finally_(done)
+                           .cleanup(self.stop_movement))
+    
+    def cancel_sequence(self, reason: str = "") -> bool:
+        """Cancel a running recovery/centering sequence (it stops the gimbal)"""
+        return self.sequences.cancel(reason)
     
     def zoom_in(self):
         """Start zooming in (continuous zoom)"""
-        if self.sock:
+        if self.link_open:
             try:
                 # Command 0x05 with payload 1 for zoom in
-                payload = struct.pack("<b", 1)
-                self.sock.sendto(self._create_frame(0x05, payload), (self.ip, self.port))
+                self._send(self._encoder.encode_struct(CMD_ZOOM, ZOOM_PAYLOAD, 1))
                 print("[GIMBAL] Zoom in started")
             except Exception as e:
                 print(f"[GIMBAL] Zoom in failed: {e}")
     
     def zoom_out(self):
         """Start zooming out (continuous zoom)"""
-        if self.sock:
+        if self.link_open:
             try:
                 # Command 0x05 with payload -1 for zoom out
-                payload = struct.pack("<b", -1)
-                self.sock.sendto(self._create_frame(0x05, payload), (self.ip, self.port))
+                self._send(self._encoder.encode_struct(CMD_ZOOM, ZOOM_PAYLOAD, -1))
                 print("[GIMBAL] Zoom out started")
             except Exception as e:
                 print(f"[GIMBAL] Zoom out failed: {e}")
     
     def zoom_hold(self):
         """Stop zooming (hold current zoom level)"""
-        if self.sock:
+        if self.link_open:
             try:
                 # Command 0x05 with payload 0 for zoom stop/hold
-                payload = struct.pack("<b", 0)
-                self.sock.sendto(self._create_frame(0x05, payload), (self.ip, self.port))
+                self._send(self._encoder.encode_struct(CMD_ZOOM, ZOOM_PAYLOAD, 0))
                 print("[GIMBAL] Zoom hold/stop")
             except Exception as e:
                 print(f"[GIMBAL] Zoom hold failed: {e}")
     
     def _parse_packet(self, packet: bytes):
-        if len(packet) < 12 or packet[:2] != b"\x55\x66":
+        """Decode every frame in a received datagram"""
+        self._decoder.feed_datagram(packet)
+    
+    def _on_attitude(self, frame: SiyiFrame):
+        # 0x0D carries yaw/pitch/roll and rates; the 0x0E reply only the angles
+        if len(frame.payload) < 6:
             return
-        dlen = struct.unpack_from("<H", packet, 3)[0]
-        cmd = packet[7]
-        payload = packet[8:8+dlen]
-        
-        if cmd == 0x0D and len(payload) >= 12:
-            yaw_i, pitch_i, roll_i = struct.unpack_from("<hhh", payload, 0)[:3]
-            self.yaw_abs = (yaw_i / 10.0) % 360.0
-            self.pitch_norm = pitch_i / 10.0 - 180.0
-            while self.pitch_norm > 180: self.pitch_norm -= 360
-            while self.pitch_norm < -180: self.pitch_norm += 360
-            self.roll = roll_i / 10.0
-            self.last_update = time.time()
-        elif cmd == 0x0A and len(payload) >= 6:
-            motion_mode = payload[4]
-            mount_dir = payload[5]
-            self.motion_mode = {0:"Follow", 1:"Lock", 2:"FPV"}.get(motion_mode, f"Unknown({motion_mode})")
-            self.mount_dir = {1:"Normal", 2:"UpsideDown"}.get(mount_dir, f"Unknown({mount_dir})")
-    
-    def _rx_loop(self):
-        consecutive_errors = 0
-        max_consecutive_errors = 10
+        yaw_i, pitch_i, roll_i = struct.unpack_from("<hhh", frame.payload, 0)
+        self.yaw_abs = (yaw_i / 10.0) % 360.0
+        self.pitch_norm = pitch_i / 10.0 - 180.0
+        while self.pitch_norm > 180: self.pitch_norm -= 360
+        while self.pitch_norm < -180: self.pitch_norm += 360
+        self.roll = roll_i / 10.0
+        self.last_update = time.time()
+        if frame.cmd == CMD_GIMBAL_ATTITUDE:
+            self._stream_window_frames += 1
         
-        while self._rx_alive:
-            # More robust stream keepalive - enable more frequently
-            if time.time() - self._last_enable > 1.5:  # Reduced from 2.0 to 1.5
-                self._enable_stream(self._stream_hz)
-            
-            try:
-                data, _ = self.sock.recvfrom(2048)
-                self._parse_packet(data)
-                consecutive_errors = 0  # Reset error counter on successful receive
-                
-            except socket.timeout:
-                # Probe attitude more frequently on timeout
-                self._probe_attitude()
-                consecutive_errors += 1
-                if consecutive_errors > max_consecutive_errors:
-                    print(f"[GIMBAL] Too many consecutive timeouts ({consecutive_errors}), attempting reconnection")
-                    self._attempt_reconnect()
-                    consecutive_errors = 0
-                continue
-                
-            except OSError as e:
-                error_msg = str(e)
-                print(f"[GIMBAL] Socket error in RX loop: {error_msg}")
-                
-                # Handle specific socket errors differently
-                if "Bad file descriptor" in error_msg or "Socket operation on non-socket" in error_msg:
-                    print(f"[GIMBAL] Socket closed unexpectedly - attempting restart")
-                    break  # Socket is invalid, need to restart connection
-                
-                consecutive_errors += 1
-                if consecutive_errors > 8:  # Increased tolerance from 3 to 8
-                    print(f"[GIMBAL] Too many consecutive socket errors ({consecutive_errors}), restarting connection")
-                    break
-                    
-                time.sleep(0.3)  # Increased pause from 0.1 to 0.3 seconds
-                continue
-                
-            except Exception as e:
-                print(f"[GIMBAL] Unexpected error in RX loop: {e}")
-                consecutive_errors += 1
-                if consecutive_errors > 5:
-                    break
-                time.sleep(0.1)
-                continue
-    
-    def _attempt_reconnect(self):
-        """Attempt to reconnect the gimbal connection with improved stability"""
-        print("[GIMBAL] Attempting to reconnect...")
-        try:
-            # Safely close existing socket
-            if self.sock:
-                try:
-                    self.sock.close()
-                except Exception:
-                    pass
-                self.sock = None
-            
-            # Wait longer for network to stabilize
-            time.sleep(1.0)  # Increased from 0.5 to 1.0 seconds
-            
-            # Create new socket with improved settings
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.sock.settimeout(1.0)
-            
-            # Enhanced socket buffer sizes and options
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Allow address reuse
-            
-            # Test connection with a simple request first
-            self.request_config()
-            time.sleep(0.2)  # Allow config response
-            
-            # Enable stream after config is stable
-            self._enable_stream(self._stream_hz)
-            
-            print("[GIMBAL] Reconnection successful")
-        except Exception as e:
-            print(f"[GIMBAL] Reconnection failed: {e}")
-            # Ensure socket is cleaned up on failure
-            if self.sock:
-                try:
-                    self.sock.close()
-                except Exception:
-                    pass
-                self.sock = None
-
+        # Time-stamp the sample at the gimbal: datagram arrival minus the
+        # estimated one-way link delay
+        arrival = self.link.last_rx if self.link is not None and self.link.last_rx else self.last_update
+        self.attitude_history.append(arrival - self._one_way_delay_s, self.yaw_abs, self.pitch_norm, self.roll)
+    
+    def _on_config(self, frame: SiyiFrame):
+        if len(frame.payload) < 6:
+            return
+        motion_mode = frame.payload[4]
+        mount_dir = frame.payload[5]
+        self.motion_mode = {0:"Follow", 1:"Lock", 2:"FPV"}.get(motion_mode, f"Unknown({motion_mode})")
+        self.mount_dir = {1:"Normal", 2:"UpsideDown"}.get(mount_dir, f"Unknown({mount_dir})")
+    
+    def get_link_stats(self) -> Dict[str, int]:
+        """Decoder and link counters (valid, CRC errors, malformed, dropped, ...)"""
+        stats = self._decoder.get_stats()
+        if self.link is not None:
+            stats.update(datagrams=self.link.datagrams, socket_errors=self.link.socket_errors,
+                         reconnects=self.link.reconnects, pending_requests=self.link.pending_count)
+        return stats
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-command request counters and round-trip latency (ms), keyed '0xNN'"""
+        return {f"0x{cmd:02X}": stats.summary() for cmd, stats in sorted(self.request_stats.items())}
+    
+    def get_latency_histograms(self) -> Dict[str, List[Tuple[int, int, int]]]:
+        """Non-empty latency buckets (low_us, high_us, count) per command, for persisting"""
+        return {f"0x{cmd:02X}": stats.latency.buckets() for cmd, stats in sorted(self.request_stats.items())}
+    
     @property
     def is_connected(self) -> bool:
         # More lenient connection check - allow up to 3 seconds without updates
-        return (self.sock is not None and 
+        return (self.link_open and 
                 self.yaw_abs is not None and 
                 time.time() - self.last_update < 3.0)
     
     def get_corrected_angles(self, aircraft_heading: float) -> Tuple[Optional[float], Optional[float]]:
         if not self.is_connected:
             return None, None
-        
-        raw_pitch = self.pitch_norm
-        raw_yaw = self.yaw_abs
-        
+        return self._correct_angles(self.pitch_norm, self.yaw_abs, aircraft_heading)
+    
+    def get_attitude_at(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
+        """Raw (yaw_abs, pitch_norm, roll) interpolated at a time.time() timestamp"""
+        return self.attitude_history.values_at(timestamp)
+    
+    def get_corrected_angles_at(self, timestamp: float,
+                                aircraft_heading: float) -> Tuple[Optional[float], Optional[float]]:
+        """get_corrected_angles() for the attitude at timestamp (None, None if not buffered)"""
+        attitude = self.attitude_history.values_at(timestamp)
+        if attitude is None:
+            return None, None
+        yaw, pitch, _ = attitude
+        return self._correct_angles(pitch, yaw, aircraft_heading)
+    
+    def _correct_angles(self, raw_pitch: float, raw_yaw: float,
+                        aircraft_heading: float) -> Tuple[float, float]:
         if self.mount_dir == "UpsideDown":
             corrected_pitch = -raw_pitch
             corrected_yaw_offset = (raw_yaw + 180.0) % 360.0
@@ -0,0 +1,542 @@
+"""
+Asyncio UDP transport for SIYI gimbals
+
+All gimbal links in the process share one event loop running in a daemon
+thread. Datagrams are decoded and dispatched as soon as they arrive (no
+polling timeouts), keepalives and the silence watchdog are scheduled with
+call_later, and request/response exchanges can be awaited.
+
+A link either owns a connected socket or attaches to a SiyiSharedEndpoint,
+one unconnected socket that serves many gimbals and routes each datagram to
+its link by source address (see GimbalPool).
+"""
+
+import asyncio
+import concurrent.futures
+import ipaddress
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..latency_histogram import LatencyHistogram
+from .siyi_protocol import HEADER, STREAMED_CMDS, SiyiFrame, SiyiFrameDecoder
+
+# Socket buffer sizes, as used by the old blocking socket
+SOCKET_BUFFER_BYTES = 65536
+
+
+# ====================================================================
+# Shared event loop
+# ====================================================================
+
+_gimbal_loop: Optional[asyncio.AbstractEventLoop] = None
+_gimbal_loop_thread: Optional[threading.Thread] = None
+_gimbal_loop_lock = threading.Lock()
+
+
+def get_gimbal_event_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the process-wide gimbal I/O event loop"""
+    global _gimbal_loop, _gimbal_loop_thread
+    with _gimbal_loop_lock:
+        if _gimbal_loop is None or _gimbal_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_run_loop, args=(loop,), name="gimbal-io", daemon=True)
+            thread.start()
+            _gimbal_loop, _gimbal_loop_thread = loop, thread
+        return _gimbal_loop
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def shutdown_gimbal_event_loop(timeout: float = 2.0):
+    """Stop the shared event loop (links should be stopped first)"""
+    global _gimbal_loop, _gimbal_loop_thread
+    with _gimbal_loop_lock:
+        loop, thread = _gimbal_loop, _gimbal_loop_thread
+        _gimbal_loop = _gimbal_loop_thread = None
+    if loop is not None and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_drain_and_stop(), loop)
+    if thread is not None and thread is not threading.current_thread():
+        thread.join(timeout)
+
+
+async def _drain_and_stop():
+    # Let outstanding requests unwind before the loop stops
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    asyncio.get_running_loop().stop()
+
+
+# ====================================================================
+# Datagram protocol
+# ====================================================================
+
+class SiyiDatagramProtocol(asyncio.DatagramProtocol):
+    """Hands every received datagram to its owner (a SiyiLink or SiyiSharedEndpoint)"""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        self.owner._on_datagram(data, addr)
+
+    def error_received(self, exc: Exception):
+        self.owner.socket_errors += 1
+        # ICMP errors repeat at the keepalive rate while the gimbal is down
+        if self.owner.socket_errors % 50 == 1:
+            print(f"[GIMBAL] Socket error on {self.owner.describe()}: {exc}")
+
+    def connection_lost(self, exc: Optional[Exception]):
+        if exc is not None:
+            print(f"[GIMBAL] {self.owner.describe()} lost: {exc}")
+
+
+def _configure_socket(transport: asyncio.DatagramTransport):
+    sock = transport.get_extra_info('socket')
+    if sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES)
+
+
+# ====================================================================
+# Shared endpoint
+# ====================================================================
+
+class SiyiSharedEndpoint:
+    """
+    One UDP socket shared by many SiyiLinks on the gimbal event loop.
+
+    Gimbals answer to the address a command came from, so a single unconnected
+    socket can talk to any number of them; received datagrams are routed to the
+    link registered for their source (ip, port) with one dict lookup. Gimbals
+    must therefore have distinct addresses (SIYI units all ship as
+    192.168.144.25). The socket opens with the first link and closes with the last.
+    """
+
+    def __init__(self, bind: Tuple[str, int] = ("0.0.0.0", 0),
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.bind = bind
+        self.loop = loop or get_gimbal_event_loop()
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._links: Dict[Tuple[str, int], 'SiyiLink'] = {}
+
+        # Statistics
+        self.datagrams = 0
+        self.unknown_datagrams = 0   # from addresses with no attached link
+        self.socket_errors = 0
+
+    def describe(self) -> str:
+        return f"shared gimbal socket {self.local_address}"
+
+    @property
+    def local_address(self) -> Optional[Tuple[str, int]]:
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info('sockname')
+
+    @property
+    def link_count(self) -> int:
+        return len(self._links)
+
+    async def resolve(self, ip: str, port: int) -> Tuple[str, int]:
+        """Numeric (ip, port) that this gimbal's datagrams will come from.
+
+        Host names go through loop.getaddrinfo (run in the loop's executor),
+        so a slow DNS lookup never stalls I/O for the other gimbals.
+        """
+        try:
+            return str(ipaddress.IPv4Address(ip)), port
+        except ValueError:
+            infos = await self.loop.getaddrinfo(ip, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            return infos[0][4][0], port
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'links': len(self._links),
+            'datagrams': self.datagrams,
+            'unknown_datagrams': self.unknown_datagrams,
+            'socket_errors': self.socket_errors,
+        }
+
+    # ---- event loop side (called by SiyiLink) ----
+
+    async def attach(self, link: 'SiyiLink') -> Tuple[asyncio.DatagramTransport, Tuple[str, int]]:
+        """Register link; returns the shared transport and the link's numeric address"""
+        # Datagram sources are numeric; resolve names once at attach time
+        key = await self.resolve(link.ip, link.port)
+        other = self._links.get(key)
+        if other is not None and other is not link:
+            raise ValueError(f"Another gimbal link already uses {link.ip}:{link.port}")
+        if self._transport is None or self._transport.is_closing():
+            self._transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: SiyiDatagramProtocol(self), local_addr=self.bind
+            )
+            _configure_socket(self._transport)
+        self._links[key] = link
+        return self._transport, key
+
+    def detach(self, link: 'SiyiLink'):
+        for key, candidate in list(self._links.items()):
+            if candidate is link:
+                del self._links[key]
+        if not self._links and self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def _on_datagram(self, data: bytes, addr: Tuple[str, int]):
+        self.datagrams += 1
+        link = self._links.get(addr[:2])
+        if link is None:
+            self.unknown_datagrams += 1
+            return
+        link._on_datagram(data, addr)
+
+
+# ====================================================================
+# Request tracking
+# ====================================================================
+
+class PendingRequest:
+    """One outstanding request, keyed by (response command, sequence number)"""
+    __slots__ = ('cmd', 'seq', 'response_cmd', 'frame', 'future', 'timeout',
+                 'retries_left', 'attempts', 'sent_at', 'timer')
+
+    def __init__(self, frame: bytes, response_cmd: int, future: asyncio.Future,
+                 timeout: float, retries: int):
+        _, _, _, self.seq, self.cmd = HEADER.unpack_from(frame, 0)
+        self.response_cmd = response_cmd
+        self.frame = frame
+        self.future = future
+        self.timeout = timeout
+        self.retries_left = retries
+        self.attempts = 0
+        self.sent_at = 0.0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.response_cmd, self.seq
+
+
+class RequestStats:
+    """Per-command request counters and round-trip latency histogram"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.sent = 0          # requests issued (not counting retries)
+        self.retries = 0       # retransmissions
+        self.completed = 0     # requests that got a response
+        self.timeouts = 0      # requests that exhausted their retries
+        self.ambiguous = 0     # responses to retransmitted or streamed requests (no RTT sample)
+        self.unechoed = 0      # responses without the request's sequence number (matched oldest first)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'sent': self.sent,
+            'retries': self.retries,
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'ambiguous': self.ambiguous,
+            'unechoed': self.unechoed,
+            **self.latency.summary(),
+        }
+
+
+# ====================================================================
+# Link
+# ====================================================================
+
+class SiyiLink:
+    """
+    UDP link to one SIYI gimbal on the shared event loop.
+
+    Public methods are thread-safe; frame handlers and the keepalive callback
+    run on the event loop thread.
+    """
+
+    KEEPALIVE_INTERVAL_S = 1.5   # stream re-enable / probe cadence
+    RECONNECT_AFTER_S = 10.0     # silence before the socket is recreated
+    START_TIMEOUT_S = 2.0
+
+    def __init__(self, ip: str, port: int, decoder: SiyiFrameDecoder,
+                 keepalive: Optional[Callable[[], None]] = None,
+                 on_open: Optional[Callable[[], None]] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 request_stats: Optional[Dict[int, 'RequestStats']] = None,
+                 endpoint: Optional[SiyiSharedEndpoint] = None,
+                 streamed_cmds: frozenset = STREAMED_CMDS):
+        """
+        Args:
+            ip, port: Gimbal address
+            decoder: Decoder (with handlers) fed with every datagram
+            keepalive: Called every KEEPALIVE_INTERVAL_S on the loop thread
+            on_open: Called on the loop thread after the socket is (re)opened
+            loop: Event loop; defaults to the shared gimbal loop
+            request_stats: Per-command stats dict to update (shared across links)
+            endpoint: Shared socket to attach to instead of opening a connected one
+            streamed_cmds: Command ids the gimbal also sends unsolicited; replies
+                to these must echo the request sequence number and give no RTT sample
+        """
+        self.ip, self.port = ip, port
+        self.decoder = decoder
+        self.keepalive = keepalive
+        self.on_open = on_open
+        self.endpoint = endpoint
+        self.streamed_cmds = streamed_cmds
+        self.loop = endpoint.loop if endpoint is not None else (loop or get_gimbal_event_loop())
+
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._remote: Optional[Tuple[str, int]] = None   # sendto address on a shared socket
+        self._keepalive_handle: Optional[asyncio.TimerHandle] = None
+        self._reconnecting = False
+        self._stopped = True
+        self._last_activity = 0.0    # last datagram or (re)open, for the watchdog
+
+        # Outstanding requests in send order, and per-command statistics
+        self._pending: Dict[Tuple[int, int], PendingRequest] = {}
+        self.request_stats: Dict[int, RequestStats] = request_stats if request_stats is not None else {}
+        decoder.on_frame = self._on_frame
+
+        # Link statistics
+        self.last_rx = 0.0           # time.time() of the last datagram
+        self.last_rx_latency = 0.0   # arrival -> handlers done, seconds
+        self.datagrams = 0
+        self.socket_errors = 0
+        self.reconnects = 0
+
+    # ---- lifecycle (any thread) ----
+
+    def start(self) -> bool:
+        """Open the UDP endpoint and start keepalives. Blocks until the socket exists."""
+        if self.is_open:
+            return True
+        future = asyncio.run_coroutine_threadsafe(self._open(), self.loop)
+        try:
+            future.result(self.START_TIMEOUT_S)
+        except Exception as e:
+            print(f"[GIMBAL] Failed to open link to {self.ip}:{self.port}: {e}")
+            return False
+        return True
+
+    def stop(self):
+        """Close the endpoint, cancel keepalives and fail pending requests"""
+        self._stopped = True
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._close)
+
+    def describe(self) -> str:
+        return f"link to {self.ip}:{self.port}"
+
+    @property
+    def is_open(self) -> bool:
+        return self._transport is not None and not self._stopped
+
+    def send(self, frame: bytes):
+        """Queue a frame for sending on the event loop"""
+        if self._stopped or self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self._sendto, frame)
+
+    async def request(self, frame: bytes, response_cmd: int, timeout: float = 1.0,
+                      retries: int = 0) -> Optional[SiyiFrame]:
+        """
+        Send frame and await its response (call on the event loop).
+
+        The frame is resent with the same sequence number up to `retries`
+        times, each attempt waiting `timeout` seconds. Returns the response
+        frame, or None once every attempt has timed out.
+        """
+        future = self.loop.create_future()
+        self._issue(PendingRequest(frame, response_cmd, future, timeout, retries))
+        return await future
+
+    def submit(self, frame: bytes, response_cmd: int, timeout: float = 1.0,
+               retries: int = 0) -> Optional[concurrent.futures.Future]:
+        """Thread-safe, non-blocking request(); returns a concurrent Future"""
+        if self._stopped or self.loop.is_closed():
+            return None
+        return asyncio.run_coroutine_threadsafe(
+            self.request(frame, response_cmd, timeout, retries), self.loop)
+
+    def request_sync(self, frame: bytes, response_cmd: int, timeout: float = 1.0,
+                     retries: int = 0) -> Optional[SiyiFrame]:
+        """Blocking request() for callers outside the event loop"""
+        future = self.submit(frame, response_cmd, timeout, retries)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout * (retries + 1) + 0.5)
+        except Exception:
+            return None
+
+    def get_request_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Request counters and latency summary (ms) per command, keyed '0xNN'"""
+        return {f"0x{cmd:02X}": stats.summary() for cmd, stats in sorted(self.request_stats.items())}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # ---- event loop side ----
+
+    async def _open(self):
+        self._stopped = False
+        await self._create_endpoint()
+        self._schedule_keepalive()
+
+    async def _create_endpoint(self):
+        if self.endpoint is not None:
+            # Send to the resolved address: sendto() with a name would look it up on every datagram
+            transport, self._remote = await self.endpoint.attach(self)
+        else:
+            transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: SiyiDatagramProtocol(self), remote_addr=(self.ip, self.port)
+            )
+            _configure_socket(transport)
+            self._remote = None
+        self._transport = transport
+        self._last_activity = time.time()
+        self.decoder.reset()
+        if self.on_open:
+            self.on_open()
+
+    def _close(self):
+        if self._keepalive_handle:
+            self._keepalive_handle.cancel()
+            self._keepalive_handle = None
+        self._release_transport()
+        for pending in self._pending.values():
+            self._finish(pending, None)
+        self._pending.clear()
+
+    def _release_transport(self):
+        if self._transport is None:
+            return
+        if self.endpoint is not None:
+            self.endpoint.detach(self)
+        else:
+            self._transport.close()
+        self._transport = None
+
+    def _sendto(self, frame: bytes):
+        if self._transport is not None:
+            self._transport.sendto(frame, self._remote)
+
+    def _on_datagram(self, data: bytes, addr: Tuple[str, int]):
+        arrived = time.perf_counter()
+        self.datagrams += 1
+        self.last_rx = self._last_activity = time.time()
+        self.decoder.feed_datagram(data)
+        self.last_rx_latency = time.perf_counter() - arrived
+
+    def _issue(self, pending: PendingRequest):
+        stats = self.request_stats.get(pending.cmd)
+        if stats is None:
+            stats = self.request_stats[pending.cmd] = RequestStats()
+        stats.sent += 1
+        # A reused sequence number supersedes the older request
+        stale = self._pending.pop(pending.key, None)
+        if stale is not None:
+            self._finish(stale, None)
+        self._pending[pending.key] = pending
+        self._transmit(pending)
+
+    def _transmit(self, pending: PendingRequest):
+        pending.attempts += 1
+        pending.sent_at = time.perf_counter()
+        pending.timer = self.loop.call_later(pending.timeout, self._on_request_timeout, pending)
+        self._sendto(pending.frame)
+
+    def _on_request_timeout(self, pending: PendingRequest):
+        pending.timer = None
+        if self._pending.get(pending.key) is not pending:
+            return
+        stats = self.request_stats[pending.cmd]
+        if pending.retries_left > 0 and not self._stopped:
+            pending.retries_left -= 1
+            stats.retries += 1
+            self._transmit(pending)
+            return
+        stats.timeouts += 1
+        del self._pending[pending.key]
+        self._finish(pending, None)
+
+    def _on_frame(self, frame: SiyiFrame):
+        # Exact (cmd, seq) match first; firmware that does not echo the request
+        # sequence number gets the oldest outstanding request for that command.
+        # Not for streamed commands: any stream frame would "answer" the request
+        streamed = frame.cmd in self.streamed_cmds
+        pending = self._pending.pop((frame.cmd, frame.seq), None)
+        echoed = pending is not None
+        if pending is None:
+            if streamed:
+                return
+            for key, candidate in self._pending.items():
+                if candidate.response_cmd == frame.cmd:
+                    pending = self._pending.pop(key)
+                    break
+            else:
+                return
+        stats = self.request_stats[pending.cmd]
+        stats.completed += 1
+        if not echoed:
+            stats.unechoed += 1
+        if pending.attempts == 1 and not streamed:
+            stats.latency.record(time.perf_counter() - pending.sent_at)
+        else:
+            # Karn's rule: the reply may belong to any attempt; and a stream
+            # frame can carry a matching sequence number by chance
+            stats.ambiguous += 1
+        self._finish(pending, frame)
+
+    @staticmethod
+    def _finish(pending: PendingRequest, frame: Optional[SiyiFrame]):
+        if pending.timer:
+            pending.timer.cancel()
+            pending.timer = None
+        if not pending.future.done():
+            pending.future.set_result(frame)
+
+    def _schedule_keepalive(self):
+        if not self._stopped:
+            self._keepalive_handle = self.loop.call_later(self.KEEPALIVE_INTERVAL_S, self._on_keepalive)
+
+    def _on_keepalive(self):
+        self._keepalive_handle = None
+        if self._stopped:
+            return
+        try:
+            if self.keepalive:
+                self.keepalive()
+            silence = time.time() - self._last_activity
+            if silence > self.RECONNECT_AFTER_S and not self._reconnecting:
+                print(f"[GIMBAL] No data for {silence:.1f}s, reopening link to {self.ip}:{self.port}")
+                self.loop.create_task(self._reconnect())
+        except Exception as e:
+            print(f"[GIMBAL] Keepalive error: {e}")
+        self._schedule_keepalive()
+
+    async def _reconnect(self):
+        self._reconnecting = True
+        try:
+            self._release_transport()
+            await self._create_endpoint()
+            self.reconnects += 1
+            print("[GIMBAL] Reconnection successful")
+        except Exception as e:
+            print(f"[GIMBAL] Reconnection failed: {e}")
+        finally:
+            self._reconnecting = False
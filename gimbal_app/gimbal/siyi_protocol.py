@@ -0,0 +1,238 @@
+"""
+SIYI SDK wire protocol
+
+Frame layout (little-endian):
+    STX(2)=0x55 0x66 | CTRL(1) | DATA_LEN(2) | SEQ(2) | CMD_ID(1) | DATA(n) | CRC16(2)
+
+CRC16 is CCITT/XModem (poly 0x1021, init 0) over everything before the CRC.
+"""
+
+import struct
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+from ..shared import crc16_ccitt
+
+STX = b"\x55\x66"
+STX_WORD = 0x6655  # STX as a little-endian uint16
+
+HEADER = struct.Struct("<HBHHB")   # stx, ctrl, data_len, seq, cmd_id
+CRC = struct.Struct("<H")
+HEADER_SIZE = HEADER.size          # 8
+CRC_SIZE = CRC.size                # 2
+MIN_FRAME_SIZE = HEADER_SIZE + CRC_SIZE
+
+# Largest payload accepted on encode/decode (SIYI frames are well below this)
+MAX_PAYLOAD = 1024
+
+CTRL_NO_ACK = 0x00
+
+# Command IDs
+CMD_ZOOM = 0x05
+CMD_GIMBAL_ROTATION = 0x07
+CMD_CENTER = 0x08
+CMD_GIMBAL_CONFIG = 0x0A
+CMD_GIMBAL_ATTITUDE = 0x0D
+CMD_SET_ANGLES = 0x0E
+CMD_DATA_STREAM = 0x25
+
+# Commands the gimbal also sends unsolicited once CMD_DATA_STREAM enables them,
+# so a frame with one of these ids is not necessarily a reply to a request
+STREAMED_CMDS = frozenset({CMD_GIMBAL_ATTITUDE})
+
+# 0x25 data-stream frequency codes by rate (Hz)
+STREAM_RATE_CODES = {0: 0, 2: 1, 4: 2, 5: 3, 10: 4, 20: 5, 50: 6, 100: 7}
+STREAM_RATES_HZ = tuple(sorted(rate for rate in STREAM_RATE_CODES if rate))
+
+# Reusable payload layouts
+JOG_PAYLOAD = struct.Struct("<bb")          # yaw speed, pitch speed (-100..100)
+ZOOM_PAYLOAD = struct.Struct("<b")          # 1 in, -1 out, 0 hold
+STREAM_PAYLOAD = struct.Struct("<BB")       # data type, frequency code
+ATTITUDE_PAYLOAD = struct.Struct("<hhhhhh") # yaw, pitch, roll (0.1 deg) and their rates
+SET_ANGLES_PAYLOAD = struct.Struct("<hh")   # target yaw, pitch (0.1 deg); reply is yaw, pitch, roll
+
+
+class SiyiFrameEncoder:
+    """
+    Builds SIYI frames in a preallocated buffer.
+
+    Header and CRC are written with precompiled structs and payload structs can
+    be packed straight into the buffer, so encoding a jog command allocates only
+    the returned bytes. Thread-safe: the buffer and sequence counter are shared.
+    """
+
+    def __init__(self, max_payload: int = MAX_PAYLOAD):
+        self.max_payload = max_payload
+        self._buf = bytearray(HEADER_SIZE + max_payload + CRC_SIZE)
+        self._view = memoryview(self._buf)
+        self._lock = threading.Lock()
+        self.seq = 1
+
+    def _finish(self, cmd: int, payload_len: int, ctrl: int) -> bytes:
+        # Caller holds self._lock and has written the payload at HEADER_SIZE
+        seq = self.seq
+        self.seq = (seq + 1) & 0xFFFF
+        HEADER.pack_into(self._buf, 0, STX_WORD, ctrl, payload_len, seq, cmd)
+        end = HEADER_SIZE + payload_len
+        CRC.pack_into(self._buf, end, crc16_ccitt(self._view[:end]))
+        return bytes(self._view[:end + CRC_SIZE])
+
+    def encode(self, cmd: int, payload: bytes = b"", ctrl: int = CTRL_NO_ACK) -> bytes:
+        """Encode a frame with a raw payload."""
+        length = len(payload)
+        if length > self.max_payload:
+            raise ValueError(f"SIYI payload too large: {length} > {self.max_payload}")
+        with self._lock:
+            self._buf[HEADER_SIZE:HEADER_SIZE + length] = payload
+            return self._finish(cmd, length, ctrl)
+
+    def encode_struct(self, cmd: int, layout: struct.Struct, *values,
+                      ctrl: int = CTRL_NO_ACK) -> bytes:
+        """Encode a frame whose payload is packed directly from layout and values."""
+        with self._lock:
+            layout.pack_into(self._buf, HEADER_SIZE, *values)
+            return self._finish(cmd, layout.size, ctrl)
+
+
+def encode_frame(cmd: int, payload: bytes = b"", seq: int = 0, ctrl: int = CTRL_NO_ACK) -> bytes:
+    """Stateless one-off frame encoder (tools, simulators, tests)."""
+    body = HEADER.pack(STX_WORD, ctrl, len(payload), seq & 0xFFFF, cmd) + payload
+    return body + CRC.pack(crc16_ccitt(body))
+
+
+class SiyiFrame(NamedTuple):
+    """One decoded, CRC-validated SIYI frame"""
+    ctrl: int
+    seq: int
+    cmd: int
+    payload: bytes
+
+
+FrameHandler = Callable[[SiyiFrame], None]
+
+
+class SiyiFrameDecoder:
+    """
+    Incremental SIYI decoder for datagrams and byte streams.
+
+    Scans for the 0x55 0x66 STX, validates length and CRC16, resynchronizes
+    one byte past any bad frame and dispatches good frames on their command ID
+    through a handler table. Works on UDP datagrams (feed_datagram) as well as
+    TCP/serial links or recorded captures (feed), where frames may be split
+    across or packed into reads arbitrarily.
+    """
+
+    def __init__(self, handlers: Optional[Dict[int, FrameHandler]] = None,
+                 max_payload: int = MAX_PAYLOAD):
+        self.handlers: Dict[int, FrameHandler] = dict(handlers or {})
+        self.max_payload = max_payload
+        # Optional listener called with every valid frame after its handler
+        self.on_frame: Optional[FrameHandler] = None
+        self._buf = bytearray()
+
+        # Counters
+        self.frames = 0           # valid frames decoded
+        self.crc_errors = 0       # frames with a CRC mismatch
+        self.malformed = 0        # headers with an impossible length
+        self.truncated = 0        # datagrams ending inside a frame
+        self.dropped_bytes = 0    # bytes skipped while resynchronizing
+        self.unhandled = 0        # valid frames with no handler
+        self.handler_errors = 0   # handlers that raised
+
+    def register(self, cmd: int, handler: FrameHandler):
+        """Set the handler for a command ID"""
+        self.handlers[cmd] = handler
+
+    def feed(self, data: bytes) -> int:
+        """Decode a chunk of a byte stream; partial frames wait for more data.
+
+        Returns the number of valid frames decoded.
+        """
+        self._buf += data
+        return self._decode()
+
+    def feed_datagram(self, data: bytes) -> int:
+        """Decode one datagram; a partial frame at its end is dropped."""
+        decoded = self.feed(data)
+        if self._buf:
+            self.truncated += 1
+            self.dropped_bytes += len(self._buf)
+            self._buf.clear()
+        return decoded
+
+    def reset(self):
+        """Discard buffered bytes (e.g. after a reconnect)"""
+        self._buf.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'frames': self.frames,
+            'crc_errors': self.crc_errors,
+            'malformed': self.malformed,
+            'truncated': self.truncated,
+            'dropped_bytes': self.dropped_bytes,
+            'unhandled': self.unhandled,
+            'handler_errors': self.handler_errors,
+        }
+
+    def _decode(self) -> int:
+        buf = self._buf
+        size = len(buf)
+        pos = 0
+        decoded = 0
+        while True:
+            start = buf.find(STX, pos)
+            if start < 0:
+                # Keep a trailing 0x55: it may be the first half of the next STX
+                keep = 1 if size and buf[-1] == STX[0] else 0
+                self.dropped_bytes += size - pos - keep
+                pos = size - keep
+                break
+            self.dropped_bytes += start - pos
+            pos = start
+            if size - start < HEADER_SIZE:
+                break
+
+            _, ctrl, length, seq, cmd = HEADER.unpack_from(buf, start)
+            if length > self.max_payload:
+                self.malformed += 1
+                self.dropped_bytes += 1
+                pos = start + 1
+                continue
+            end = start + HEADER_SIZE + length
+            if size < end + CRC_SIZE:
+                break
+
+            body = bytes(buf[start:end])
+            if crc16_ccitt(body) != CRC.unpack_from(buf, end)[0]:
+                self.crc_errors += 1
+                self.dropped_bytes += 1
+                pos = start + 1
+                continue
+
+            frame = SiyiFrame(ctrl, seq, cmd, body[HEADER_SIZE:])
+            pos = end + CRC_SIZE
+            self.frames += 1
+            decoded += 1
+            self._dispatch(frame)
+
+        if pos:
+            del buf[:pos]
+        return decoded
+
+    def _dispatch(self, frame: SiyiFrame):
+        handler = self.handlers.get(frame.cmd)
+        if handler is None:
+            self.unhandled += 1
+        else:
+            try:
+                handler(frame)
+            except Exception as e:
+                self.handler_errors += 1
+                print(f"[GIMBAL] Handler for cmd 0x{frame.cmd:02X} failed: {e}")
+        if self.on_frame is not None:
+            try:
+                self.on_frame(frame)
+            except Exception as e:
+                self.handler_errors += 1
+                print(f"[GIMBAL] Frame listener failed for cmd 0x{frame.cmd:02X}: {e}")
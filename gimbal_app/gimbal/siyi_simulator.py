@@ -0,0 +1,359 @@
+"""
+Software ZR10 gimbal for offline testing
+
+SiyiSimulator listens on a local UDP port and speaks the SIYI SDK like a
+ZR10 on its upside-down mount (the frame SiyiGimbal decodes): it answers
+config (0x0A), attitude (0x0D), data-stream (0x25), jog (0x07), set-angles
+(0x0E), center (0x08) and zoom (0x05) requests, streams attitude at the
+requested rate, and moves rate- and acceleration-limited motors within the
+ZR10's angle limits. Packet loss, latency and jitter can be applied to each
+direction, with a seedable RNG for repeatable runs.
+
+Run standalone (then point SIYI_IP at 127.0.0.1):
+    python -m gimbal_app.gimbal.siyi_simulator --loss 0.05 --latency-ms 20 --jitter-ms 5
+"""
+
+import argparse
+import heapq
+import random
+import select
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from ..shared import Config
+from .siyi_protocol import (
+    SiyiFrameDecoder, SiyiFrame, encode_frame, JOG_PAYLOAD, ZOOM_PAYLOAD, STREAM_PAYLOAD,
+    ATTITUDE_PAYLOAD, SET_ANGLES_PAYLOAD, STREAM_RATE_CODES, CMD_ZOOM, CMD_GIMBAL_ROTATION,
+    CMD_CENTER, CMD_GIMBAL_CONFIG, CMD_GIMBAL_ATTITUDE, CMD_SET_ANGLES, CMD_DATA_STREAM
+)
+
+STREAM_HZ_BY_CODE = {code: hz for hz, code in STREAM_RATE_CODES.items()}
+
+
+def wrap180(angle: float) -> float:
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+@dataclass
+class MotorModel:
+    """Gimbal motor dynamics and travel limits (degrees, seconds)"""
+    max_rate: float = 60.0           # deg/s at jog speed 100 and absolute slew
+    accel: float = 300.0             # deg/s^2
+    absolute_gain: float = 4.0       # 1/s, internal position loop for 0x0E / center
+    yaw_limits: Optional[Tuple[float, float]] = (-135.0, 135.0)   # raw yaw; None = continuous
+    pitch_limits: Tuple[float, float] = (-90.0, 25.0)             # app pitch (negative = down)
+    attitude_noise_deg: float = 0.0  # 1-sigma noise added to reported angles
+
+
+@dataclass
+class LinkImpairment:
+    """Per-direction loss and delay applied to datagrams"""
+    loss: float = 0.0                # drop probability, each direction
+    latency_s: float = 0.0           # one-way base delay
+    jitter_s: float = 0.0            # 1-sigma extra delay (never negative)
+    reorder: bool = False            # allow jitter to reorder datagrams
+
+
+class SiyiSimulator:
+    """Simulated ZR10 served from one daemon thread"""
+
+    TICK_S = 0.005
+    ZOOM_RATE = 3.0                  # zoom multiples per second
+    MAX_ZOOM = 30.0
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 motors: Optional[MotorModel] = None, link: Optional[LinkImpairment] = None,
+                 stream_hz: int = 0, seed: Optional[int] = None):
+        """
+        Args:
+            host, port: Local UDP address (port 0 = any free port)
+            motors: Motor dynamics and limits
+            link: Loss/latency/jitter applied to both directions
+            stream_hz: Attitude stream rate before any 0x25 request
+            seed: RNG seed for loss, jitter and noise
+        """
+        self.motors = motors or MotorModel()
+        self.link = link or LinkImpairment()
+        self.stream_hz = stream_hz
+        self._rng = random.Random(seed)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        self.port = self.address[1]
+        self.decoder = SiyiFrameDecoder({
+            CMD_GIMBAL_CONFIG: self._on_config,
+            CMD_GIMBAL_ATTITUDE: self._on_attitude_request,
+            CMD_DATA_STREAM: self._on_data_stream,
+            CMD_GIMBAL_ROTATION: self._on_jog,
+            CMD_SET_ANGLES: self._on_set_angles,
+            CMD_CENTER: self._on_center,
+            CMD_ZOOM: self._on_zoom,
+        })
+        self.decoder.on_frame = self._count_command
+        self.peer: Optional[Tuple[str, int]] = None
+
+        # Gimbal state (yaw raw in [-180, 180), pitch as SiyiGimbal reports it)
+        self.lock = threading.Lock()
+        self.yaw = self.pitch = self.roll = 0.0
+        self.yaw_rate = self.pitch_rate = 0.0
+        self.mode = "jog"
+        self.jog_yaw = self.jog_pitch = 0.0
+        self.target_yaw = self.target_pitch = 0.0
+        self.zoom = 1.0
+        self.zoom_dir = 0
+
+        # Delayed datagrams: (due, order, direction, data)
+        self._queue = []
+        self._order = 0
+        self._last_due = {"rx": 0.0, "tx": 0.0}
+
+        # Statistics
+        self.stats = {
+            'rx_datagrams': 0, 'rx_dropped': 0, 'tx_frames': 0, 'tx_dropped': 0,
+            'stream_frames': 0, 'commands': {},
+        }
+
+        self._alive = False
+        self.thread: Optional[threading.Thread] = None
+
+    # ---- control (any thread) ----
+
+    def start(self) -> 'SiyiSimulator':
+        if not self._alive:
+            self._alive = True
+            self.thread = threading.Thread(target=self._run, name="siyi-sim", daemon=True)
+            self.thread.start()
+            print(f"[SIM] ZR10 simulator listening on {self.address[0]}:{self.port}")
+        return self
+
+    def stop(self):
+        self._alive = False
+        if self.thread is not None:
+            self.thread.join(1.0)
+            self.thread = None
+        self.sock.close()
+
+    def place(self, yaw: float, pitch: float):
+        """Teleport the gimbal (raw yaw, app pitch) and stop all motion"""
+        with self.lock:
+            self.yaw, self.pitch = self._clamp(wrap180(yaw), pitch)
+            self.yaw_rate = self.pitch_rate = 0.0
+            self.jog_yaw = self.jog_pitch = 0.0
+            self.target_yaw, self.target_pitch = self.yaw, self.pitch
+            self.mode = "jog"
+
+    def set_impairment(self, **changes):
+        """Change loss/latency_s/jitter_s/reorder while running"""
+        with self.lock:
+            for key, value in changes.items():
+                if not hasattr(self.link, key):
+                    raise AttributeError(f"LinkImpairment has no field '{key}'")
+                setattr(self.link, key, value)
+
+    def state(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'yaw': self.yaw, 'pitch': self.pitch, 'roll': self.roll,
+                'yaw_rate': self.yaw_rate, 'pitch_rate': self.pitch_rate,
+                'mode': self.mode, 'zoom': self.zoom, 'stream_hz': self.stream_hz,
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats, decoder=self.decoder.get_stats())
+            stats['commands'] = {f"0x{cmd:02X}": n for cmd, n in sorted(self.stats['commands'].items())}
+        return stats
+
+    # ---- protocol (runs after the uplink delay, caller holds self.lock) ----
+
+    def _count_command(self, frame: SiyiFrame):
+        commands = self.stats['commands']
+        commands[frame.cmd] = commands.get(frame.cmd, 0) + 1
+
+    def _reply(self, cmd: int, payload: bytes, seq: int = 0):
+        self._enqueue("tx", encode_frame(cmd, payload, seq))
+
+    def _attitude_payload(self) -> bytes:
+        noise = self.motors.attitude_noise_deg
+        yaw, pitch, roll = self.yaw, self.pitch, self.roll
+        if noise:
+            yaw += self._rng.gauss(0.0, noise)
+            pitch += self._rng.gauss(0.0, noise)
+            roll += self._rng.gauss(0.0, noise)
+        return ATTITUDE_PAYLOAD.pack(int(round(wrap180(yaw) * 10)),
+                                     int(round(wrap180(pitch + 180.0) * 10)),
+                                     int(round(roll * 10)),
+                                     int(self.yaw_rate * 10), int(self.pitch_rate * 10), 0)
+
+    def _on_config(self, frame: SiyiFrame):
+        # hdr, record, motion mode 1 (Lock), mount 2 (upside down), video, zoom linkage
+        self._reply(CMD_GIMBAL_CONFIG, bytes([0, 0, 0, 0, 1, 2, 0, 0]), frame.seq)
+
+    def _on_attitude_request(self, frame: SiyiFrame):
+        self._reply(CMD_GIMBAL_ATTITUDE, self._attitude_payload(), frame.seq)
+
+    def _on_data_stream(self, frame: SiyiFrame):
+        data_type, code = STREAM_PAYLOAD.unpack_from(frame.payload)
+        if data_type == 1:
+            self.stream_hz = STREAM_HZ_BY_CODE.get(code, self.stream_hz)
+        self._reply(CMD_DATA_STREAM, bytes([data_type]), frame.seq)
+
+    def _on_jog(self, frame: SiyiFrame):
+        yaw_speed, pitch_speed = JOG_PAYLOAD.unpack_from(frame.payload)
+        self.mode = "jog"
+        # Protocol: negative pitch speed = up on this mount
+        self.jog_yaw = max(-100, min(100, yaw_speed)) / 100.0 * self.motors.max_rate
+        self.jog_pitch = -max(-100, min(100, pitch_speed)) / 100.0 * self.motors.max_rate
+        self._reply(CMD_GIMBAL_ROTATION, bytes([1]), frame.seq)
+
+    def _on_set_angles(self, frame: SiyiFrame):
+        yaw_raw, pitch_raw = SET_ANGLES_PAYLOAD.unpack_from(frame.payload)
+        self.mode = "absolute"
+        self.target_yaw, self.target_pitch = self._clamp(wrap180(yaw_raw / 10.0),
+                                                         wrap180(pitch_raw / 10.0 - 180.0))
+        self._reply(CMD_SET_ANGLES, self._attitude_payload()[:6], frame.seq)
+
+    def _on_center(self, frame: SiyiFrame):
+        self.mode = "absolute"
+        self.target_yaw = self.target_pitch = 0.0
+        self._reply(CMD_CENTER, bytes([1]), frame.seq)
+
+    def _on_zoom(self, frame: SiyiFrame):
+        self.zoom_dir = ZOOM_PAYLOAD.unpack_from(frame.payload)[0]
+        self._reply(CMD_ZOOM, int(round(self.zoom * 10)).to_bytes(2, "little"), frame.seq)
+
+    # ---- simulation ----
+
+    def _clamp(self, yaw: float, pitch: float) -> Tuple[float, float]:
+        if self.motors.yaw_limits is not None:
+            yaw = max(self.motors.yaw_limits[0], min(self.motors.yaw_limits[1], yaw))
+        return yaw, max(self.motors.pitch_limits[0], min(self.motors.pitch_limits[1], pitch))
+
+    def _enqueue(self, direction: str, data: bytes):
+        link = self.link
+        key = "rx_dropped" if direction == "rx" else "tx_dropped"
+        if link.loss and self._rng.random() < link.loss:
+            self.stats[key] += 1
+            return
+        due = time.perf_counter() + link.latency_s
+        if link.jitter_s:
+            due += abs(self._rng.gauss(0.0, link.jitter_s))
+        if not link.reorder:
+            due = max(due, self._last_due[direction])
+            self._last_due[direction] = due
+        self._order += 1
+        heapq.heappush(self._queue, (due, self._order, direction, data))
+
+    def _axis(self, pos: float, rate: float, command_rate: float, dt: float) -> Tuple[float, float]:
+        step = self.motors.accel * dt
+        rate += max(-step, min(step, command_rate - rate))
+        return pos + rate * dt, rate
+
+    def _step(self, dt: float):
+        motors = self.motors
+        if self.mode == "absolute":
+            yaw_error = self.target_yaw - self.yaw
+            if motors.yaw_limits is None:
+                yaw_error = wrap180(yaw_error)
+            cmd_yaw = max(-motors.max_rate, min(motors.max_rate, motors.absolute_gain * yaw_error))
+            cmd_pitch = max(-motors.max_rate, min(motors.max_rate,
+                                                  motors.absolute_gain * (self.target_pitch - self.pitch)))
+        else:
+            cmd_yaw, cmd_pitch = self.jog_yaw, self.jog_pitch
+        yaw, self.yaw_rate = self._axis(self.yaw, self.yaw_rate, cmd_yaw, dt)
+        pitch, self.pitch_rate = self._axis(self.pitch, self.pitch_rate, cmd_pitch, dt)
+        if motors.yaw_limits is None:
+            yaw = wrap180(yaw)
+        clamped_yaw, clamped_pitch = self._clamp(yaw, pitch)
+        # Hard stops kill the motion on that axis
+        if clamped_yaw != yaw:
+            self.yaw_rate = 0.0
+        if clamped_pitch != pitch:
+            self.pitch_rate = 0.0
+        self.yaw, self.pitch = clamped_yaw, clamped_pitch
+        if self.zoom_dir:
+            self.zoom = max(1.0, min(self.MAX_ZOOM, self.zoom + self.zoom_dir * self.ZOOM_RATE * dt))
+
+    def _run(self):
+        last = time.perf_counter()
+        next_stream = last
+        while self._alive:
+            timeout = self.TICK_S
+            if self._queue:
+                timeout = max(0.0, min(timeout, self._queue[0][0] - time.perf_counter()))
+            try:
+                readable, _, _ = select.select([self.sock], [], [], timeout)
+            except (OSError, ValueError):
+                break
+            with self.lock:
+                if readable:
+                    try:
+                        data, addr = self.sock.recvfrom(2048)
+                        self.peer = addr
+                        self.stats['rx_datagrams'] += 1
+                        self._enqueue("rx", data)
+                    except OSError:
+                        pass
+
+                now = time.perf_counter()
+                while self._queue and self._queue[0][0] <= now:
+                    _, _, direction, data = heapq.heappop(self._queue)
+                    if direction == "rx":
+                        self.decoder.feed_datagram(data)
+                    elif self.peer is not None:
+                        try:
+                            self.sock.sendto(data, self.peer)
+                            self.stats['tx_frames'] += 1
+                        except OSError:
+                            pass
+
+                self._step(now - last)
+                last = now
+                if self.stream_hz and now >= next_stream:
+                    # Fixed cadence (no drift from the select tick)
+                    next_stream = max(next_stream + 1.0 / self.stream_hz, now)
+                    if self.peer is not None:
+                        self.stats['stream_frames'] += 1
+                        self._reply(CMD_GIMBAL_ATTITUDE, self._attitude_payload())
+                elif not self.stream_hz:
+                    next_stream = now
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated SIYI ZR10 gimbal (UDP)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=Config.SIYI_PORT, help="UDP port")
+    parser.add_argument("--loss", type=float, default=0.0, help="Drop probability per direction (0-1)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="One-way latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="One-way jitter (1-sigma)")
+    parser.add_argument("--reorder", action="store_true", help="Let jitter reorder datagrams")
+    parser.add_argument("--stream-hz", type=int, default=0, help="Attitude stream rate before any 0x25")
+    parser.add_argument("--noise-deg", type=float, default=0.0, help="Attitude noise (1-sigma)")
+    parser.add_argument("--continuous-yaw", action="store_true", help="No yaw travel limits")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed")
+    args = parser.parse_args()
+
+    motors = MotorModel(attitude_noise_deg=args.noise_deg)
+    if args.continuous_yaw:
+        motors.yaw_limits = None
+    link = LinkImpairment(loss=args.loss, latency_s=args.latency_ms / 1000.0,
+                          jitter_s=args.jitter_ms / 1000.0, reorder=args.reorder)
+    sim = SiyiSimulator(args.host, args.port, motors, link, args.stream_hz, args.seed).start()
+    try:
+        while True:
+            time.sleep(5.0)
+            state, stats = sim.state(), sim.get_stats()
+            print(f"[SIM] Y={state['yaw']:.1f}° P={state['pitch']:.1f}° mode={state['mode']} "
+                  f"stream={state['stream_hz']}Hz | rx={stats['rx_datagrams']} "
+                  f"(dropped {stats['rx_dropped']}) tx={stats['tx_frames']} (dropped {stats['tx_dropped']})")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -234,7 +234,14 @@ class GoogleEarthController:
             'heading': float,
             'speed': float,
             'battery_voltage': float,
-            'flight_mode': str
+            'flight_mode': str,
+            # Optional: pointing target and its 95% error ellipse
+            'target_latitude': float,
+            'target_longitude': float,
+            'target_error_major_m': float,
+            'target_error_minor_m': float,
+            'target_error_orientation_deg': float,
+            'target_cep_m': float
         }
         """
         self._telemetry_source = callback
@@ -273,7 +280,13 @@ class GoogleEarthController:
                 flight_mode=tel_data.get('flight_mode', 'UNKNOWN'),
                 gimbal_yaw=tel_data.get('gimbal_yaw', 0.0),
                 gimbal_pitch=tel_data.get('gimbal_pitch', 0.0),
-                gimbal_roll=tel_data.get('gimbal_roll', 0.0)
+                gimbal_roll=tel_data.get('gimbal_roll', 0.0),
+                target_latitude=tel_data.get('target_latitude'),
+                target_longitude=tel_data.get('target_longitude'),
+                target_error_major_m=tel_data.get('target_error_major_m', 0.0),
+                target_error_minor_m=tel_data.get('target_error_minor_m', 0.0),
+                target_error_orientation_deg=tel_data.get('target_error_orientation_deg', 0.0),
+                target_cep_m=tel_data.get('target_cep_m', 0.0)
             )
             
             # Add to flight path if enabled
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
 
+from ..calc.geodesy import LocalTangentPlane
+
 
 @dataclass
 class TelemetryData:
@@ -27,6 +29,13 @@ class TelemetryData:
     gimbal_yaw: float = 0.0
     gimbal_pitch: float = 0.0
     gimbal_roll: float = 0.0
+    # Pointing target and its 95% horizontal error ellipse
+    target_latitude: Optional[float] = None
+    target_longitude: Optional[float] = None
+    target_error_major_m: float = 0.0
+    target_error_minor_m: float = 0.0
+    target_error_orientation_deg: float = 0.0  # major axis bearing from true north
+    target_cep_m: float = 0.0
 
 
 class TelemetryKMLFeed:
@@ -242,6 +251,10 @@ class TelemetryKMLFeed:
             # Add FPV camera view
             self._add_fpv_camera_view(document, data)
         
+        # Add target error ellipse if an uncertainty estimate is available
+        if data.target_latitude is not None and data.target_error_major_m > 0:
+            self._add_target_error_ellipse(document, data)
+        
         # Write to file
         self._write_kml_file(kml, self.uav_kml_path)
     
@@ -418,6 +431,57 @@ class TelemetryKMLFeed:
         
         coordinates.text = coord_text
     
+    def _add_target_error_ellipse(self, document: Element, data: TelemetryData) -> None:
+        """Add the target's 95% horizontal error ellipse, clamped to the ground."""
+        import math
+        
+        style = SubElement(document, 'Style', id='target_error_style')
+        poly_style = SubElement(style, 'PolyStyle')
+        color = SubElement(poly_style, 'color')
+        color.text = '4400A5FF'  # Semi-transparent orange
+        line_style = SubElement(style, 'LineStyle')
+        line_color = SubElement(line_style, 'color')
+        line_color.text = 'FF00A5FF'
+        width = SubElement(line_style, 'width')
+        width.text = '2'
+        
+        placemark = SubElement(document, 'Placemark')
+        
+        pm_name = SubElement(placemark, 'name')
+        pm_name.text = f"Target CEP {data.target_cep_m:.0f}m"
+        
+        pm_description = SubElement(placemark, 'description')
+        pm_description.text = (f"95% error ellipse\n"
+                               f"Major: {data.target_error_major_m:.1f} m\n"
+                               f"Minor: {data.target_error_minor_m:.1f} m\n"
+                               f"Orientation: {data.target_error_orientation_deg:.0f}°\n"
+                               f"CEP50: {data.target_cep_m:.1f} m")
+        
+        style_url = SubElement(placemark, 'styleUrl')
+        style_url.text = '#target_error_style'
+        
+        polygon = SubElement(placemark, 'Polygon')
+        altitude_mode = SubElement(polygon, 'altitudeMode')
+        altitude_mode.text = 'clampToGround'
+        outer_boundary = SubElement(polygon, 'outerBoundaryIs')
+        linear_ring = SubElement(outer_boundary, 'LinearRing')
+        coordinates = SubElement(linear_ring, 'coordinates')
+        
+        # Ellipse outline in the target's local tangent plane
+        plane = LocalTangentPlane(data.target_latitude, data.target_longitude)
+        orientation = math.radians(data.target_error_orientation_deg)
+        cos_o, sin_o = math.cos(orientation), math.sin(orientation)
+        points = []
+        for i in range(37):
+            angle = 2.0 * math.pi * i / 36
+            along = data.target_error_major_m * math.cos(angle)
+            across = data.target_error_minor_m * math.sin(angle)
+            north = along * cos_o - across * sin_o
+            east = along * sin_o + across * cos_o
+            lat, lon, _ = plane.ned_to_geodetic(north, east, 0.0)
+            points.append(f"{lon},{lat},0")
+        coordinates.text = " ".join(points)
+    
     def _add_fpv_camera_view(self, document: Element, data: TelemetryData) -> None:
         """Add First Person View camera that positions Google Earth viewpoint at airplane looking through gimbal."""
         # Calculate absolute gimbal direction
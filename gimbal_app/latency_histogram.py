@@ -0,0 +1,136 @@
+"""
+HDR-style latency histogram
+
+Values are recorded in integer microseconds into log-linear buckets: exact
+below 2^SUB_BUCKET_BITS us, then 2^(SUB_BUCKET_BITS-1) linear sub-buckets
+per power of two, so every recorded value is kept to within ~1.6% with a
+fixed ~1.4k-entry count array regardless of how many samples are recorded.
+Recording is O(1) and allocation-free; percentiles walk the count array.
+"""
+
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+
+# Longest latency tracked; larger values are clamped (and counted)
+MAX_TRACKABLE_US = 60_000_000
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < _SUB_BUCKET_COUNT:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value_us >> shift)
+
+
+def _bucket_range(index: int) -> Tuple[int, int]:
+    """Lowest and highest microsecond value equivalent to a bucket"""
+    if index < _SUB_BUCKET_COUNT:
+        return index, index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    base = index - (shift << (SUB_BUCKET_BITS - 1))
+    return base << shift, ((base + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Thread-safe log-linear histogram of latencies (seconds in, milliseconds out)"""
+
+    def __init__(self, max_trackable_us: int = MAX_TRACKABLE_US):
+        self.max_trackable_us = max_trackable_us
+        self._counts = array('Q', bytes(8 * (_bucket_index(max_trackable_us) + 1)))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            for i in range(len(self._counts)):
+                self._counts[i] = 0
+            self.count = 0
+            self.clamped = 0
+            self._min_us = None
+            self._max_us = 0
+            self._sum_us = 0
+            self._sum_sq_us = 0
+
+    def record(self, seconds: float):
+        """Record one latency in seconds"""
+        self.record_us(int(seconds * 1e6 + 0.5))
+
+    def record_us(self, value_us: int):
+        if value_us < 0:
+            value_us = 0
+        with self._lock:
+            if value_us > self.max_trackable_us:
+                value_us = self.max_trackable_us
+                self.clamped += 1
+            self._counts[_bucket_index(value_us)] += 1
+            self.count += 1
+            self._sum_us += value_us
+            self._sum_sq_us += value_us * value_us
+            if self._min_us is None or value_us < self._min_us:
+                self._min_us = value_us
+            if value_us > self._max_us:
+                self._max_us = value_us
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's samples (same bucket layout) to this one"""
+        with other._lock:
+            counts = array('Q', other._counts)
+            count, clamped = other.count, other.clamped
+            lo, hi, s, sq = other._min_us, other._max_us, other._sum_us, other._sum_sq_us
+        with self._lock:
+            for i in range(min(len(counts), len(self._counts))):
+                self._counts[i] += counts[i]
+            self.count += count
+            self.clamped += clamped
+            self._sum_us += s
+            self._sum_sq_us += sq
+            if lo is not None and (self._min_us is None or lo < self._min_us):
+                self._min_us = lo
+            self._max_us = max(self._max_us, hi)
+
+    def percentile_ms(self, percentile: float) -> Optional[float]:
+        """Highest equivalent value (ms) at or below which percentile% of samples fall"""
+        with self._lock:
+            return self._percentile_us(percentile) / 1000.0 if self.count else None
+
+    def _percentile_us(self, percentile: float) -> int:
+        # Caller holds self._lock and count > 0
+        target = max(1, math.ceil(self.count * min(max(percentile, 0.0), 100.0) / 100.0))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return min(_bucket_range(index)[1], self._max_us)
+        return self._max_us
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Count, min/mean/max, p50/p90/p99/p99.9 and jitter (std dev), in milliseconds"""
+        with self._lock:
+            if not self.count:
+                return {'count': 0}
+            mean = self._sum_us / self.count
+            variance = max(self._sum_sq_us / self.count - mean * mean, 0.0)
+            return {
+                'count': self.count,
+                'min_ms': self._min_us / 1000.0,
+                'mean_ms': mean / 1000.0,
+                'p50_ms': self._percentile_us(50) / 1000.0,
+                'p90_ms': self._percentile_us(90) / 1000.0,
+                'p99_ms': self._percentile_us(99) / 1000.0,
+                'p999_ms': self._percentile_us(99.9) / 1000.0,
+                'max_ms': self._max_us / 1000.0,
+                'jitter_ms': math.sqrt(variance) / 1000.0,
+                'clamped': self.clamped,
+            }
+
+    def buckets(self) -> List[Tuple[int, int, int]]:
+        """Non-empty buckets as (low_us, high_us, count), for persisting"""
+        with self._lock:
+            return [(*_bucket_range(i), n) for i, n in enumerate(self._counts) if n]
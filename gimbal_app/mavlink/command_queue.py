@@ -0,0 +1,378 @@
+"""
+Outbound MAVLink command queue
+
+COMMAND_LONGs and PARAM_SETs are queued and sent by one worker thread. At
+most one of each command id, and one write per parameter, is in flight at a
+time, because that is all a reply can be matched on: COMMAND_ACK names only
+the command and PARAM_VALUE only the parameter. An unanswered send is
+retried with the confirmation field incremented; MAV_RESULT_IN_PROGRESS
+extends the wait instead. Queued entries with the same coalesce key (every
+reposition, say) are merged so only the latest target is sent, and an
+in-flight one that a newer entry supersedes is not retried.
+
+Every submit returns a concurrent Future that resolves to the MAV_RESULT
+(or the PARAM_VALUE value), or to None on timeout or send failure; merged
+entries share the outcome of the command actually sent. gather() combines
+the Futures of a group of commands, and log_failures() reports whichever
+of them were denied or never acknowledged.
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from pymavlink import mavutil
+
+from ..latency_histogram import LatencyHistogram
+
+DEFAULT_TIMEOUT_S = 1.0      # per attempt
+DEFAULT_RETRIES = 2          # resends (confirmation 1, 2) without a reply
+PARAM_TOLERANCE = 1e-4       # PARAM_VALUE this close to the requested value counts as set
+
+
+def command_name(command: int) -> str:
+    entry = mavutil.mavlink.enums['MAV_CMD'].get(command)
+    return entry.name.replace("MAV_CMD_", "") if entry else str(command)
+
+
+def result_name(result: Optional[int]) -> str:
+    if result is None:
+        return "NO_ACK"
+    entry = mavutil.mavlink.enums['MAV_RESULT'].get(result)
+    return entry.name.replace("MAV_RESULT_", "") if entry else str(result)
+
+
+def gather(futures: Dict[str, concurrent.futures.Future]) -> concurrent.futures.Future:
+    """Future resolving to {name: result} once every one of futures is done"""
+    combined: concurrent.futures.Future = concurrent.futures.Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        combined.set_result({name: None if f.cancelled() or f.exception() else f.result()
+                             for name, f in futures.items()})
+
+    for future in futures.values():
+        future.add_done_callback(on_done)
+    return combined
+
+
+def command_failures(result: Any) -> List[str]:
+    """Outcome of every command in a Future's result that was not accepted.
+
+    result is a MAV_RESULT, a PARAM_VALUE value or a gather() dict of them
+    (entries are then prefixed with the name). None is NO_ACK; parameter
+    values count as set.
+    """
+    results = result if isinstance(result, dict) else {"": result}
+    failed = []
+    for name, value in results.items():
+        if value is None:
+            failed.append(f"{name} NO_ACK".lstrip())
+        elif isinstance(value, int) and value != mavutil.mavlink.MAV_RESULT_ACCEPTED:
+            failed.append(f"{name} {result_name(value)}".lstrip())
+    return failed
+
+
+def log_failures(future: concurrent.futures.Future, action: str,
+                 on_failure: Optional[Callable[[List[str]], None]] = None) -> concurrent.futures.Future:
+    """Print (and pass to on_failure, on the queue thread) the commands behind future that failed"""
+    def done(f: concurrent.futures.Future):
+        failed = command_failures(None if f.cancelled() or f.exception() else f.result())
+        if not failed:
+            return
+        print(f"[MAVLINK] {action} failed: {', '.join(failed)}")
+        if on_failure:
+            on_failure(failed)
+
+    future.add_done_callback(done)
+    return future
+
+
+class PendingCommand:
+    """One queued or in-flight COMMAND_LONG (command set) or PARAM_SET (param_id set)"""
+    __slots__ = ('channel', 'name', 'command', 'param_id', 'params', 'coalesce_key', 'timeout',
+                 'retries_left', 'attempts', 'sent_at', 'deadline', 'futures')
+
+    def __init__(self, name: str, command: Optional[int], param_id: Optional[str],
+                 params: Tuple[float, ...], coalesce_key: Optional[Hashable],
+                 timeout: float, retries: int):
+        self.channel = ('param', param_id) if param_id is not None else ('cmd', command)
+        self.name = name
+        self.command = command
+        self.param_id = param_id
+        self.params = params
+        self.coalesce_key = coalesce_key
+        self.timeout = timeout
+        self.retries_left = retries
+        self.attempts = 0
+        self.sent_at = 0.0
+        self.deadline = 0.0
+        self.futures: List[concurrent.futures.Future] = [concurrent.futures.Future()]
+
+    @property
+    def confirmation(self) -> int:
+        """COMMAND_LONG confirmation field: 0 on the first send, +1 per retry"""
+        return max(self.attempts - 1, 0)
+
+
+class CommandStats:
+    """Per-command counters and acknowledgement latency histogram"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.sent = 0            # commands transmitted (not counting retries)
+        self.retries = 0         # retransmissions
+        self.accepted = 0        # MAV_RESULT_ACCEPTED, or PARAM_VALUE with the requested value
+        self.rejected = 0        # any other final result
+        self.timeouts = 0        # no reply after every retry
+        self.send_failures = 0   # link missing or send raised
+        self.coalesced = 0       # queued commands merged into a newer one
+        self.superseded = 0      # in-flight commands abandoned for a newer one
+        self.ambiguous = 0       # replies to retransmitted commands (no latency sample)
+        self.results: Dict[str, int] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'sent': self.sent,
+            'retries': self.retries,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'send_failures': self.send_failures,
+            'coalesced': self.coalesced,
+            'superseded': self.superseded,
+            'ambiguous': self.ambiguous,
+            'results': dict(self.results),
+            **self.latency.summary(),
+        }
+
+
+class CommandQueue:
+    """Serialises outbound commands per id and matches their replies"""
+
+    def __init__(self, transmit: Callable[[PendingCommand], bool], name: str = "mavlink-tx"):
+        # transmit(entry) sends one attempt on the current link; False if it could not
+        self._transmit = transmit
+        self._queue: Deque[PendingCommand] = collections.deque()
+        self._in_flight: Dict[Tuple[str, Any], PendingCommand] = {}
+        self._cond = threading.Condition()
+        self.stats: Dict[str, CommandStats] = {}
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # ---- submitting (any thread) ----
+
+    def submit_command(self, command: int, params: Sequence[float] = (),
+                       coalesce_key: Optional[Hashable] = None,
+                       timeout: float = DEFAULT_TIMEOUT_S,
+                       retries: int = DEFAULT_RETRIES) -> concurrent.futures.Future:
+        """Queue a COMMAND_LONG (params 1-7, zero-padded); Future -> MAV_RESULT or None"""
+        params = tuple((list(params) + [0.0] * 7)[:7])
+        return self._submit(PendingCommand(command_name(command), command, None, params,
+                                           coalesce_key, timeout, retries))
+
+    def submit_param(self, param_id: str, value: float,
+                     param_type: int = mavutil.mavlink.MAV_PARAM_TYPE_REAL32,
+                     timeout: float = DEFAULT_TIMEOUT_S,
+                     retries: int = DEFAULT_RETRIES) -> concurrent.futures.Future:
+        """Queue a PARAM_SET; Future -> the value the autopilot reports back, or None"""
+        return self._submit(PendingCommand('PARAM_SET', None, param_id, (value, param_type),
+                                           ('param', param_id), timeout, retries))
+
+    def _submit(self, entry: PendingCommand) -> concurrent.futures.Future:
+        future = entry.futures[0]
+        with self._cond:
+            if self._stop:
+                future.set_result(None)
+                return future
+            if entry.coalesce_key is not None:
+                for queued in self._queue:
+                    if queued.coalesce_key == entry.coalesce_key and queued.channel == entry.channel:
+                        # Not sent yet: send the newer arguments in its place
+                        queued.params = entry.params
+                        queued.timeout, queued.retries_left = entry.timeout, entry.retries_left
+                        queued.futures.append(future)
+                        self._stats(queued.name).coalesced += 1
+                        return future
+            self._queue.append(entry)
+            self._cond.notify()
+        return future
+
+    # ---- replies (receive pump) ----
+
+    def on_message(self, msg: Any) -> bool:
+        """Match a COMMAND_ACK or PARAM_VALUE to the in-flight entry; True if it was one"""
+        msg_type = msg.get_type()
+        if msg_type == 'COMMAND_ACK':
+            channel = ('cmd', msg.command)
+        elif msg_type == 'PARAM_VALUE':
+            channel = ('param', msg.param_id)
+        else:
+            return False
+        now = time.perf_counter()
+        with self._cond:
+            entry = self._in_flight.get(channel)
+            if entry is None:
+                return False
+            if msg_type == 'COMMAND_ACK' and msg.result == mavutil.mavlink.MAV_RESULT_IN_PROGRESS:
+                entry.deadline = now + entry.timeout
+                return True
+            del self._in_flight[channel]
+            stats = self._stats(entry.name)
+            if entry.attempts == 1:
+                stats.latency.record(now - entry.sent_at)
+            else:
+                # Karn's rule: the reply may belong to any attempt
+                stats.ambiguous += 1
+            if msg_type == 'COMMAND_ACK':
+                result = msg.result
+                accepted = result == mavutil.mavlink.MAV_RESULT_ACCEPTED
+                label = result_name(result)
+            else:
+                result = msg.param_value
+                accepted = abs(msg.param_value - entry.params[0]) <= PARAM_TOLERANCE * max(1.0, abs(entry.params[0]))
+                label = "SET" if accepted else "UNCHANGED"
+            stats.results[label] = stats.results.get(label, 0) + 1
+            if accepted:
+                stats.accepted += 1
+            else:
+                stats.rejected += 1
+            self._cond.notify()
+        if not accepted:
+            print(f"[MAVLINK] {self._describe(entry)} rejected: {label}")
+        self._resolve(entry, result)
+        return True
+
+    # ---- worker ----
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stop:
+                        return
+                    transmit, finished = self._collect(time.perf_counter())
+                    if transmit or finished:
+                        break
+                    self._cond.wait(self._next_wait(time.perf_counter()))
+            for entry in finished:
+                self._resolve(entry, None)
+            for entry in transmit:
+                self._send(entry)
+
+    def _collect(self, now: float) -> Tuple[List[PendingCommand], List[PendingCommand]]:
+        """Retries, timeouts and newly sendable entries (caller holds the lock)"""
+        transmit, finished = [], []
+        for channel, entry in list(self._in_flight.items()):
+            if entry.deadline > now:
+                continue
+            stats = self._stats(entry.name)
+            newer = next((q for q in self._queue
+                          if entry.coalesce_key is not None and q.coalesce_key == entry.coalesce_key
+                          and q.channel == channel), None)
+            if newer is not None:
+                # Do not keep retrying a target that has already been replaced
+                del self._in_flight[channel]
+                stats.superseded += 1
+                newer.futures.extend(entry.futures)
+            elif entry.retries_left > 0:
+                entry.retries_left -= 1
+                stats.retries += 1
+                self._mark_sent(entry, now)
+                transmit.append(entry)
+            else:
+                del self._in_flight[channel]
+                stats.timeouts += 1
+                print(f"[MAVLINK] {self._describe(entry)} not acknowledged after {entry.attempts} attempts")
+                finished.append(entry)
+        for entry in list(self._queue):
+            if entry.channel in self._in_flight:
+                continue
+            self._queue.remove(entry)
+            self._in_flight[entry.channel] = entry
+            self._stats(entry.name).sent += 1
+            self._mark_sent(entry, now)
+            transmit.append(entry)
+        return transmit, finished
+
+    def _next_wait(self, now: float) -> Optional[float]:
+        if not self._in_flight:
+            return None
+        return max(0.0, min(entry.deadline for entry in self._in_flight.values()) - now)
+
+    @staticmethod
+    def _mark_sent(entry: PendingCommand, now: float):
+        entry.attempts += 1
+        entry.sent_at = now
+        entry.deadline = now + entry.timeout
+
+    def _send(self, entry: PendingCommand):
+        try:
+            sent = self._transmit(entry)
+        except Exception as e:
+            print(f"[MAVLINK] Failed to send {self._describe(entry)}: {e}")
+            sent = False
+        if sent:
+            return
+        with self._cond:
+            if self._in_flight.get(entry.channel) is not entry:
+                return
+            del self._in_flight[entry.channel]
+            self._stats(entry.name).send_failures += 1
+            self._cond.notify()
+        self._resolve(entry, None)
+
+    @staticmethod
+    def _resolve(entry: PendingCommand, result: Any):
+        for future in entry.futures:
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _describe(entry: PendingCommand) -> str:
+        return f"PARAM_SET {entry.param_id}" if entry.param_id is not None else entry.name
+
+    def _stats(self, name: str) -> CommandStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CommandStats()
+        return stats
+
+    # ---- queries / shutdown ----
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth plus counters and latency summary (ms) per command name"""
+        with self._cond:
+            return {
+                'queued': len(self._queue),
+                'in_flight': len(self._in_flight),
+                'commands': {name: stats.summary() for name, stats in sorted(self.stats.items())},
+            }
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters and acknowledgement latency per command name (session log format)"""
+        return self.get_stats()['commands']
+
+    def get_latency_histograms(self) -> Dict[str, List[Tuple[int, int, int]]]:
+        """Non-empty latency buckets (low_us, high_us, count) per command name"""
+        return {name: stats.latency.buckets() for name, stats in sorted(self.stats.items())}
+
+    def close(self):
+        """Stop the worker; every queued and in-flight Future resolves to None"""
+        with self._cond:
+            self._stop = True
+            pending = list(self._queue) + list(self._in_flight.values())
+            self._queue.clear()
+            self._in_flight.clear()
+            self._cond.notify_all()
+        for entry in pending:
+            self._resolve(entry, None)
+        self._thread.join(1.0)
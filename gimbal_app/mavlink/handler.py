@@ -1,24 +1,143 @@
+import concurrent.futures
+from enum import Enum
+
 from ..shared import *
+from .command_queue import CommandQueue, PendingCommand, gather, result_name
+from .message_store import MessageStore, LatestMessage
+from .telemetry_history import TelemetryHistory
+
+
+def _decode_position(msg) -> Dict[str, float]:
+    return {
+        'lat': msg.lat / 1e7,
+        'lon': msg.lon / 1e7,
+        'alt_amsl': msg.alt / 1000.0,
+        'alt_agl': msg.relative_alt / 1000.0,
+    }
+
+
+def _decode_attitude(msg) -> Dict[str, float]:
+    heading = math.degrees(msg.yaw) % 360.0
+    return {
+        'roll': math.degrees(msg.roll),
+        'pitch': math.degrees(msg.pitch),
+        'heading': heading,
+    }
+
+
+TELEMETRY_DECODERS = {
+    'GLOBAL_POSITION_INT': _decode_position,
+    'ATTITUDE': _decode_attitude,
+}
+
+
+class LinkState(Enum):
+    """MAVLink connection state (MAVLinkHandler.state)"""
+    DISCONNECTED = "disconnected"  # no link open: starting, backing off, or given up
+    CONNECTING = "connecting"      # link open, waiting for the first vehicle heartbeat
+    LINKED = "linked"              # vehicle heartbeats arriving
+    STALE = "stale"                # link open, heartbeats lapsed
+
 
 class MAVLinkHandler:
     """MAVLink communication handler with auto-reconnect and dual RX/TX links.
        - RX: listen telemetry (e.g. QGC forwarding 'udpin:127.0.0.1:14540')
        - TX: send commands (e.g. QGC UDP input 'udpout:127.0.0.1:14550')
+       A receive pump thread drains the RX link and keeps the latest message
+       of every type in self.messages; the getters read from it. On every
+       (re)connect the stream profile is requested with SET_MESSAGE_INTERVAL
+       and the achieved rates are measured (get_stream_rates).
+       Connecting never blocks the caller: links are opened (with backoff) on
+       a background worker and the pump drives the LinkState from heartbeats,
+       DISCONNECTED -> CONNECTING -> LINKED <-> STALE; see get_link_status().
+       Commands and parameter writes go through a CommandQueue that matches
+       COMMAND_ACK/PARAM_VALUE replies, retries and coalesces repositions.
     """
     
-    def __init__(self, rx_conn: str = Config.MAVLINK_ADDRESS, tx_conn: Optional[str] = None):
+    RX_POLL_TIMEOUT_S = 0.5   # pump wakes at least this often to check link health
+    CONNECT_TIMEOUT_S = 15.0  # wait this long for the first vehicle heartbeat
+    GCS_HEARTBEAT_S = 1.0     # our heartbeat period while connecting, so QGC sees us
+    STALE_AFTER_S = 3.0       # LINKED -> STALE after this long without a heartbeat
+    
+    # Message-rate negotiation
+    RATE_ACK_TIMEOUT_S = 1.0     # per SET_MESSAGE_INTERVAL attempt
+    RATE_RETRIES = 2             # resends (confirmation 1, 2) without an ACK
+    RATE_SETTLE_S = 1.0          # let new intervals take effect before measuring
+    RATE_VERIFY_WINDOW_S = 3.0
+    RATE_OK_FRACTION = 0.8       # achieved/requested counted as met
+    
+    def __init__(self, rx_conn: str = Config.MAVLINK_ADDRESS, tx_conn: Optional[str] = None,
+                 stream_profile: Optional[Dict[str, float]] = None):
         self.rx_conn_str = rx_conn
         self.tx_conn_str = tx_conn or ""
         self.rx_link = None
         self.tx_link = None
-        self.connected = False
         self.target_sys = 1
         self.target_comp = 1
         self.reconnect_attempts = 0
         self.max_attempts = 20  # Increased from 5 to 20 for better persistence
         self.last_heartbeat = 0
         self.heartbeat_timeout = 10.0  # Seconds without heartbeat before reconnect
-        self._connect()
+        
+        # Connection state machine; links are opened and retried on one background worker
+        self.state = LinkState.DISCONNECTED
+        self.state_since = time.time()
+        self._state_lock = threading.RLock()
+        self._connect_cancel = threading.Event()
+        self._connector = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="mavlink-connect")
+        
+        # Requested telemetry rates and the last negotiation result per message
+        self.stream_profile = dict(Config.MAVLINK_STREAM_PROFILE if stream_profile is None else stream_profile)
+        self.stream_rates: Dict[str, Dict[str, Any]] = {}
+        self._negotiation_generation = 0
+        
+        # Outbound commands; replies are matched by the receive pump
+        self.commands = CommandQueue(self._transmit_command)
+        
+        # Latest decoded message per type, filled by the receive pump
+        self.messages = MessageStore(TELEMETRY_DECODERS)
+        # Full-rate position/attitude/velocity samples for time-aligned queries
+        self.history = TelemetryHistory()
+        self.rx_errors = 0
+        self._stop = False
+        self._rx_thread = threading.Thread(target=self._rx_pump, name="mavlink-rx", daemon=True)
+        self._rx_thread.start()
+        self._request_connect()
+    
+    @property
+    def connected(self) -> bool:
+        """Link open and usable (LINKED, or STALE while waiting for heartbeats to resume)"""
+        return self.state in (LinkState.LINKED, LinkState.STALE)
+    
+    def get_link_status(self) -> Dict[str, Any]:
+        """Connection state snapshot (non-blocking, any thread)"""
+        now = time.time()
+        return {
+            'state': self.state.value,
+            'state_age_s': now - self.state_since,
+            'attempts': self.reconnect_attempts,
+            'max_attempts': self.max_attempts,
+            'heartbeat_age_s': now - self.last_heartbeat if self.last_heartbeat else None,
+            'target': (self.target_sys, self.target_comp),
+            'rx': self.rx_conn_str,
+            'tx': self.tx_conn_str or self.rx_conn_str,
+        }
+    
+    def _transition(self, new_state: LinkState, *from_states: LinkState) -> bool:
+        """Move to new_state (only from from_states, if given); False if not applied"""
+        with self._state_lock:
+            old_state = self.state
+            if old_state is new_state or (from_states and old_state not in from_states):
+                return False
+            self.state = new_state
+            self.state_since = time.time()
+            if new_state is LinkState.LINKED:
+                self.reconnect_attempts = 0
+        print(f"[MAVLINK] Link {old_state.value} -> {new_state.value}")
+        if new_state is LinkState.LINKED:
+            # Fresh link or vehicle back after a gap (possibly rebooted): request rates again
+            self._start_rate_negotiation()
+        return True
     
     def _send_heartbeat(self):
         """Send a few heartbeats so QGC/routers register us as a peer."""
@@ -33,169 +152,340 @@ class MAVLinkHandler:
         except Exception:
             pass
 
-    def _connect(self) -> bool:
+    def _request_connect(self):
+        """Drop any open link and (re)connect on the background worker; returns at once"""
+        with self._state_lock:
+            if self._stop:
+                return
+            self._connect_cancel.set()
+            self._connect_cancel = cancel = threading.Event()
+            self._close_links()
+            self._transition(LinkState.DISCONNECTED)
+            self._connector.submit(self._connect_worker, cancel)
+
+    def _close_links(self):
+        links = {id(l): l for l in (self.rx_link, self.tx_link) if l is not None}
+        self.rx_link = self.tx_link = None
+        for link in links.values():
+            try:
+                link.close()
+            except Exception:
+                pass
+
+    def _open_links(self, cancel: threading.Event) -> bool:
+        """Open the RX/TX links and enter CONNECTING (False if superseded)"""
+        print(f"[MAVLINK] Connecting to RX: {self.rx_conn_str}")
+        rx_link = mavutil.mavlink_connection(self.rx_conn_str, source_system=246, source_component=190)
+        tx_link = rx_link
         try:
-            print(f"[MAVLINK] Connecting to RX: {self.rx_conn_str}")
-            # RX link
-            self.rx_link = mavutil.mavlink_connection(self.rx_conn_str, source_system=246, source_component=190)
-            # TX link (if specified separately)
             if self.tx_conn_str:
                 print(f"[MAVLINK] Connecting to TX: {self.tx_conn_str}")
-                self.tx_link = mavutil.mavlink_connection(self.tx_conn_str, source_system=246, source_component=190)
-            else:
-                self.tx_link = self.rx_link
-
-            # Send a few heartbeats so QGC sees us
-            for _ in range(5):  # Increased from 3 to 5
-                self._send_heartbeat()
-                time.sleep(0.2)  # Increased delay
-
-            # Wait for vehicle heartbeat and capture sysid/compid
-            print("[MAVLINK] Waiting for vehicle heartbeat...")
-            hb = self.rx_link.wait_heartbeat(timeout=15)  # Increased timeout from 10 to 15
-            if hb:
-                try:
-                    self.target_sys = hb.get_srcSystem()
-                    self.target_comp = hb.get_srcComponent()
-                    print(f"[MAVLINK] Found vehicle: sys={self.target_sys}, comp={self.target_comp}")
-                except Exception:
-                    self.target_sys, self.target_comp = 1, 1
-                    print("[MAVLINK] Using default sys=1, comp=1")
-                self.last_heartbeat = time.time()
-            else:
-                print("[MAVLINK] No heartbeat received, continuing anyway")
-                self.last_heartbeat = time.time()
-
-            self.connected = True
-            self.reconnect_attempts = 0
-            print("[MAVLINK] Connection established successfully")
-            return True
-        except Exception as e:
-            print(f"[MAVLINK] Connection failed (attempt {self.reconnect_attempts + 1}/{self.max_attempts}): {e}")
-            self.connected = False
-            self.reconnect_attempts += 1
-            if self.reconnect_attempts < self.max_attempts:
+                tx_link = mavutil.mavlink_connection(self.tx_conn_str, source_system=246, source_component=190)
+        except Exception:
+            rx_link.close()
+            raise
+        with self._state_lock:
+            if cancel.is_set():
+                for link in {id(rx_link): rx_link, id(tx_link): tx_link}.values():
+                    link.close()
+                return False
+            self.rx_link, self.tx_link = rx_link, tx_link
+            self._transition(LinkState.CONNECTING)
+        return True
+
+    def _connect_worker(self, cancel: threading.Event):
+        """Open the links with exponential backoff, then wait for the vehicle (connect worker)"""
+        while not cancel.is_set():
+            try:
+                if not self._open_links(cancel):
+                    return
+                break
+            except Exception as e:
+                print(f"[MAVLINK] Connection failed (attempt {self.reconnect_attempts + 1}/{self.max_attempts}): {e}")
+                self.reconnect_attempts += 1
+                if self.reconnect_attempts >= self.max_attempts:
+                    print(f"[MAVLINK] Max reconnection attempts reached ({self.max_attempts})")
+                    return
                 # Exponential backoff: 2, 4, 8, 16 seconds (max 16)
                 delay = min(2 ** self.reconnect_attempts, 16)
                 print(f"[MAVLINK] Retrying in {delay} seconds...")
-                threading.Timer(delay, self._connect).start()
-            else:
-                print(f"[MAVLINK] Max reconnection attempts reached ({self.max_attempts})")
-            return False
+                cancel.wait(delay)
+        if cancel.is_set():
+            return
+
+        # The receive pump moves CONNECTING -> LINKED on the first vehicle heartbeat;
+        # meanwhile keep announcing ourselves so QGC/routers forward to us
+        print("[MAVLINK] Waiting for vehicle heartbeat...")
+        deadline = time.time() + self.CONNECT_TIMEOUT_S
+        while self.state is LinkState.CONNECTING and time.time() < deadline:
+            self._send_heartbeat()
+            if cancel.wait(self.GCS_HEARTBEAT_S):
+                return
+        with self._state_lock:
+            if cancel.is_set() or self.state is not LinkState.CONNECTING:
+                return
+            # Keep the link open; heartbeat health reconnects if nothing arrives
+            print("[MAVLINK] No heartbeat received, continuing anyway")
+            self.last_heartbeat = time.time()
+            self._transition(LinkState.STALE, LinkState.CONNECTING)
 
     def set_connection_strings(self, rx_conn: str, tx_conn: Optional[str]):
-        """Re-point to new RX/TX strings and reconnect."""
+        """Re-point to new RX/TX strings and reconnect (in the background)."""
         self.rx_conn_str = rx_conn
         self.tx_conn_str = tx_conn or ""
-        # Close and reconnect
-        try:
-            if self.rx_link and hasattr(self.rx_link, 'port') and self.rx_link.port:
-                try: self.rx_link.port.close()
-                except: pass
-        except Exception:
-            pass
-        try:
-            if self.tx_link and self.tx_link is not self.rx_link and hasattr(self.tx_link, 'port') and self.tx_link.port:
-                try: self.tx_link.port.close()
-                except: pass
-        except Exception:
-            pass
-        self.connected = False
         self.reconnect_attempts = 0
-        self._connect()
+        self._request_connect()
     
     def _check_heartbeat_health(self):
-        """Check if we're still receiving heartbeats and reconnect if needed"""
-        if self.connected and time.time() - self.last_heartbeat > self.heartbeat_timeout:
+        """Mark the link STALE when heartbeats lapse, and reconnect if they stay away"""
+        silent = time.time() - self.last_heartbeat
+        if self.state is LinkState.LINKED and silent > self.STALE_AFTER_S:
+            self._transition(LinkState.STALE, LinkState.LINKED)
+        elif self.state is LinkState.STALE and silent > self.heartbeat_timeout:
             print(f"[MAVLINK] No heartbeat for {self.heartbeat_timeout}s, reconnecting...")
-            self.connected = False
             self.reconnect_attempts = 0
-            # Start reconnection in a separate thread
-            threading.Thread(target=self._connect, daemon=True).start()
+            self._request_connect()
+
+    def _on_heartbeat(self, msg, now: float):
+        self.last_heartbeat = now
+        if self.state is LinkState.CONNECTING:
+            try:
+                self.target_sys = msg.get_srcSystem()
+                self.target_comp = msg.get_srcComponent()
+                print(f"[MAVLINK] Found vehicle: sys={self.target_sys}, comp={self.target_comp}")
+            except Exception:
+                self.target_sys, self.target_comp = 1, 1
+                print("[MAVLINK] Using default sys=1, comp=1")
+        self._transition(LinkState.LINKED, LinkState.CONNECTING, LinkState.STALE)
+
+    def _rx_pump(self):
+        """Drain the RX link, decoding each message once into self.messages"""
+        while not self._stop:
+            link = self.rx_link
+            if link is None or self.state is LinkState.DISCONNECTED:
+                time.sleep(0.1)
+                continue
+            try:
+                msg = link.recv_match(blocking=True, timeout=self.RX_POLL_TIMEOUT_S)
+            except Exception as e:
+                # A link replaced by set_connection_strings/a reconnect is expected to fail
+                if link is self.rx_link and not self._stop:
+                    self.rx_errors += 1
+                    print(f"[MAVLINK] Receive error: {e}")
+                    self._request_connect()
+                continue
+            if msg is not None and msg.get_type() != 'BAD_DATA':
+                now = time.time()
+                self.messages.publish(msg, now)
+                self.history.record(msg, now)
+                if msg.get_type() == 'HEARTBEAT':
+                    self._on_heartbeat(msg, now)
+                elif msg.get_type() in ('COMMAND_ACK', 'PARAM_VALUE'):
+                    self.commands.on_message(msg)
+            self._check_heartbeat_health()
+
+    # ---- message-rate negotiation ----
+
+    def set_stream_profile(self, profile: Dict[str, float]):
+        """Replace the requested rates (Hz per message name) and renegotiate now"""
+        self.stream_profile = dict(profile)
+        if self.connected:
+            self._start_rate_negotiation()
+
+    def get_stream_rates(self) -> Dict[str, Dict[str, Any]]:
+        """Last negotiation per message: requested_hz, ack, achieved_hz, ok"""
+        return {name: dict(report) for name, report in self.stream_rates.items()}
+
+    def _start_rate_negotiation(self):
+        if not self.stream_profile:
+            return
+        self._negotiation_generation += 1
+        threading.Thread(target=self._negotiate_rates, args=(self._negotiation_generation,),
+                         name="mavlink-rates", daemon=True).start()
+
+    def _negotiation_current(self, generation: int) -> bool:
+        return generation == self._negotiation_generation and self.connected and not self._stop
+
+    def _negotiate_rates(self, generation: int):
+        """Request every profile rate, then measure what actually arrives"""
+        report: Dict[str, Dict[str, Any]] = {}
+        futures = {}
+        for name, hz in self.stream_profile.items():
+            if not hz:
+                continue
+            msg_id = getattr(mavutil.mavlink, f"MAVLINK_MSG_ID_{name}", None)
+            if msg_id is None:
+                print(f"[MAVLINK] Unknown message in stream profile: {name}")
+                continue
+            interval_us = int(1e6 / hz) if hz > 0 else -1   # negative rate = disable
+            # One SET_MESSAGE_INTERVAL in flight at a time; the queue sends them in turn
+            futures[name] = self.commands.submit_command(
+                mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL, (msg_id, interval_us),
+                coalesce_key=('interval', msg_id),
+                timeout=self.RATE_ACK_TIMEOUT_S, retries=self.RATE_RETRIES)
+            report[name] = {'requested_hz': hz}
+        # They share one command channel, so the worst case is every attempt of every one in turn
+        deadline = self.RATE_ACK_TIMEOUT_S * (self.RATE_RETRIES + 1) * len(futures) + 1.0
+        concurrent.futures.wait(list(futures.values()), timeout=deadline)
+        for name, future in futures.items():
+            # Unfinished or cancelled (queue closed) counts as unacknowledged
+            done = future.done() and not future.cancelled() and future.exception() is None
+            report[name]['ack'] = result_name(future.result() if done else None)
+
+        # Verify
+        time.sleep(self.RATE_SETTLE_S)
+        if not self._negotiation_current(generation):
+            return
+        achieved = self._measure_rates(list(report), self.RATE_VERIFY_WINDOW_S, generation)
+        if achieved is None:
+            return
+        for name, entry in report.items():
+            entry['achieved_hz'] = achieved[name]
+            entry['ok'] = (achieved[name] >= entry['requested_hz'] * self.RATE_OK_FRACTION
+                           if entry['requested_hz'] > 0 else achieved[name] == 0)
+        self.stream_rates = report
+        summary = ", ".join(f"{name} {e['achieved_hz']:.0f}/{e['requested_hz']:g} Hz ({e['ack']})"
+                            for name, e in report.items())
+        missed = [name for name, e in report.items() if not e['ok']]
+        print(f"[MAVLINK] Stream rates: {summary}")
+        if missed:
+            print(f"[MAVLINK] Requested rate not reached for: {', '.join(missed)}")
+
+    def _measure_rates(self, names: List[str], window_s: float,
+                       generation: int) -> Optional[Dict[str, float]]:
+        """Messages per second of each type over the next window_s (None if superseded)"""
+        def counts():
+            return {name: (entry.count if entry else 0)
+                    for name, entry in ((n, self.messages.get(n)) for n in names)}
+        start, t0 = counts(), time.time()
+        deadline = t0 + window_s
+        while time.time() < deadline:
+            if not self._negotiation_current(generation):
+                return None
+            time.sleep(min(0.2, max(0.0, deadline - time.time())))
+        end, elapsed = counts(), time.time() - t0
+        return {name: (end[name] - start[name]) / elapsed for name in names}
+
+    # ---- commands ----
+
+    def _transmit_command(self, entry: PendingCommand) -> bool:
+        """Send one attempt of a queued command on the current TX link (command queue worker)"""
+        link = self.tx_link
+        if link is None or not self.connected:
+            return False
+        if entry.param_id is not None:
+            value, param_type = entry.params
+            link.mav.param_set_send(self.target_sys, self.target_comp, entry.param_id.encode('utf-8'),
+                                    value, param_type)
+        else:
+            link.mav.command_long_send(self.target_sys, self.target_comp, entry.command,
+                                       entry.confirmation, *entry.params)
+        return True
+
+    def get_command_stats(self) -> Dict[str, Any]:
+        """Queue depth and per-command sent/retries/accepted/rejected/timeouts and ACK latency"""
+        return self.commands.get_stats()
+
+    def close(self):
+        """Stop the connect worker and receive pump and close the links"""
+        with self._state_lock:
+            self._stop = True
+            self._connect_cancel.set()
+            self._close_links()
+            self._transition(LinkState.DISCONNECTED)
+        self._connector.shutdown(wait=False)
+        self.commands.close()
+        self._rx_thread.join(self.RX_POLL_TIMEOUT_S + 0.5)
+
+    def get_message(self, msg_type: str, max_age_s: Optional[float] = None) -> Optional[LatestMessage]:
+        """Latest message of msg_type with its receive time and count (O(1), any thread)"""
+        return self.messages.get(msg_type, max_age_s)
+
+    def get_rx_stats(self) -> Dict[str, Any]:
+        """Per-type message counts/rates and pump totals"""
+        return {
+            'total': self.messages.total,
+            'errors': self.rx_errors,
+            'types': self.messages.get_stats(),
+        }
 
     def get_position(self) -> Optional[Dict[str, float]]:
-        if not self.connected or not self.rx_link:
+        """Latest GLOBAL_POSITION_INT (lat/lon/alt_amsl/alt_agl, NED velocity) with its 'timestamp'"""
+        if not self.connected:
             return None
-        try:
-            # Check for heartbeat to update connection health
-            hb_msg = self.rx_link.recv_match(type='HEARTBEAT', blocking=False)
-            if hb_msg:
-                self.last_heartbeat = time.time()
-            
-            # Check heartbeat health
-            self._check_heartbeat_health()
-            
-            msg = self.rx_link.recv_match(type='GLOBAL_POSITION_INT', blocking=False)
-            if msg:
-                return {
-                    'lat': msg.lat / 1e7,
-                    'lon': msg.lon / 1e7,
-                    'alt_amsl': msg.alt / 1000.0,
-                    'alt_agl': msg.relative_alt / 1000.0
-                }
-        except Exception:
-            self.connected = False
-            self._connect()
-        return None
+        # Sample time from the history (autopilot clock mapped to time.time()),
+        # for time-aligning gimbal and attitude samples
+        latest = self.history.latest('GLOBAL_POSITION_INT')
+        if latest is not None:
+            timestamp, position = latest
+            return dict(position, timestamp=timestamp)
+        entry = self.messages.get('GLOBAL_POSITION_INT')
+        if entry is None or entry.value is None:
+            return None
+        return dict(entry.value, timestamp=entry.timestamp)
     
     def get_attitude(self) -> Optional[float]:
-        if not self.connected or not self.rx_link:
+        """Latest heading (deg, 0-360) from ATTITUDE"""
+        if not self.connected:
             return None
-        try:
-            msg = self.rx_link.recv_match(type='ATTITUDE', blocking=False)
-            if msg:
-                hdg = math.degrees(msg.yaw)
-                return hdg if hdg >= 0 else hdg + 360
-        except Exception:
-            self.connected = False
-            self._connect()
-        return None
+        attitude = self.messages.value('ATTITUDE')
+        return attitude['heading'] if attitude else None
+    
+    def get_full_attitude(self) -> Optional[Dict[str, float]]:
+        """Latest roll, pitch and heading (deg) from ATTITUDE"""
+        if not self.connected:
+            return None
+        return self.messages.value('ATTITUDE')
     
-    def set_loiter_mode(self, lat: float, lon: float, alt: float, radius: float) -> bool:
+    def get_attitude_at(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
+        """(roll, pitch, heading) in degrees interpolated at a time.time() timestamp"""
+        return self.history.attitude_at(timestamp)
+    
+    def get_position_at(self, timestamp: float) -> Optional[Dict[str, float]]:
+        """Position and NED velocity interpolated at a time.time() timestamp"""
+        return self.history.position_at(timestamp)
+    
+    # Commands are queued, not sent: these return None if not connected, else a
+    # Future for the outcome (see command_queue.log_failures to report failures)
+    
+    def set_loiter_mode(self, lat: float, lon: float, alt: float,
+                        radius: float) -> Optional[concurrent.futures.Future]:
+        """Queue PX4 Auto-Loiter, the loiter radius and a reposition.
+        
+        The Future resolves, once all three are answered, to {'DO_SET_MODE':
+        MAV_RESULT, 'NAV_LOITER_RAD': reported value, 'DO_REPOSITION':
+        MAV_RESULT}, with None for any that went unacknowledged.
+        """
         if not self.connected or not self.tx_link:
-            return False
-        try:
+            return None
+        return gather({
             # PX4 Auto-Loiter
-            self.tx_link.mav.command_long_send(
-                self.target_sys, self.target_comp, mavutil.mavlink.MAV_CMD_DO_SET_MODE, 0,
-                mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,
-                4, 3, 0, 0, 0, 0
-            )
+            'DO_SET_MODE': self.commands.submit_command(
+                mavutil.mavlink.MAV_CMD_DO_SET_MODE,
+                (mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED, 4, 3),
+                coalesce_key='mode'),
             # Loiter radius param
-            self.tx_link.mav.param_set_send(
-                self.target_sys, self.target_comp, "NAV_LOITER_RAD".encode('utf-8'), radius,
-                mavutil.mavlink.MAV_PARAM_TYPE_REAL32
-            )
-            # Reposition
-            self.tx_link.mav.command_long_send(
-                self.target_sys, self.target_comp, mavutil.mavlink.MAV_CMD_DO_REPOSITION, 0,
-                -1, 0, 0, 0, lat, lon, alt
-            )
-            return True
-        except Exception:
-            return False
+            'NAV_LOITER_RAD': self.commands.submit_param("NAV_LOITER_RAD", radius),
+            'DO_REPOSITION': self.reposition(lat, lon, alt),
+        })
     
-    def reposition(self, lat: float, lon: float, alt: float) -> bool:
+    def reposition(self, lat: float, lon: float, alt: float) -> Optional[concurrent.futures.Future]:
+        """Queue a reposition; a newer one replaces it if it has not been sent yet.
+        
+        The Future resolves to the MAV_RESULT of the reposition actually sent
+        (None if unacknowledged).
+        """
         if not self.connected or not self.tx_link:
-            return False
-        try:
-            self.tx_link.mav.command_long_send(
-                self.target_sys, self.target_comp, mavutil.mavlink.MAV_CMD_DO_REPOSITION, 0,
-                -1, 0, 0, 0, lat, lon, alt
-            )
-            return True
-        except Exception:
-            return False
+            return None
+        return self.commands.submit_command(
+            mavutil.mavlink.MAV_CMD_DO_REPOSITION, (-1, 0, 0, 0, lat, lon, alt),
+            coalesce_key='reposition')
     
-    def set_mission_mode(self) -> bool:
+    def set_mission_mode(self) -> Optional[concurrent.futures.Future]:
+        """Queue PX4 Auto-Mission; the Future resolves to its MAV_RESULT (None if unacknowledged)"""
         if not self.connected or not self.tx_link:
-            return False
-        try:
-            self.tx_link.mav.command_long_send(
-                self.target_sys, self.target_comp, mavutil.mavlink.MAV_CMD_DO_SET_MODE, 0,
-                mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,
-                4, 4, 0, 0, 0, 0
-            )
-            return True
-        except Exception:
-            return False
+            return None
+        return self.commands.submit_command(
+            mavutil.mavlink.MAV_CMD_DO_SET_MODE,
+            (mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED, 4, 4),
+            coalesce_key='mode')
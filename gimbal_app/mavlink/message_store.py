@@ -0,0 +1,89 @@
+"""
+Latest-value store for received MAVLink messages
+
+The receive pump publishes every message once; the store keeps the newest
+message of each type with its receive time, a running count and an optional
+decoded value (converted once, at publish time, by a per-type decoder).
+There is a single writer and entries are immutable tuples swapped in with
+one dict assignment, so readers on any thread get a consistent entry in
+O(1) without taking a lock.
+"""
+
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+Decoder = Callable[[Any], Any]
+
+
+class LatestMessage(NamedTuple):
+    """Newest message of one type"""
+    msg: Any                 # pymavlink message object
+    timestamp: float         # time.time() at receipt
+    count: int               # messages of this type received so far
+    first_timestamp: float   # receipt time of the first one
+    value: Any = None        # decoder output, if the type has a decoder
+
+
+class MessageStore:
+    """Single-writer, lock-free-read map of message type -> LatestMessage"""
+
+    def __init__(self, decoders: Optional[Dict[str, Decoder]] = None):
+        self.decoders: Dict[str, Decoder] = dict(decoders or {})
+        self._latest: Dict[str, LatestMessage] = {}
+        self.total = 0
+        self.decode_errors = 0
+
+    def publish(self, msg: Any, timestamp: Optional[float] = None) -> LatestMessage:
+        """Record msg as the newest of its type (pump thread only)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        msg_type = msg.get_type()
+        value = None
+        decoder = self.decoders.get(msg_type)
+        if decoder is not None:
+            try:
+                value = decoder(msg)
+            except Exception:
+                self.decode_errors += 1
+        previous = self._latest.get(msg_type)
+        if previous is None:
+            entry = LatestMessage(msg, timestamp, 1, timestamp, value)
+        else:
+            entry = LatestMessage(msg, timestamp, previous.count + 1, previous.first_timestamp, value)
+        self._latest[msg_type] = entry
+        self.total += 1
+        return entry
+
+    def get(self, msg_type: str, max_age_s: Optional[float] = None) -> Optional[LatestMessage]:
+        """Newest entry of msg_type, or None if never seen (or older than max_age_s)"""
+        entry = self._latest.get(msg_type)
+        if entry is None:
+            return None
+        if max_age_s is not None and time.time() - entry.timestamp > max_age_s:
+            return None
+        return entry
+
+    def value(self, msg_type: str, max_age_s: Optional[float] = None) -> Any:
+        """Decoded value of the newest msg_type message, or None"""
+        entry = self.get(msg_type, max_age_s)
+        return entry.value if entry is not None else None
+
+    def age(self, msg_type: str) -> Optional[float]:
+        """Seconds since the newest msg_type message arrived"""
+        entry = self._latest.get(msg_type)
+        return time.time() - entry.timestamp if entry is not None else None
+
+    def clear(self):
+        self._latest = {}
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-type count, mean rate and age of the newest message"""
+        now = time.time()
+        stats = {}
+        for msg_type, entry in list(self._latest.items()):
+            span = entry.timestamp - entry.first_timestamp
+            stats[msg_type] = {
+                'count': entry.count,
+                'rate_hz': (entry.count - 1) / span if span > 0 else 0.0,
+                'age_s': now - entry.timestamp,
+            }
+        return stats
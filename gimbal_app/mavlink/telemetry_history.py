@@ -0,0 +1,155 @@
+"""
+Full-rate MAVLink telemetry history
+
+Every GLOBAL_POSITION_INT, ATTITUDE, LOCAL_POSITION_NED and GPS_RAW_INT the
+receive pump decodes is appended to a per-signal TimestampedRingBuffer, so
+position, attitude and velocity can be interpolated at any recent instant
+(e.g. the time a gimbal attitude sample was taken) instead of read as
+"whatever arrived last".
+
+Samples are stamped on the host clock from the autopilot's own message time:
+host_time = source_time + offset, where offset tracks the smallest observed
+(receive time - source time), i.e. the least-delayed packet. That removes
+link and scheduling jitter from the timestamps while staying comparable to
+the time.time() stamps used elsewhere (gimbal attitude history, message store).
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from ..ring_buffer import TimestampedRingBuffer
+
+HISTORY_SIZE = 2048                # ~10 s of ATTITUDE at 200 Hz
+MAX_EXTRAPOLATION_S = 0.5          # hold the newest sample this long
+
+
+class SourceClock:
+    """Maps one message stream's source timestamps onto the host clock"""
+
+    # Let the offset rise this fast (s/s) to follow a slow autopilot clock;
+    # a fast one, or a shorter delay, lowers it immediately
+    DRIFT_ALLOWANCE = 1e-3
+    # A jump back this large means the autopilot rebooted (or the clock was reset)
+    RESET_BACKWARD_S = 1.0
+
+    def __init__(self):
+        self.offset: Optional[float] = None
+        self._last_source: Optional[float] = None
+        self._last_rx = 0.0
+
+    def to_host(self, source_time: float, rx_time: float) -> float:
+        if (self._last_source is not None and
+                source_time < self._last_source - self.RESET_BACKWARD_S):
+            self.offset = None
+        candidate = rx_time - source_time
+        if self.offset is None:
+            self.offset = candidate
+        else:
+            allowed = self.offset + self.DRIFT_ALLOWANCE * max(0.0, rx_time - self._last_rx)
+            self.offset = min(candidate, allowed)
+        self._last_source, self._last_rx = source_time, rx_time
+        return source_time + self.offset
+
+    def reset(self):
+        self.offset = self._last_source = None
+
+
+class _Signal:
+    __slots__ = ('buffer', 'extract', 'source_time', 'clock')
+
+    def __init__(self, fields: Sequence[str], extract: Callable[[Any], Tuple[float, ...]],
+                 source_time: Callable[[Any], float], angle_fields=(), signed_angle_fields=()):
+        self.buffer = TimestampedRingBuffer(HISTORY_SIZE, fields, angle_fields, signed_angle_fields,
+                                            MAX_EXTRAPOLATION_S)
+        self.extract = extract
+        self.source_time = source_time
+        self.clock = SourceClock()
+
+
+def _boot_ms(msg) -> float:
+    return msg.time_boot_ms / 1000.0
+
+
+class TelemetryHistory:
+    """Ring buffers of timestamped autopilot telemetry, one per message type"""
+
+    def __init__(self):
+        self.signals: Dict[str, _Signal] = {
+            'GLOBAL_POSITION_INT': _Signal(
+                ('lat', 'lon', 'alt_amsl', 'alt_agl', 'vn', 've', 'vd'),
+                lambda m: (m.lat / 1e7, m.lon / 1e7, m.alt / 1000.0, m.relative_alt / 1000.0,
+                           m.vx / 100.0, m.vy / 100.0, m.vz / 100.0),
+                _boot_ms),
+            'ATTITUDE': _Signal(
+                ('roll', 'pitch', 'heading', 'roll_rate', 'pitch_rate', 'yaw_rate'),
+                lambda m: (math.degrees(m.roll), math.degrees(m.pitch), math.degrees(m.yaw),
+                           math.degrees(m.rollspeed), math.degrees(m.pitchspeed), math.degrees(m.yawspeed)),
+                _boot_ms, angle_fields=('heading',), signed_angle_fields=('roll', 'pitch')),
+            'LOCAL_POSITION_NED': _Signal(
+                ('x', 'y', 'z', 'vx', 'vy', 'vz'),
+                lambda m: (m.x, m.y, m.z, m.vx, m.vy, m.vz),
+                _boot_ms),
+            'GPS_RAW_INT': _Signal(
+                ('lat', 'lon', 'alt', 'eph', 'epv', 'ground_speed', 'cog', 'fix_type', 'satellites'),
+                lambda m: (m.lat / 1e7, m.lon / 1e7, m.alt / 1000.0, m.eph / 100.0, m.epv / 100.0,
+                           m.vel / 100.0, m.cog / 100.0, m.fix_type, m.satellites_visible),
+                lambda m: m.time_usec / 1e6, angle_fields=('cog',)),
+        }
+        self.records = 0
+        self.errors = 0
+
+    def record(self, msg: Any, rx_time: Optional[float] = None) -> bool:
+        """Append msg if it is a tracked type (receive pump thread)"""
+        signal = self.signals.get(msg.get_type())
+        if signal is None:
+            return False
+        rx_time = time.time() if rx_time is None else rx_time
+        try:
+            values = signal.extract(msg)
+            source_time = signal.source_time(msg)
+        except Exception:
+            self.errors += 1
+            return False
+        # Autopilots without a clock for this message send 0: fall back to arrival
+        timestamp = signal.clock.to_host(source_time, rx_time) if source_time > 0 else rx_time
+        signal.buffer.append(timestamp, *values)
+        self.records += 1
+        return True
+
+    def clear(self):
+        """Drop all samples and clock offsets (e.g. after reconnecting)"""
+        for signal in self.signals.values():
+            signal.buffer.clear()
+            signal.clock.reset()
+
+    def value_at(self, msg_type: str, timestamp: float) -> Optional[Dict[str, float]]:
+        """Fields of msg_type interpolated at timestamp (time.time() clock), or None"""
+        signal = self.signals.get(msg_type)
+        return signal.buffer.value_at(timestamp) if signal is not None else None
+
+    def latest(self, msg_type: str) -> Optional[Tuple[float, Dict[str, float]]]:
+        """(timestamp, fields) of the newest msg_type sample"""
+        signal = self.signals.get(msg_type)
+        return signal.buffer.latest() if signal is not None else None
+
+    def attitude_at(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
+        """(roll, pitch, heading) in degrees at timestamp"""
+        values = self.signals['ATTITUDE'].buffer.values_at(timestamp)
+        return values[:3] if values is not None else None
+
+    def position_at(self, timestamp: float) -> Optional[Dict[str, float]]:
+        """lat/lon/alt_amsl/alt_agl and NED velocity (m/s) at timestamp"""
+        return self.signals['GLOBAL_POSITION_INT'].buffer.value_at(timestamp)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Samples held, time span and clock offset per signal"""
+        stats = {}
+        for msg_type, signal in self.signals.items():
+            span = signal.buffer.time_span()
+            stats[msg_type] = {
+                'samples': len(signal.buffer),
+                'span_s': span[1] - span[0] if span else 0.0,
+                'clock_offset_s': signal.clock.offset,
+            }
+        return stats
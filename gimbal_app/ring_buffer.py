@@ -0,0 +1,139 @@
+"""
+Fixed-size timestamped ring buffer with interpolated lookup
+
+Samples are stored in preallocated numpy arrays (one timestamp column and
+one column per field). Appending overwrites the oldest sample in O(1);
+value_at(t) binary-searches the (at most two) time-sorted runs of the
+ring in O(log n) and linearly interpolates between the bracketing samples.
+Angle fields interpolate along the shortest arc and are returned in
+[0, 360) or, for signed angle fields, [-180, 180).
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class TimestampedRingBuffer:
+    """Thread-safe ring buffer of (timestamp, field values) samples"""
+
+    def __init__(self, capacity: int, fields: Sequence[str],
+                 angle_fields: Iterable[str] = (), signed_angle_fields: Iterable[str] = (),
+                 max_extrapolation_s: float = 0.0):
+        """
+        Args:
+            capacity: Number of samples retained
+            fields: Field names, in the order values are appended
+            angle_fields: Fields in degrees, returned in [0, 360)
+            signed_angle_fields: Fields in degrees, returned in [-180, 180)
+            max_extrapolation_s: How far past the newest sample value_at() may
+                answer (holding the newest value); older than the oldest is never answered
+        """
+        if capacity < 2:
+            raise ValueError("Ring buffer capacity must be at least 2")
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        angle_fields, signed_angle_fields = set(angle_fields), set(signed_angle_fields)
+        self._unsigned_mask = np.array([name in angle_fields for name in self.fields], dtype=bool)
+        self._signed_mask = np.array([name in signed_angle_fields for name in self.fields], dtype=bool)
+        self._angle_mask = self._unsigned_mask | self._signed_mask
+        self.max_extrapolation_s = max_extrapolation_s
+
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros((capacity, len(self.fields)), dtype=np.float64)
+        self._head = 0      # next write slot
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._count = 0
+
+    def append(self, timestamp: float, *values: float):
+        """Add a sample; timestamps must not go backwards (older ones are dropped)"""
+        with self._lock:
+            if self._count and timestamp < self._times[(self._head - 1) % self.capacity]:
+                return
+            self._times[self._head] = timestamp
+            self._values[self._head] = values
+            self._head = (self._head + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    def time_span(self) -> Optional[Tuple[float, float]]:
+        """(oldest, newest) timestamps, or None if empty"""
+        with self._lock:
+            if not self._count:
+                return None
+            return float(self._times[self._slot(0)]), float(self._times[self._slot(self._count - 1)])
+
+    def latest(self) -> Optional[Tuple[float, Dict[str, float]]]:
+        with self._lock:
+            if not self._count:
+                return None
+            slot = self._slot(self._count - 1)
+            return float(self._times[slot]), self._as_dict(self._values[slot])
+
+    def value_at(self, timestamp: float) -> Optional[Dict[str, float]]:
+        """Field values interpolated at timestamp, or None if outside the buffered span"""
+        with self._lock:
+            row = self._interpolate(timestamp)
+        return None if row is None else self._as_dict(row)
+
+    def values_at(self, timestamp: float) -> Optional[Tuple[float, ...]]:
+        """Like value_at but returns a tuple in field order"""
+        with self._lock:
+            row = self._interpolate(timestamp)
+        return None if row is None else tuple(float(v) for v in row)
+
+    # ---- internals (caller holds self._lock) ----
+
+    def _slot(self, logical: int) -> int:
+        return (self._head - self._count + logical) % self.capacity
+
+    def _as_dict(self, row: np.ndarray) -> Dict[str, float]:
+        return {name: float(row[i]) for i, name in enumerate(self.fields)}
+
+    def _interpolate(self, timestamp: float) -> Optional[np.ndarray]:
+        count = self._count
+        if not count:
+            return None
+        times = self._times
+        oldest, newest = times[self._slot(0)], times[self._slot(count - 1)]
+        if timestamp < oldest:
+            return None
+        if timestamp >= newest:
+            if timestamp - newest > self.max_extrapolation_s:
+                return None
+            return self._wrap(self._values[self._slot(count - 1)].copy())
+
+        # The buffer is two sorted runs: [head, capacity) then [0, head) once
+        # it has wrapped. Binary-search the run holding timestamp for the last
+        # sample at or before it.
+        head = self._head
+        if count == self.capacity and head and timestamp >= times[0]:
+            lo = count - head + int(np.searchsorted(times[:head], timestamp, side='right')) - 1
+        elif count == self.capacity:
+            lo = int(np.searchsorted(times[head:], timestamp, side='right')) - 1
+        else:
+            lo = int(np.searchsorted(times[:count], timestamp, side='right')) - 1
+        a, b = self._slot(lo), self._slot(lo + 1)
+        t0, t1 = times[a], times[b]
+        v0, v1 = self._values[a], self._values[b]
+        if t1 <= t0:
+            return self._wrap(v0.copy())
+        frac = (timestamp - t0) / (t1 - t0)
+        delta = v1 - v0
+        # Shortest arc for angles
+        delta[self._angle_mask] = (delta[self._angle_mask] + 180.0) % 360.0 - 180.0
+        return self._wrap(v0 + frac * delta)
+
+    def _wrap(self, row: np.ndarray) -> np.ndarray:
+        row[self._unsigned_mask] %= 360.0
+        row[self._signed_mask] = (row[self._signed_mask] + 180.0) % 360.0 - 180.0
+        return row
@@ -98,12 +98,14 @@ class SessionLogger:
         self.coordinate_log_file = os.path.join(self.session_dir, "coordinate_calculations.csv")
         self.target_selection_log_file = os.path.join(self.session_dir, "target_selections.csv")
         self.session_log_file = os.path.join(self.session_dir, "session_summary.json")
+        self.link_latency_file = os.path.join(self.session_dir, "link_latency.json")
         self.raw_log_file = os.path.join(self.session_dir, "raw_application.log")
         
         # Data storage
         self.gimbal_entries: List[GimbalLogEntry] = []
         self.coordinate_entries: List[CoordinateLogEntry] = []
         self.target_selection_entries: List[TargetSelectionLogEntry] = []
+        self.link_latency: Dict[str, Any] = {}
         
         # Session tracking
         self.session_start = datetime.now()
@@ -289,6 +291,16 @@ class SessionLogger:
             print(f"[TARGET LOG] Target Distance: {target_distance_2d:.1f}m")
             print(f"{'='*80}\n")
     
+    def log_link_latency(self, link: str, summary: Dict[str, Dict[str, Any]],
+                         histograms: Optional[Dict[str, List]] = None):
+        """Record the latest request latency summary (and histogram buckets) for a link"""
+        with self._lock:
+            self.link_latency[link] = {
+                'timestamp': time.time(),
+                'summary': summary,
+                'histograms': histograms or {}
+            }
+    
     def log_raw_message(self, message: str, level: str = "INFO"):
         """Log raw application messages"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -311,6 +323,11 @@ class SessionLogger:
                 metadata_dict['end_time'] = self.metadata.end_time.isoformat()
                 json.dump(metadata_dict, f, indent=2)
             
+            # Save link latency histograms
+            if self.link_latency:
+                with open(self.link_latency_file, 'w') as f:
+                    json.dump(self.link_latency, f, indent=2)
+            
             print(f"[SESSION] Flight session completed: {self.session_id}")
             print(f"[SESSION] Duration: {self.metadata.total_duration_seconds:.1f} seconds")
             print(f"[SESSION] Gimbal commands logged: {self.metadata.total_gimbal_commands}")
@@ -4,11 +4,13 @@
 import math, time, threading, json, os, logging
 from datetime import datetime
 from pymavlink import mavutil
-import socket, struct
-from typing import Optional, Tuple, Dict, Any
+import socket, struct, binascii
+from typing import Optional, Tuple, Dict, Any, List
+from .calc import geodesy
+from .calc.geodesy import LocalTangentPlane
 
 
-EARTH_RADIUS = 6378137.0
+EARTH_RADIUS = geodesy.WGS84_A
 
 class Config:
     """Centralized configuration (runtime-updatable)"""
@@ -16,11 +18,17 @@ class Config:
     SIYI_IP = "192.168.144.25"
     SIYI_PORT = 37260
     SIYI_CAMERA_PORT = 8554
+    # Additional gimbals sharing the primary's socket: [{"name": ..., "ip": ..., "port": ...}]
+    SIYI_EXTRA_GIMBALS = []
     SBS_BIND = "0.0.0.0"
     SBS_PORT = 30003
     # RX=listen telemetry, TX=send commands (kept separate for QGC forwarding scenario)
     MAVLINK_ADDRESS = 'udp:127.0.0.1:14540'   # Backward compatibility (RX)
     MAVLINK_TX_ADDRESS = ''                   # Empty = use RX link. For QGC: 'udpout:127.0.0.1:14550'
+    # Telemetry rates (Hz) requested with SET_MESSAGE_INTERVAL on every connect; 0 = leave as is
+    MAVLINK_STREAM_PROFILE = {
+        "ATTITUDE": 50, "GLOBAL_POSITION_INT": 20, "LOCAL_POSITION_NED": 10, "GPS_RAW_INT": 5
+    }
     
     # Timing
     GUI_UPDATE_MS = 100  # Reduced from 50ms to 100ms for better stability
@@ -37,6 +45,22 @@ class Config:
     CALC_THROTTLE_S = 0.1
     ANGLE_CHANGE_THRESHOLD = 0.5
     
+    # Terrain (SRTM tile cache and prefetch)
+    TERRAIN_CACHE_MB = 256
+    TERRAIN_PREFETCH_LOOKAHEAD_KM = 10.0
+    
+    # Target uncertainty (1-sigma input errors for the CEP ellipse)
+    TARGET_UNCERTAINTY_ENABLED = True
+    TARGET_SIGMA_GPS_M = 2.5
+    TARGET_SIGMA_ALT_M = 3.0
+    TARGET_SIGMA_ATTITUDE_DEG = 0.5
+    TARGET_SIGMA_HEADING_DEG = 2.0
+    TARGET_SIGMA_GIMBAL_DEG = 0.3
+    TARGET_SIGMA_DEM_M = 8.0
+    
+    # Gimbal control: "absolute" (0x0E set-angles, jog fallback) or "jog" (0x07 speeds)
+    GIMBAL_CONTROL_MODE = "absolute"
+    
     # Controller settings
     JOYSTICK_ENABLED = True
     JOYSTICK_YAW_AXIS = 2        # X-axis (left/right)
@@ -48,20 +72,30 @@ class Config:
 class GimbalLogger:
     """Comprehensive gimbal command and state logging system"""
     
-    def __init__(self, log_file="gimbal_log.txt"):
+    def __init__(self, log_file="gimbal_log.txt", name: Optional[str] = None):
+        """
+        Args:
+            log_file: File the entries are appended to
+            name: Gimbal name; named gimbals log through their own child
+                logger ("gimbal.<name>") so several can run side by side
+        """
         self.log_file = log_file
+        self.name = name
         self.logger = self._setup_logger()
         self.session_start = datetime.now()
         self.log_session_start()
     
     def _setup_logger(self):
         """Setup file logger with timestamps"""
-        logger = logging.getLogger('gimbal')
+        logger = logging.getLogger('gimbal' if self.name is None else f'gimbal.{self.name}')
         logger.setLevel(logging.INFO)
+        # A named gimbal writes only to its own file, not its parent's
+        logger.propagate = self.name is None
         
         # Remove existing handlers
         for handler in logger.handlers[:]:
             logger.removeHandler(handler)
+            handler.close()
         
         # File handler
         file_handler = logging.FileHandler(self.log_file, mode='a', encoding='utf-8')
@@ -78,7 +112,8 @@ class GimbalLogger:
     def log_session_start(self):
         """Log session start marker"""
         self.logger.info("="*80)
-        self.logger.info(f"GIMBAL SESSION START - {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}")
+        gimbal = f" | Gimbal: {self.name}" if self.name is not None else ""
+        self.logger.info(f"GIMBAL SESSION START - {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}{gimbal}")
         self.logger.info("="*80)
     
     def log_target_set(self, lat: float, lon: float, alt: float, mode: str):
@@ -127,8 +162,8 @@ class SettingsStore:
     PATH = os.path.join(BASE_DIR, "gimbal_gps_settings_v2.json")
 
     KEYS = [
-        "SIYI_IP","SIYI_PORT","SIYI_CAMERA_PORT","SBS_BIND","SBS_PORT",
-        "MAVLINK_ADDRESS","MAVLINK_TX_ADDRESS",
+        "SIYI_IP","SIYI_PORT","SIYI_CAMERA_PORT","SIYI_EXTRA_GIMBALS","SBS_BIND","SBS_PORT",
+        "MAVLINK_ADDRESS","MAVLINK_TX_ADDRESS","MAVLINK_STREAM_PROFILE","GIMBAL_CONTROL_MODE",
         "JOYSTICK_ENABLED","JOYSTICK_YAW_AXIS","JOYSTICK_PITCH_AXIS",
         "JOYSTICK_ZOOM_AXIS","JOYSTICK_DEAD_ZONE","JOYSTICK_SENSITIVITY"
     ]
@@ -156,32 +191,22 @@ class SettingsStore:
 # ---- Top-level utility functions (verbatim) ----
 
 def crc16_ccitt(data: bytes) -> int:
-    """CRC16 CCITT calculation for SIYI protocol"""
-    crc = 0
-    for b in data:
-        crc ^= (b << 8) & 0xFFFF
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-    return crc
+    """CRC16 CCITT calculation for SIYI protocol (XModem: poly 0x1021, init 0).
+
+    binascii.crc_hqx implements exactly this CRC with a table-driven C loop.
+    """
+    return binascii.crc_hqx(data, 0)
 
 def ned_to_geodetic(lat0_deg: float, lon0_deg: float, dN: float, dE: float) -> Tuple[float, float]:
-    """Convert NED offset to geodetic coordinates"""
-    lat0 = math.radians(lat0_deg)
-    dlat = dN / EARTH_RADIUS
-    dlon = dE / (EARTH_RADIUS * max(1e-9, math.cos(lat0)))
-    return (lat0_deg + math.degrees(dlat), lon0_deg + math.degrees(dlon))
+    """Convert NED offset to geodetic coordinates (WGS84 tangent plane)"""
+    lat, lon, _ = LocalTangentPlane(lat0_deg, lon0_deg).ned_to_geodetic(dN, dE, 0.0)
+    return (lat, lon)
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Distance between two GPS points in meters"""
+    """Geodesic distance between two GPS points in meters (WGS84, Vincenty)"""
     if None in [lat1, lat2, lon1, lon2]:
         return float('inf')
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    return EARTH_RADIUS * 2 * math.asin(math.sqrt(a))
+    return geodesy.vincenty_inverse(float(lat1), float(lon1), float(lat2), float(lon2))[0]
 
 def wrap_360(deg: float) -> float:
     deg = deg % 360.0
@@ -1,6 +1,7 @@
 from ..shared import *
 from ..calc.target_calculator import calculate_distance
 from ..mavlink.handler import MAVLinkHandler
+from ..mavlink.command_queue import log_failures
 
 class DynamicTracker:
     """Dynamic loiter tracking system - works with both gimbal and fixed coordinates"""
@@ -14,6 +15,8 @@ class DynamicTracker:
         self.loiter_radius = Config.DEFAULT_LOITER_RADIUS
         self.start_time = None
         self.update_count = 0
+        self.failed_updates = 0
+        self._resend = False  # last reposition denied/unacknowledged: send again
         self.last_center_lat = None
         self.last_center_lon = None
         self._stop = False
@@ -27,11 +30,15 @@ class DynamicTracker:
         self.loiter_radius = radius
         self.update_interval = update_interval
         self.min_movement = min_movement
-        if not self.mavlink.set_loiter_mode(initial_lat, initial_lon, alt, radius):
+        future = self.mavlink.set_loiter_mode(initial_lat, initial_lon, alt, radius)
+        if future is None:
             return False
+        log_failures(future, "Tracking loiter")
         self.active = True
         self.start_time = time.time()
         self.update_count = 0
+        self.failed_updates = 0
+        self._resend = False
         self.last_center_lat = initial_lat
         self.last_center_lon = initial_lon
         self.last_update = time.time()
@@ -51,7 +58,9 @@ class DynamicTracker:
         if self.active and self.mavlink.connected:
             # Update the MAVLink loiter radius if currently tracking
             if hasattr(self, 'target_lat') and hasattr(self, 'target_lon') and hasattr(self, 'target_alt'):
-                self.mavlink.set_loiter_mode(self.target_lat, self.target_lon, self.target_alt, radius)
+                future = self.mavlink.set_loiter_mode(self.target_lat, self.target_lon, self.target_alt, radius)
+                if future is not None:
+                    log_failures(future, "Loiter radius update")
     
     def _worker_loop(self):
         while not self._stop:
@@ -65,22 +74,31 @@ class DynamicTracker:
                             self.last_center_lat, self.last_center_lon,
                             self.target_lat, self.target_lon
                         )
-                        if distance_moved >= self.min_movement:
-                            if self.mavlink.reposition(self.target_lat, self.target_lon, self.target_alt):
+                        if distance_moved >= self.min_movement or self._resend:
+                            future = self.mavlink.reposition(self.target_lat, self.target_lon, self.target_alt)
+                            if future is not None:
+                                self._resend = False
                                 self.last_center_lat = self.target_lat
                                 self.last_center_lon = self.target_lon
                                 self.update_count += 1
+                                log_failures(future, "Tracking reposition", self._on_reposition_failed)
                     self.last_update = time.time()
                 time.sleep(0.1)
             except Exception:
                 time.sleep(1.0)
     
+    def _on_reposition_failed(self, failed: List[str]):
+        # Runs on the MAVLink command thread; the worker resends on its next update
+        self.failed_updates += 1
+        self._resend = True
+    
     def get_stats(self) -> Dict[str, Any]:
         duration = (time.time() - self.start_time) if self.start_time else 0
         return {
             'active': self.active,
             'duration': duration,
             'updates': self.update_count,
+            'failed_updates': self.failed_updates,
             'rate_per_min': (self.update_count / max(duration, 1)) * 60,
             'next_update': max(0, self.update_interval - (time.time() - self.last_update))
         }
@@ -21,13 +21,18 @@ from PySide6.QtGui import QFont, QPalette, QColor, QIcon, QPixmap, QWheelEvent,
 # Import the existing backend systems
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from gimbal_app.shared import *
-from gimbal_app.gimbal.siyi_gimbal import SiyiGimbal
-from gimbal_app.gimbal.locker import GimbalLocker
+from gimbal_app.gimbal.gimbal_pool import GimbalPool
+from gimbal_app.gimbal.siyi_link import shutdown_gimbal_event_loop
 from gimbal_app.gimbal.camera_stream import SiyiCameraStream
 from gimbal_app.mavlink.handler import MAVLinkHandler
+from gimbal_app.mavlink.command_queue import log_failures
 from gimbal_app.adsb.sbs_publisher import SBSPublisher
 from gimbal_app.tracking.dynamic_tracker import DynamicTracker
-from gimbal_app.calc.target_calculator import TargetCalculator, Position
+from gimbal_app.calc.target_calculator import (
+    TargetCalculator, Position, TargetingSigmas, UncertaintyEstimator, CONFIDENCE_95_SCALE,
+    get_target_calculator, reset_target_calculator
+)
+from gimbal_app.elevation import get_terrain_service, shutdown_terrain_service
 from gimbal_app.google_earth.controller import GoogleEarthController, GoogleEarthConfig
 from gimbal_app.google_earth.waypoint_manager import TrackingMode
 # Avoid circular import - import session logger only when needed
@@ -76,11 +81,30 @@ class ModernGimbalApp(QMainWindow):
     
     def init_backend_systems(self):
         """Initialize all backend systems (same as tkinter version)"""
-        self.gimbal = SiyiGimbal(Config.SIYI_IP, Config.SIYI_PORT)
+        # All gimbals share one socket; the primary drives the UI and controller
+        self.gimbal_pool = GimbalPool()
+        self.gimbal = self.gimbal_pool.add("primary", Config.SIYI_IP, Config.SIYI_PORT,
+                                           logger=GimbalLogger(name="primary"))
+        self.gimbal_pool.add_from_config(Config.SIYI_EXTRA_GIMBALS)
         self.sbs = SBSPublisher(Config.SBS_BIND, Config.SBS_PORT)
         self.mavlink = MAVLinkHandler(Config.MAVLINK_ADDRESS, Config.MAVLINK_TX_ADDRESS or None)
         self.tracker = DynamicTracker(self.mavlink)
-        self.gimbal_locker = GimbalLocker(self.gimbal)
+        self.gimbal_locker = self.gimbal_pool.locker("primary")
+        
+        # Shared terrain service: bounded tile cache, prefetched along the flight path.
+        # Created first so every TargetCalculator in the process reuses it.
+        self.terrain_service = get_terrain_service(
+            cache_budget_bytes=int(Config.TERRAIN_CACHE_MB * 1024 * 1024)
+        )
+        self.terrain_service.start_prefetch(
+            radius_m=Config.MAX_DISTANCE_KM * 1000.0,
+            lookahead_m=Config.TERRAIN_PREFETCH_LOOKAHEAD_KM * 1000.0
+        )
+        self.target_calculator = get_target_calculator()
+        # Live target error ellipse, estimated off the GUI thread (None disables it)
+        self.targeting_sigmas = TargetingSigmas.from_config() if Config.TARGET_UNCERTAINTY_ENABLED else None
+        self.uncertainty_estimator = (UncertaintyEstimator(self.target_calculator, self.targeting_sigmas)
+                                      if self.targeting_sigmas else None)
         
         # Notification system
         # self.notification_manager = NotificationManager()  # TODO: Implement NotificationManager
@@ -122,12 +146,11 @@ class ModernGimbalApp(QMainWindow):
         
         # Current gimbal pointing (real-time, not for navigation)
         self.gimbal_current_pointing = {
-            'lat': None, 'lon': None, 'distance': 0.0
+            'lat': None, 'lon': None, 'distance': 0.0, 'uncertainty': None
         }
         
         # Gimbal tracking state
         self.gimbal_tracking_active = False
-        self.centering_active = False  # Track if centering is in progress
         
         self.fixed_target_state = {
             'lat': None, 'lon': None, 'alt': None
@@ -261,9 +284,16 @@ class ModernGimbalApp(QMainWindow):
         self.lbl_gimbal_details.setObjectName("detailsLabel")
         self.lbl_controller_status = QLabel("Controller: Initializing...")
         self.lbl_controller_status.setObjectName("detailsLabel")
+        self.control_mode_combo = QComboBox()
+        self.control_mode_combo.addItem("Absolute angles (0x0E)", "absolute")
+        self.control_mode_combo.addItem("Speed jog (0x07)", "jog")
+        self.control_mode_combo.setCurrentIndex(max(0, self.control_mode_combo.findData(Config.GIMBAL_CONTROL_MODE)))
+        self.control_mode_combo.currentIndexChanged.connect(
+            lambda _: self.gimbal.set_control_mode(self.control_mode_combo.currentData()))
         
         gimbal_layout.addWidget(gimbal_title)
         gimbal_layout.addWidget(self.chk_gimbal_connect)
+        gimbal_layout.addWidget(self.control_mode_combo)
         gimbal_layout.addWidget(self.lbl_gimbal_status)
         gimbal_layout.addWidget(self.lbl_gimbal_details)
         gimbal_layout.addWidget(self.lbl_controller_status)
@@ -1509,11 +1539,24 @@ class ModernGimbalApp(QMainWindow):
                 aircraft_lon = self.aircraft_state['lon']
                 aircraft_alt_agl = self.aircraft_state.get('alt_agl', 0)
                 
-                gimbal_pitch = self.gimbal.pitch_norm or 0
-                gimbal_yaw = self.gimbal.yaw_abs or 0
+                # Use the gimbal attitude at the time of the aircraft fix, not
+                # whatever arrived last
+                position_time = self.aircraft_state.get('timestamp')
+                attitude = self.gimbal.get_attitude_at(position_time) if position_time else None
+                if attitude is not None:
+                    gimbal_yaw, gimbal_pitch, _ = attitude
+                else:
+                    gimbal_pitch = self.gimbal.pitch_norm or 0
+                    gimbal_yaw = self.gimbal.yaw_abs or 0
                 
-                # Calculate where camera center is pointing
-                aircraft_heading = self.aircraft_state.get('heading', 0)
+                # Aircraft attitude at the same instant (full-rate history)
+                aircraft_attitude = self.mavlink.get_attitude_at(position_time) if position_time else None
+                if aircraft_attitude is not None:
+                    aircraft_roll, aircraft_pitch, aircraft_heading = aircraft_attitude
+                else:
+                    aircraft_roll = self.aircraft_state.get('roll', 0)
+                    aircraft_pitch = self.aircraft_state.get('pitch', 0)
+                    aircraft_heading = self.aircraft_state.get('heading', 0)
                 
                 # Log basic coordinates BEFORE 3D Euler transformations
                 basic_result = TargetCalculator.calculate_target_basic(
@@ -1525,16 +1568,31 @@ class ModernGimbalApp(QMainWindow):
                 )
                 
                 # Calculate with full 3D transformations and terrain correction
-                calculator = TargetCalculator()
+                calculator = self.target_calculator
                 full_3d_result = calculator.calculate_target_3d(
                     aircraft_lat=aircraft_lat,
                     aircraft_lon=aircraft_lon,
                     aircraft_alt_agl=aircraft_alt_agl,
                     pitch_deg=gimbal_pitch,
                     yaw_deg=gimbal_yaw,
+                    aircraft_roll_deg=aircraft_roll,
+                    aircraft_pitch_deg=aircraft_pitch,
                     aircraft_yaw_deg=aircraft_heading
                 )
                 
+                # Error ellipse from the background estimator (refreshed ~1 Hz)
+                uncertainty = None
+                if self.uncertainty_estimator:
+                    if full_3d_result.converged:
+                        self.uncertainty_estimator.update(
+                            aircraft_lat, aircraft_lon, aircraft_alt_agl, gimbal_pitch, gimbal_yaw,
+                            aircraft_roll, aircraft_pitch, aircraft_heading,
+                            nominal=full_3d_result.target_position
+                        )
+                        uncertainty = self.uncertainty_estimator.latest()
+                    else:
+                        self.uncertainty_estimator.clear()
+                
                 # Extract both raw estimate and terrain-corrected final result
                 raw_estimate = full_3d_result.raw_estimate
                 final_target = full_3d_result.target_position or full_3d_result.raw_estimate
@@ -1551,7 +1609,8 @@ class ModernGimbalApp(QMainWindow):
                     'note': f"3D-Corrected ({'Converged' if full_3d_result.converged else 'Raw'})",
                     'iterations': full_3d_result.iterations,
                     'error_m': full_3d_result.final_error,
-                    'processing_time_ms': full_3d_result.processing_time * 1000
+                    'processing_time_ms': full_3d_result.processing_time * 1000,
+                    'uncertainty': uncertainty
                 }
                 
                 # Log comparison between ray intersection methods
@@ -1595,13 +1654,20 @@ class ModernGimbalApp(QMainWindow):
                     self.gimbal_current_pointing['lat'] = target_result['lat']
                     self.gimbal_current_pointing['lon'] = target_result['lon']
                     self.gimbal_current_pointing['distance'] = target_result['distance']
+                    self.gimbal_current_pointing['uncertainty'] = target_result['uncertainty']
                     
                     # Update gimbal panel display if in gimbal mode
                     if (self.target_mode == "gimbal" and 
                         hasattr(self, 'lbl_current_pointing')):
                         lat = target_result['lat']
                         lon = target_result['lon']
-                        self.lbl_current_pointing.setText(f"{lat:.6f}, {lon:.6f}")
+                        uncertainty = target_result['uncertainty']
+                        if uncertainty:
+                            self.lbl_current_pointing.setText(
+                                f"{lat:.6f}, {lon:.6f}  CEP {uncertainty.cep50_m:.0f}m"
+                            )
+                        else:
+                            self.lbl_current_pointing.setText(f"{lat:.6f}, {lon:.6f}")
                         
                         # Update gimbal target for ADSB display when in gimbal mode
                         if self.target_mode == "gimbal":
@@ -1628,6 +1694,8 @@ class ModernGimbalApp(QMainWindow):
                         target_result['lon'],
                         target_result['distance']
                     )
+                    if hasattr(self.camera_stream, 'set_target_uncertainty'):
+                        self.camera_stream.set_target_uncertainty(target_result['uncertainty'])
             else:
                 # Debug why target calculation failed
                 if not self.aircraft_state or self.aircraft_state.get('lat') is None:
@@ -1663,17 +1731,36 @@ class ModernGimbalApp(QMainWindow):
             self.controller_manager.update()
         
         # Update MAVLink status
+        link = self.mavlink.get_link_status()
         if self.mavlink.connected:
-            self.lbl_mavlink_status.setText("CONNECTED")
-            self.lbl_mavlink_status.setStyleSheet("color: #00ff00;")
+            if link['state'] == 'stale':
+                self.lbl_mavlink_status.setText(f"STALE ({link['heartbeat_age_s']:.0f}s)")
+                self.lbl_mavlink_status.setStyleSheet("color: #c0c090;")
+            else:
+                self.lbl_mavlink_status.setText("CONNECTED")
+                self.lbl_mavlink_status.setStyleSheet("color: #00ff00;")
             
             telemetry_text = (f"LAT: {self.aircraft_state['lat']:.6f}, LON: {self.aircraft_state['lon']:.6f}\n"
                             f"ALT: {self.aircraft_state['alt_agl']:.1f}m | HDG: {self.aircraft_state['heading']:.1f}°")
+            rates = self.mavlink.get_stream_rates()
+            if rates:
+                short = {'ATTITUDE': 'ATT', 'GLOBAL_POSITION_INT': 'POS', 'LOCAL_POSITION_NED': 'NED', 'GPS_RAW_INT': 'GPS'}
+                telemetry_text += "\n" + " | ".join(
+                    f"{short.get(name, name)} {r['achieved_hz']:.0f}/{r['requested_hz']:g} Hz{'' if r['ok'] else ' !'}"
+                    for name, r in rates.items())
             self.lbl_telemetry_details.setText(telemetry_text)
         else:
-            self.lbl_mavlink_status.setText("DISCONNECTED")
-            self.lbl_mavlink_status.setStyleSheet("color: #ff0000;")
-            self.lbl_telemetry_details.setText("Auto-reconnecting...")
+            if link['state'] == 'connecting':
+                self.lbl_mavlink_status.setText("CONNECTING")
+                self.lbl_mavlink_status.setStyleSheet("color: #c0c090;")
+                self.lbl_telemetry_details.setText(f"Waiting for vehicle heartbeat on {link['rx']}...")
+            else:
+                self.lbl_mavlink_status.setText("DISCONNECTED")
+                self.lbl_mavlink_status.setStyleSheet("color: #ff0000;")
+                if link['attempts'] >= link['max_attempts']:
+                    self.lbl_telemetry_details.setText("Reconnect attempts exhausted")
+                else:
+                    self.lbl_telemetry_details.setText(f"Auto-reconnecting... (attempt {link['attempts'] + 1})")
         
         # Update gimbal status
         if self.gimbal.is_connected:
@@ -1687,7 +1774,14 @@ class ModernGimbalApp(QMainWindow):
                 self.lbl_gimbal_status.setText(f"CONNECTED (STALE)\nP:{pitch:.1f}° Y:{yaw:.1f}° ({age:.1f}s old)")
                 self.lbl_gimbal_status.setStyleSheet("color: #ffaa00;")
             
-            mount_info = f"Mount: {self.gimbal.mount_dir or '—'} | Mode: {self.gimbal.motion_mode or '—'}"
+            mount_info = (f"Mount: {self.gimbal.mount_dir or '—'} | Mode: {self.gimbal.motion_mode or '—'}"
+                          f" | Ctrl: {self.gimbal.active_control_mode}")
+            rtt = self.gimbal.get_latency_stats().get('0x0A', {})
+            if rtt.get('count'):
+                mount_info += (f"\nRTT p50 {rtt['p50_ms']:.0f} / p99 {rtt['p99_ms']:.0f} ms"
+                               f" | jitter {rtt['jitter_ms']:.0f} ms | lost {rtt['timeouts']}/{rtt['sent']}")
+            stream = self.gimbal.get_stream_stats()
+            mount_info += f"\nStream {stream['rate_hz']} Hz (max {stream['ceiling_hz']}) | loss {stream['loss']:.0%}"
             self.lbl_gimbal_details.setText(mount_info)
         else:
             self.lbl_gimbal_status.setText(f"DISCONNECTED\n{Config.SIYI_IP}:{Config.SIYI_PORT}")
@@ -1719,9 +1813,12 @@ class ModernGimbalApp(QMainWindow):
             position = self.mavlink.get_position()
             if position:
                 self.aircraft_state.update(position)
-            heading = self.mavlink.get_attitude()
-            if heading is not None:
-                self.aircraft_state['heading'] = heading
+            attitude = self.mavlink.get_full_attitude()
+            if attitude is not None:
+                self.aircraft_state.update(attitude)
+            
+            # Keep terrain tiles ahead of the aircraft loaded off the GUI thread
+            self.terrain_service.update_aircraft_state(self.aircraft_state)
                 
             # Update tracker with current target
             if self.tracker.active:
@@ -1744,8 +1841,11 @@ class ModernGimbalApp(QMainWindow):
             if not self.gimbal.start():
                 self.chk_gimbal_connect.setChecked(False)
                 # Could show error dialog here
+            for name, ok in self.gimbal_pool.start_all().items():
+                if not ok:
+                    print(f"[UI] Gimbal '{name}' failed to start")
         else:
-            self.gimbal.stop()
+            self.gimbal_pool.stop_all()
     
     def toggle_sbs(self, checked):
         """Toggle SBS publisher"""
@@ -1830,12 +1930,11 @@ class ModernGimbalApp(QMainWindow):
     
     def check_connections(self):
         """Periodically check and attempt to repair connections"""
-        # Check gimbal connection
-        if not self.gimbal.is_connected:
+        # Check gimbal connection (a silent but open link reconnects itself)
+        if not self.gimbal.link_open:
             print("[CONNECTION] Gimbal disconnected, attempting restart...")
             try:
                 self.gimbal.stop()
-                time.sleep(0.5)
                 self.gimbal.start()
             except Exception as e:
                 print(f"[CONNECTION] Failed to restart gimbal: {e}")
@@ -1988,8 +2087,7 @@ class ModernGimbalApp(QMainWindow):
             return
             
         # Stop centering if manual movement starts
-        if self.centering_active:
-            self.centering_active = False
+        if self.gimbal.cancel_sequence("manual movement"):
             print("[UI] Manual gimbal movement detected - stopping centering")
             
         self.gimbal_movement["active"] = True
@@ -2045,8 +2143,7 @@ class ModernGimbalApp(QMainWindow):
         """Move gimbal with given speeds (legacy method)"""
         if self.gimbal.is_connected:
             # Stop centering if manual movement detected
-            if self.centering_active and (yaw_speed != 0 or pitch_speed != 0):
-                self.centering_active = False
+            if (yaw_speed != 0 or pitch_speed != 0) and self.gimbal.cancel_sequence("manual jog"):
                 print("[UI] Manual gimbal jog detected - stopping centering")
             self.gimbal.jog(yaw_speed, pitch_speed)
             
@@ -2071,60 +2168,9 @@ class ModernGimbalApp(QMainWindow):
         """Center the gimbal with aggressive centering"""
         if self.gimbal.is_connected:
             print("[UI] Starting aggressive gimbal centering...")
-            self.centering_active = True  # Set centering flag
-            
-            # Try multiple centering approaches for better reliability
-            
-            # Method 1: Use built-in center command
-            self.gimbal.center_gimbal()
-            
-            # Method 2: Also try direct center command
-            self.gimbal.center()
-            
-            # Method 3: Manual centering with movement commands
-            # Send gimbal to approximate center position with movement
-            QTimer.singleShot(100, lambda: self._force_center_position())
-    
-    def _force_center_position(self):
-        """Force gimbal to center using movement commands"""
-        if not self.gimbal.is_connected or not self.centering_active:
-            self.centering_active = False  # Clear flag if interrupted
-            return
-            
-        print("[UI] Force centering with movement commands...")
-        
-        # Get current gimbal position
-        current_yaw = self.gimbal.yaw_abs or 0
-        current_pitch = self.gimbal.pitch_norm or 0
-        
-        # Calculate required movement to reach center (0° yaw, 0° pitch)
-        # Use shortest path for yaw (handle 360° wraparound)
-        yaw_error = -current_yaw
-        # Fix wraparound: choose shortest path to 0°
-        if yaw_error > 180:
-            yaw_error -= 360
-        elif yaw_error < -180:
-            yaw_error += 360
-            
-        pitch_error = -current_pitch  # How much we need to move in pitch
-        
-        print(f"[UI] Current: Yaw={current_yaw:.1f}°, Pitch={current_pitch:.1f}°")
-        print(f"[UI] Centering errors: Yaw={yaw_error:.1f}°, Pitch={pitch_error:.1f}°")
-        
-        # Send movement commands to center (use higher speeds for faster centering)
-        center_speed = 50
-        yaw_speed = center_speed if yaw_error > 5 else (-center_speed if yaw_error < -5 else 0)
-        pitch_speed = center_speed if pitch_error > 5 else (-center_speed if pitch_error < -5 else 0)
-        
-        if abs(yaw_error) > 2 or abs(pitch_error) > 2:  # If not close to center
-            self.gimbal.jog(yaw_speed, pitch_speed)
-            # Continue centering in 200ms
-            QTimer.singleShot(200, self._force_center_position)
-        else:
-            # Close enough to center, stop movement
-            self.gimbal.jog(0, 0)
-            self.centering_active = False  # Clear centering flag
-            print("[UI] Gimbal centering completed")
+            # Built-in center commands followed by jogging toward 0°/0°,
+            # run as a cancellable sequence on the gimbal event loop
+            self.gimbal.start_centering()
     
     def request_gimbal_attitude(self):
         """Request gimbal attitude data"""
@@ -2623,9 +2669,10 @@ class ModernGimbalApp(QMainWindow):
         alt = self.aircraft_state.get('alt_amsl', 100.0)
         
         # Send loiter command to current target
-        success = self.mavlink.set_loiter_mode(target_lat, target_lon, alt, radius)
+        future = self.mavlink.set_loiter_mode(target_lat, target_lon, alt, radius)
         
-        if success:
+        if future is not None:
+            log_failures(future, "Single goto")
             print(f"Single goto sent: {target_lat:.6f}, {target_lon:.6f} @ {alt}m (R:{radius}m)")
         else:
             print("Failed to send single goto command")
@@ -2642,11 +2689,9 @@ class ModernGimbalApp(QMainWindow):
         
         # Get real terrain elevation using SRTM data
         try:
-            from ..elevation import OfflineSRTMService
-            srtm_service = OfflineSRTMService()
-            target_alt = srtm_service.get_elevation(target_lat, target_lon)
+            target_alt = self.terrain_service.get_elevation(target_lat, target_lon)
             print(f"[TARGET SELECT] Using SRTM elevation: {target_alt:.1f}m")
-        except ImportError:
+        except Exception:
             target_alt = 0.0  # Fallback to ground level
             print(f"[TARGET SELECT] SRTM not available, using ground level")
         
@@ -2673,14 +2718,16 @@ class ModernGimbalApp(QMainWindow):
                 print(f"[TARGET SELECT] Using default gimbal angles (gimbal not connected)")
             
             # Calculate full 3D target with ray-terrain intersection
-            calculator = TargetCalculator()
+            calculator = self.target_calculator
             full_3d_result = calculator.calculate_target_3d(
                 aircraft_lat=aircraft_lat,
                 aircraft_lon=aircraft_lon,
                 aircraft_alt_agl=aircraft_alt_agl,
                 pitch_deg=gimbal_pitch,
                 yaw_deg=gimbal_yaw,
-                aircraft_heading_deg=aircraft_heading
+                aircraft_roll_deg=self.aircraft_state.get('roll', 0),
+                aircraft_pitch_deg=self.aircraft_state.get('pitch', 0),
+                aircraft_yaw_deg=aircraft_heading
             )
             
             # Extract raw estimate and terrain-corrected final coordinates
@@ -2858,9 +2905,10 @@ class ModernGimbalApp(QMainWindow):
         alt = self.aircraft_state.get('alt_amsl', 100.0)
         
         # Start loitering around target
-        success = self.mavlink.set_loiter_mode(target_lat, target_lon, alt, radius)
+        future = self.mavlink.set_loiter_mode(target_lat, target_lon, alt, radius)
         
-        if success:
+        if future is not None:
+            log_failures(future, "Gimbal tracking loiter")
             self.gimbal_tracking_active = True
             
             # CRITICAL FIX: Start gimbal locking on the target
@@ -2906,11 +2954,9 @@ class ModernGimbalApp(QMainWindow):
         
         # Get real terrain elevation using SRTM data
         try:
-            from ..elevation import OfflineSRTMService
-            srtm_service = OfflineSRTMService()
-            target_alt = srtm_service.get_elevation(target_lat, target_lon)
+            target_alt = self.terrain_service.get_elevation(target_lat, target_lon)
             print(f"[TARGET SELECT] Using SRTM elevation: {target_alt:.1f}m")
-        except ImportError:
+        except Exception:
             target_alt = 0.0  # Fallback to ground level
             print(f"[TARGET SELECT] SRTM not available, using ground level")
         
@@ -2937,14 +2983,16 @@ class ModernGimbalApp(QMainWindow):
                 print(f"[TARGET SELECT] Using default gimbal angles (gimbal not connected)")
             
             # Calculate full 3D target with ray-terrain intersection
-            calculator = TargetCalculator()
+            calculator = self.target_calculator
             full_3d_result = calculator.calculate_target_3d(
                 aircraft_lat=aircraft_lat,
                 aircraft_lon=aircraft_lon,
                 aircraft_alt_agl=aircraft_alt_agl,
                 pitch_deg=gimbal_pitch,
                 yaw_deg=gimbal_yaw,
-                aircraft_heading_deg=aircraft_heading
+                aircraft_roll_deg=self.aircraft_state.get('roll', 0),
+                aircraft_pitch_deg=self.aircraft_state.get('pitch', 0),
+                aircraft_yaw_deg=aircraft_heading
             )
             
             # Extract raw estimate and terrain-corrected final coordinates
@@ -2995,9 +3043,10 @@ class ModernGimbalApp(QMainWindow):
         alt = self.aircraft_state.get('alt_amsl', 100.0)
         
         # Start loitering around target
-        success = self.mavlink.set_loiter_mode(target_lat, target_lon, alt, radius)
+        future = self.mavlink.set_loiter_mode(target_lat, target_lon, alt, radius)
         
-        if success:
+        if future is not None:
+            log_failures(future, "Gimbal tracking loiter")
             self.gimbal_tracking_active = True
             
             # CRITICAL FIX: Start gimbal locking on the target (already done above)
@@ -3047,9 +3096,10 @@ class ModernGimbalApp(QMainWindow):
             print("Error: No MAVLink connection")
             return
             
-        success = self.mavlink.set_mission_mode()
+        future = self.mavlink.set_mission_mode()
         
-        if success:
+        if future is not None:
+            log_failures(future, "Return to mission")
             # Stop any active tracking
             if self.tracker.active:
                 self.tracker.stop_tracking()
@@ -3081,6 +3131,20 @@ class ModernGimbalApp(QMainWindow):
             gimbal_pitch = self.gimbal.pitch_norm or 0.0  
             gimbal_roll = self.gimbal.roll or 0.0
         
+        # Current pointing target with its 95% error ellipse
+        target = {}
+        uncertainty = self.gimbal_current_pointing.get('uncertainty')
+        if self.gimbal_current_pointing.get('lat') is not None and uncertainty:
+            major_m, minor_m = uncertainty.ellipse_axes(CONFIDENCE_95_SCALE)
+            target = {
+                'target_latitude': self.gimbal_current_pointing['lat'],
+                'target_longitude': self.gimbal_current_pointing['lon'],
+                'target_error_major_m': major_m,
+                'target_error_minor_m': minor_m,
+                'target_error_orientation_deg': uncertainty.orientation_deg,
+                'target_cep_m': uncertainty.cep50_m
+            }
+        
         return {
             'latitude': self.aircraft_state.get('lat', 0.0),
             'longitude': self.aircraft_state.get('lon', 0.0),
@@ -3091,7 +3155,8 @@ class ModernGimbalApp(QMainWindow):
             'flight_mode': 'UNKNOWN',
             'gimbal_yaw': gimbal_yaw,
             'gimbal_pitch': gimbal_pitch,
-            'gimbal_roll': gimbal_roll
+            'gimbal_roll': gimbal_roll,
+            **target
         }
     
     def closeEvent(self, event):
@@ -3101,6 +3166,17 @@ class ModernGimbalApp(QMainWindow):
         # Finalize session logging and trigger analysis
         try:
             print("[SHUTDOWN] Finalizing session...")
+            for name, gimbal in self.gimbal_pool:
+                self.session_logger.log_link_latency(
+                    f"gimbal {name} {gimbal.ip}:{gimbal.port}",
+                    gimbal.get_latency_stats(),
+                    gimbal.get_latency_histograms()
+                )
+            self.session_logger.log_link_latency(
+                f"mavlink {self.mavlink.tx_conn_str or self.mavlink.rx_conn_str}",
+                self.mavlink.commands.get_latency_stats(),
+                self.mavlink.commands.get_latency_histograms()
+            )
             # Import to avoid circular import issues
             from gimbal_app.session_logging.session_logger import finalize_current_session
             session_dir = finalize_current_session()
@@ -3186,15 +3262,23 @@ class ModernGimbalApp(QMainWindow):
         self.gimbal_locker.stop_locking()
         time.sleep(0.1)
         
-        print("[SHUTDOWN] Stopping gimbal...")
-        self.gimbal.stop()
+        print("[SHUTDOWN] Stopping gimbals...")
+        self.gimbal_pool.shutdown()
         time.sleep(0.1)
+        shutdown_gimbal_event_loop()
         
         print("[SHUTDOWN] Stopping SBS publisher...")
         self.sbs.stop()
         time.sleep(0.1)
         
-        # MAVLinkHandler doesn't need explicit stopping
+        print("[SHUTDOWN] Stopping terrain service...")
+        if self.uncertainty_estimator:
+            self.uncertainty_estimator.stop()
+        reset_target_calculator()
+        shutdown_terrain_service()
+        
+        print("[SHUTDOWN] Stopping MAVLink receive pump...")
+        self.mavlink.close()
         
         if self.google_earth:
             print("[SHUTDOWN] Cleaning up Google Earth...")
@@ -3285,8 +3369,7 @@ class ModernGimbalApp(QMainWindow):
                 self.mouse_drag["active"] = True
                 self.mouse_drag["last_pos"] = mouse_pos
                 # Stop centering if manual control starts
-                if self.centering_active:
-                    self.centering_active = False
+                if self.gimbal.cancel_sequence("manual control"):
                     print("[UI] Manual control detected - stopping centering")
                 event.accept()
             elif event.button() == Qt.MiddleButton:
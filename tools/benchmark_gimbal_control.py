@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark gimbal angle control: jog (0x07) vs absolute (0x0E)
+
+Drives a real SiyiGimbal over UDP against the ZR10 simulator (rate- and
+acceleration-limited motors, 15 ms one-way latency, attitude stream at the
+rate SiyiGimbal requests) with the same 200 ms update cadence and 3 deg
+deadband as GimbalLocker, and reports settle time and overshoot for a set
+of step moves.
+"""
+
+import sys
+import os
+import tempfile
+import time
+import math
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.shared import GimbalLogger
+from gimbal_app.gimbal.siyi_gimbal import SiyiGimbal
+from gimbal_app.gimbal.siyi_link import shutdown_gimbal_event_loop
+from gimbal_app.gimbal.siyi_simulator import SiyiSimulator, MotorModel, LinkImpairment, wrap180
+
+UPDATE_INTERVAL_S = 0.2     # GimbalLocker.update_interval
+DEADBAND_DEG = 3.0          # GimbalLocker.angle_threshold
+SETTLE_BAND_DEG = 1.0
+STEP_WINDOW_S = 8.0
+
+# Keep the gimbal command log out of the working tree
+LOG_FILE = os.path.join(tempfile.gettempdir(), "benchmark_gimbal_control_log.txt")
+
+
+def run_step(sim, gimbal, start, target):
+    """Drive one step like GimbalLocker and return settle/overshoot metrics"""
+    sim.place(*start)
+    time.sleep(0.4)
+    t0 = time.perf_counter()
+    trace = []
+    next_update = t0
+    commands = 0
+    direction = (math.copysign(1, wrap180(target[0] - start[0])), math.copysign(1, target[1] - start[1]))
+    while time.perf_counter() - t0 < STEP_WINDOW_S:
+        now = time.perf_counter()
+        if now >= next_update:
+            next_update += UPDATE_INTERVAL_S
+            yaw_err = abs(wrap180(target[0] - (gimbal.yaw_abs or 0)))
+            pitch_err = abs(target[1] - (gimbal.pitch_norm or 0))
+            if yaw_err > DEADBAND_DEG or pitch_err > DEADBAND_DEG or commands == 0:
+                # set_angle inverts pitch for the upside-down mount
+                gimbal.set_angle(target[0], -target[1], speed=80)
+                commands += 1
+        state = sim.state()
+        yaw, pitch = state['yaw'], state['pitch']
+        trace.append((now - t0, wrap180(yaw - target[0]), pitch - target[1]))
+        time.sleep(0.005)
+
+    def settle_time(band):
+        # Last time the error was outside the band (None if it never stayed inside)
+        settle = 0.0
+        for t, ey, ep in trace:
+            if abs(ey) > band or abs(ep) > band:
+                settle = t
+        return settle if settle < STEP_WINDOW_S - 0.5 else None
+
+    overshoot_yaw = max(0.0, max(e * direction[0] for _, e, _ in trace)) if start[0] != target[0] else 0.0
+    overshoot_pitch = max(0.0, max(e * direction[1] for _, _, e in trace)) if start[1] != target[1] else 0.0
+    final = trace[-1]
+    return {
+        'settle_s': settle_time(SETTLE_BAND_DEG),
+        'settle_deadband_s': settle_time(DEADBAND_DEG),
+        'overshoot_deg': max(overshoot_yaw, overshoot_pitch),
+        'final_err_deg': max(abs(final[1]), abs(final[2])),
+        'commands': commands,
+    }
+
+
+def main():
+    print("=" * 50)
+    print("Gimbal Control Benchmark (simulated ZR10)")
+    print("=" * 50)
+
+    steps = [
+        ((0.0, -30.0), (30.0, -30.0), "yaw +30"),
+        ((90.0, -20.0), (330.0, -20.0), "yaw -120 (wrap)"),
+        ((0.0, -10.0), (0.0, -60.0), "pitch -50"),
+        ((10.0, -45.0), (55.0, -15.0), "yaw +45 / pitch +30"),
+        ((0.0, -30.0), (4.0, -30.0), "yaw +4 (small)"),
+    ]
+
+    # Quiet the per-command console output while benchmarking
+    devnull = open(os.devnull, "w")
+    sim = SiyiSimulator(motors=MotorModel(yaw_limits=None),
+                        link=LinkImpairment(latency_s=0.015), stream_hz=10).start()
+    gimbal = SiyiGimbal("127.0.0.1", sim.port, logger=GimbalLogger(LOG_FILE))
+    gimbal.start()
+    time.sleep(0.5)
+
+    results = {}
+    for mode in ("jog", "absolute"):
+        gimbal.set_control_mode(mode)
+        for start, target, label in steps:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                results[(mode, label)] = run_step(sim, gimbal, start, target)
+            finally:
+                sys.stdout = stdout
+
+    def fmt(seconds):
+        return f"{seconds:.2f}s" if seconds is not None else "never"
+
+    print(f"\nSettle = error stays within {SETTLE_BAND_DEG:.0f}° / {DEADBAND_DEG:.0f}° "
+          f"(of {STEP_WINDOW_S:.0f}s window)")
+    print(f"\n{'step':<22}{'mode':<10}{'settle 1°':>10}{'settle 3°':>10}{'overshoot':>11}{'final':>8}{'cmds':>6}")
+    print("-" * 77)
+    for _, _, label in steps:
+        for mode in ("jog", "absolute"):
+            r = results[(mode, label)]
+            print(f"{label:<22}{mode:<10}{fmt(r['settle_s']):>10}{fmt(r['settle_deadband_s']):>10}"
+                  f"{r['overshoot_deg']:>10.1f}°{r['final_err_deg']:>7.1f}°{r['commands']:>6}")
+
+    gimbal.stop()
+    sim.stop()
+    shutdown_gimbal_event_loop()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark the gimbal link and lock convergence over impaired links
+
+Runs SiyiGimbal and GimbalLocker against the ZR10 simulator under a set of
+loss/latency/jitter profiles and reports, per profile:
+  - request throughput and round-trip latency (0x0A config requests kept
+    in flight by several concurrent callers, with the normal retry policy)
+  - delivered attitude stream rate and measured loss
+  - time for GimbalLocker to bring the gimbal within its 3 deg deadband of
+    a geographic target
+Needs no hardware, so it can run in CI.
+"""
+
+import sys
+import os
+import tempfile
+import math
+import time
+import asyncio
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.shared import GimbalLogger
+from gimbal_app.gimbal.siyi_gimbal import SiyiGimbal
+from gimbal_app.gimbal.locker import GimbalLocker
+from gimbal_app.gimbal.siyi_link import shutdown_gimbal_event_loop
+from gimbal_app.gimbal.siyi_simulator import SiyiSimulator, LinkImpairment, wrap180
+
+PROFILES = [
+    ("clean", LinkImpairment()),
+    ("50ms ±10", LinkImpairment(latency_s=0.050, jitter_s=0.010)),
+    ("5% loss, 50ms", LinkImpairment(loss=0.05, latency_s=0.050, jitter_s=0.010)),
+    ("20% loss, 100ms", LinkImpairment(loss=0.20, latency_s=0.100, jitter_s=0.030)),
+]
+THROUGHPUT_S = 3.0
+CONCURRENCY = 8
+LOCK_WINDOW_S = 10.0
+DEADBAND_DEG = 3.0          # GimbalLocker.angle_threshold
+
+# Keep the gimbal command log out of the working tree
+LOG_FILE = os.path.join(tempfile.gettempdir(), "benchmark_gimbal_link_log.txt")
+
+AIRCRAFT = {'lat': 47.3977508, 'lon': 8.5455938, 'alt_agl': 100.0, 'heading': 0.0}
+# Targets as (bearing deg, distance m), inside the ZR10's +-135 deg yaw travel
+TARGETS = [(30.0, 500.0), (-100.0, 300.0), (125.0, 800.0)]
+
+
+def offset(lat, lon, bearing_deg, distance_m):
+    """Small-distance flat-earth offset (the locker computes the exact geodesic)"""
+    bearing = math.radians(bearing_deg)
+    dlat = distance_m * math.cos(bearing) / 111320.0
+    dlon = distance_m * math.sin(bearing) / (111320.0 * math.cos(math.radians(lat)))
+    return lat + dlat, lon + dlon
+
+
+def measure_throughput(gimbal):
+    """Completed config requests per second with CONCURRENCY callers"""
+    loop = gimbal.link.loop
+
+    async def caller(deadline):
+        completed = failed = 0
+        while loop.time() < deadline:
+            if await gimbal.query_config():
+                completed += 1
+            else:
+                failed += 1
+        return completed, failed
+
+    async def run():
+        deadline = loop.time() + THROUGHPUT_S
+        return await asyncio.gather(*[caller(deadline) for _ in range(CONCURRENCY)])
+
+    before = gimbal.request_stats.get(0x0A)
+    before_timeouts = before.timeouts if before else 0
+    results = asyncio.run_coroutine_threadsafe(run(), loop).result(THROUGHPUT_S + 5.0)
+    completed = sum(c for c, _ in results)
+    failed = sum(f for _, f in results)
+    latency = gimbal.get_latency_stats().get('0x0A', {})
+    return {
+        'req_per_s': completed / THROUGHPUT_S,
+        'failed': failed,
+        'timeouts': gimbal.request_stats[0x0A].timeouts - before_timeouts,
+        'p50_ms': latency.get('p50_ms'),
+        'p99_ms': latency.get('p99_ms'),
+    }
+
+
+def measure_lock(sim, gimbal, locker, bearing, distance):
+    """Seconds until the gimbal stays within the deadband of the target (None if never)"""
+    sim.place(0.0, 0.0)
+    time.sleep(0.5)
+    lat, lon = offset(AIRCRAFT['lat'], AIRCRAFT['lon'], bearing, distance)
+    locker.update_aircraft_state(dict(AIRCRAFT))
+    t0 = time.perf_counter()
+    locker.start_locking(lat, lon, 0.0)
+    required = locker.get_lock_info()['required_angles']
+    # set_angle flips pitch for the upside-down mount
+    want_yaw, want_pitch = wrap180(required['yaw']), -max(min(required['pitch'], 89.0), -89.0)
+
+    settled_at = None
+    while time.perf_counter() - t0 < LOCK_WINDOW_S:
+        state = sim.state()
+        error = max(abs(wrap180(state['yaw'] - want_yaw)), abs(state['pitch'] - want_pitch))
+        now = time.perf_counter() - t0
+        if error <= DEADBAND_DEG:
+            settled_at = now if settled_at is None else settled_at
+        else:
+            settled_at = None
+        time.sleep(0.01)
+    locker.stop_locking()
+    return settled_at
+
+
+def run_profile(profile):
+    sim = SiyiSimulator(link=profile, seed=1).start()
+    gimbal = SiyiGimbal("127.0.0.1", sim.port, logger=GimbalLogger(LOG_FILE))
+    gimbal.start()
+    locker = GimbalLocker(gimbal)
+    time.sleep(1.0)
+    try:
+        throughput = measure_throughput(gimbal)
+        lock_times = [measure_lock(sim, gimbal, locker, b, d) for b, d in TARGETS]
+        stream = gimbal.get_stream_stats()
+    finally:
+        locker.cleanup()
+        gimbal.stop()
+        time.sleep(0.2)
+        sim.stop()
+    return throughput, lock_times, stream
+
+
+def main():
+    print("=" * 50)
+    print("Gimbal Link Benchmark (ZR10 simulator)")
+    print("=" * 50)
+
+    # Quiet the per-command console output while benchmarking
+    devnull = open(os.devnull, "w")
+    results = []
+    for name, profile in PROFILES:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            results.append((name, *run_profile(profile)))
+        finally:
+            sys.stdout = stdout
+
+    def fmt(value, spec=".1f", suffix=""):
+        return f"{value:{spec}}{suffix}" if value is not None else "—"
+
+    print(f"\nThroughput: {CONCURRENCY} concurrent 0x0A callers for {THROUGHPUT_S:.0f}s")
+    print(f"{'profile':<18}{'req/s':>8}{'failed':>8}{'timeouts':>10}{'p50':>9}{'p99':>9}"
+          f"{'stream':>9}{'loss':>7}")
+    print("-" * 78)
+    for name, throughput, _, stream in results:
+        print(f"{name:<18}{throughput['req_per_s']:>8.0f}{throughput['failed']:>8}{throughput['timeouts']:>10}"
+              f"{fmt(throughput['p50_ms'], suffix='ms'):>9}{fmt(throughput['p99_ms'], suffix='ms'):>9}"
+              f"{stream['rate_hz']:>6} Hz{stream['loss'] * 100:>6.0f}%")
+
+    print(f"\nLock convergence: time to stay within {DEADBAND_DEG:.0f}° of the target "
+          f"(of {LOCK_WINDOW_S:.0f}s)")
+    header = "".join(f"{f'{b:+.0f}° {d:.0f}m':>14}" for b, d in TARGETS)
+    print(f"{'profile':<18}{header}")
+    print("-" * (18 + 14 * len(TARGETS)))
+    for name, _, lock_times, _ in results:
+        print(f"{name:<18}" + "".join(f"{fmt(t, '.2f', 's') if t is not None else 'never':>14}" for t in lock_times))
+
+    shutdown_gimbal_event_loop()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark GimbalPool scaling
+
+Runs N simulated gimbals (one UDP socket each on 127.0.0.1, streaming 0x0D
+attitude at a fixed rate and answering config/attitude requests) against
+GimbalPool (one shared socket) and against N independent SiyiGimbals (one
+socket each), and reports gimbal I/O thread CPU per gimbal and per frame.
+Each simulated gimbal reports a distinct yaw so mis-routed frames show up.
+"""
+
+import sys
+import os
+import tempfile
+import time
+import socket
+import select
+import threading
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.gimbal.gimbal_pool import GimbalPool
+from gimbal_app.shared import GimbalLogger
+from gimbal_app.gimbal.siyi_gimbal import SiyiGimbal
+from gimbal_app.gimbal.siyi_link import shutdown_gimbal_event_loop
+from gimbal_app.gimbal.siyi_protocol import (
+    SiyiFrameDecoder, encode_frame, ATTITUDE_PAYLOAD, CMD_GIMBAL_ATTITUDE, CMD_GIMBAL_CONFIG
+)
+
+STREAM_HZ = 100
+MEASURE_S = 3.0
+COUNTS = (1, 2, 4, 8, 16)
+
+# Keep the gimbal command log out of the working tree
+LOG_DIR = tempfile.gettempdir()
+
+
+class StreamingSims:
+    """N minimal gimbals served from one thread"""
+
+    def __init__(self, count, hz=STREAM_HZ):
+        self.socks = []
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(("127.0.0.1", 0))
+            self.socks.append(sock)
+        self.ports = [sock.getsockname()[1] for sock in self.socks]
+        self.peers = [None] * count
+        self.period = 1.0 / hz
+        self.sent = 0
+        self._alive = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def yaw_for(index):
+        return 10.0 * (index + 1)
+
+    def _attitude(self, index):
+        return encode_frame(CMD_GIMBAL_ATTITUDE, ATTITUDE_PAYLOAD.pack(
+            int(self.yaw_for(index) * 10), 1800 - 300, 0, 0, 0, 0))
+
+    def _run(self):
+        next_stream = time.perf_counter()
+        while self._alive:
+            timeout = max(0.0, next_stream - time.perf_counter())
+            readable, _, _ = select.select(self.socks, [], [], timeout)
+            for sock in readable:
+                index = self.socks.index(sock)
+                try:
+                    data, addr = sock.recvfrom(2048)
+                except OSError:
+                    continue
+                self.peers[index] = addr
+                decoder = SiyiFrameDecoder({
+                    CMD_GIMBAL_CONFIG: lambda f: sock.sendto(
+                        encode_frame(CMD_GIMBAL_CONFIG, bytes([0, 0, 0, 0, 1, 2]), f.seq), addr),
+                    CMD_GIMBAL_ATTITUDE: lambda f: sock.sendto(self._attitude(index), addr),
+                })
+                decoder.feed_datagram(data)
+            if time.perf_counter() >= next_stream:
+                next_stream += self.period
+                for index, sock in enumerate(self.socks):
+                    if self.peers[index]:
+                        sock.sendto(self._attitude(index), self.peers[index])
+                        self.sent += 1
+
+    def stop(self):
+        self._alive = False
+        self.thread.join(1.0)
+        for sock in self.socks:
+            sock.close()
+
+
+def gimbal_logger(name):
+    """Per-gimbal command log in the temp directory"""
+    return GimbalLogger(os.path.join(LOG_DIR, f"benchmark_gimbal_pool_{name}.txt"), name=name)
+
+
+def io_thread_cpu():
+    """CPU seconds used so far by the gimbal-io thread"""
+    for thread in threading.enumerate():
+        if thread.name == "gimbal-io":
+            return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+    return 0.0
+
+
+def run(count, shared):
+    sims = StreamingSims(count)
+    if shared:
+        pool = GimbalPool(bind=("127.0.0.1", 0))
+        gimbals = [pool.add(f"g{i}", "127.0.0.1", port, with_locker=False, logger=gimbal_logger(f"g{i}"))
+                   for i, port in enumerate(sims.ports)]
+        pool.start_all()
+    else:
+        pool = None
+        gimbals = [SiyiGimbal("127.0.0.1", port, logger=gimbal_logger(f"g{i}"))
+                   for i, port in enumerate(sims.ports)]
+        for gimbal in gimbals:
+            gimbal.start()
+    time.sleep(1.0)
+
+    frames_before = sum(g._decoder.frames for g in gimbals)
+    cpu_before, t_before = io_thread_cpu(), time.perf_counter()
+    time.sleep(MEASURE_S)
+    cpu = io_thread_cpu() - cpu_before
+    elapsed = time.perf_counter() - t_before
+    frames = sum(g._decoder.frames for g in gimbals) - frames_before
+
+    misrouted = sum(1 for i, g in enumerate(gimbals)
+                    if g.yaw_abs is None or abs(g.yaw_abs - sims.yaw_for(i)) > 0.05)
+    if pool is not None:
+        pool.stop_all()
+    else:
+        for gimbal in gimbals:
+            gimbal.stop()
+    time.sleep(0.2)
+    sims.stop()
+    return {
+        'cpu_pct': 100.0 * cpu / elapsed,
+        'cpu_per_gimbal_pct': 100.0 * cpu / elapsed / count,
+        'us_per_frame': 1e6 * cpu / frames if frames else None,
+        'frames_per_s': frames / elapsed,
+        'misrouted': misrouted,
+    }
+
+
+def main():
+    print("=" * 50)
+    print("Gimbal Pool Scaling Benchmark")
+    print("=" * 50)
+    print(f"{STREAM_HZ} Hz attitude stream per gimbal, {MEASURE_S:.0f}s per run")
+
+    # Quiet the per-gimbal console output while benchmarking
+    devnull = open(os.devnull, "w")
+    results = {}
+    for count in COUNTS:
+        for shared in (True, False):
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                results[(count, shared)] = run(count, shared)
+            finally:
+                sys.stdout = stdout
+
+    print(f"\n{'gimbals':<9}{'socket':<9}{'io CPU':>9}{'per gimbal':>12}{'us/frame':>10}{'frames/s':>10}{'misrouted':>11}")
+    print("-" * 70)
+    for count in COUNTS:
+        for shared in (True, False):
+            r = results[(count, shared)]
+            per_frame = f"{r['us_per_frame']:.1f}" if r['us_per_frame'] is not None else "—"
+            print(f"{count:<9}{'shared' if shared else 'own':<9}{r['cpu_pct']:>8.1f}%"
+                  f"{r['cpu_per_gimbal_pct']:>11.2f}%{per_frame:>10}{r['frames_per_s']:>10.0f}{r['misrouted']:>11}")
+
+    shutdown_gimbal_event_loop()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
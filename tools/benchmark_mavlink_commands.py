@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark MAVLink command delivery: fire-and-forget vs the command queue
+
+A local autopilot stand-in acknowledges COMMAND_LONG (after a fixed delay)
+and answers PARAM_SET with PARAM_VALUE, dropping a share of the commands it
+receives and of the replies it sends. A tracker-like caller repositions to
+a moving target at a fixed rate, then stops. The legacy path sends each
+reposition with command_long_send as MAVLinkHandler used to; the queue path
+calls MAVLinkHandler.reposition(). Reports how many commands went on the
+wire, how many the autopilot acted on, whether it ended at the latest
+target, and the queue's acknowledgement latency and failure counts.
+"""
+
+import sys
+import os
+import time
+import random
+import threading
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymavlink import mavutil
+from gimbal_app.mavlink.handler import MAVLinkHandler, LinkState
+
+PROFILES = [
+    ("clean, 50ms", 0.0, 0.050),
+    ("10% loss, 100ms", 0.10, 0.100),
+    ("30% loss, 150ms", 0.30, 0.150),
+]
+UPDATE_HZ = 5               # repositions per second from the caller
+RUN_S = 6.0
+DRAIN_S = 4.0               # time allowed for the last command to land
+PORT = 14672
+M = mavutil.mavlink
+
+
+class AutopilotStandIn:
+    """Heartbeats, acknowledges commands and answers parameter writes, with loss and delay"""
+
+    def __init__(self, loss, ack_delay_s, seed=1):
+        self.loss = loss
+        self.ack_delay_s = ack_delay_s
+        self.rng = random.Random(seed)
+        self.received = 0           # COMMAND_LONG/PARAM_SET that got through
+        self.repositions = []       # (lat, lon) acted on, in order
+        self.params = {}
+        self._replies = []          # (due, send callable)
+        self._alive = True
+        self.link = mavutil.mavlink_connection(f'udpout:127.0.0.1:{PORT}', source_system=1, source_component=1)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _reply(self, send):
+        if self.rng.random() >= self.loss:
+            self._replies.append((time.perf_counter() + self.ack_delay_s, send))
+
+    def _run(self):
+        next_heartbeat = 0.0
+        while self._alive:
+            now = time.perf_counter()
+            if now >= next_heartbeat:
+                next_heartbeat = now + 0.5
+                self.link.mav.heartbeat_send(2, 3, 0, 0, 4)
+            due = [r for r in self._replies if r[0] <= now]
+            if due:
+                self._replies = [r for r in self._replies if r[0] > now]
+                for _, send in due:
+                    send()
+            msg = self.link.recv_match(type=['COMMAND_LONG', 'PARAM_SET'], blocking=True, timeout=0.002)
+            if msg is None or self.rng.random() < self.loss:
+                continue
+            self.received += 1
+            if msg.get_type() == 'PARAM_SET':
+                self.params[msg.param_id] = msg.param_value
+                self._reply(lambda m=msg: self.link.mav.param_value_send(
+                    m.param_id.encode(), m.param_value, m.param_type, 1, 0))
+                continue
+            if msg.command == M.MAV_CMD_DO_REPOSITION:
+                self.repositions.append((msg.param5, msg.param6))
+            self._reply(lambda m=msg: self.link.mav.command_ack_send(m.command, M.MAV_RESULT_ACCEPTED))
+
+    def stop(self):
+        self._alive = False
+        self.thread.join(1.0)
+        self.link.close()
+
+
+def targets():
+    """A target drifting north-east, one position per update"""
+    for i in range(int(RUN_S * UPDATE_HZ)):
+        yield 47.3977508 + i * 1e-4, 8.5455938 + i * 1e-4
+
+
+def connect(handler):
+    deadline = time.time() + 5.0
+    while handler.state is not LinkState.LINKED and time.time() < deadline:
+        time.sleep(0.05)
+
+
+def run(mode, loss, delay):
+    ap = AutopilotStandIn(loss, delay)
+    handler = MAVLinkHandler(f'udpin:127.0.0.1:{PORT}', stream_profile={})
+    connect(handler)
+    last = None
+    for lat, lon in targets():
+        if mode == "legacy":
+            handler.tx_link.mav.command_long_send(
+                handler.target_sys, handler.target_comp, M.MAV_CMD_DO_REPOSITION, 0,
+                -1, 0, 0, 0, lat, lon, 100.0)
+        else:
+            handler.reposition(lat, lon, 100.0)
+        last = (lat, lon)
+        time.sleep(1.0 / UPDATE_HZ)
+    time.sleep(DRAIN_S)
+    stats = handler.get_command_stats()['commands'].get('DO_REPOSITION', {})
+    final = ap.repositions[-1] if ap.repositions else None
+    reached = final is not None and abs(final[0] - last[0]) < 1e-6 and abs(final[1] - last[1]) < 1e-6
+    handler.close()
+    ap.stop()
+    return {
+        'requested': int(RUN_S * UPDATE_HZ),
+        'acted_on': len(ap.repositions),
+        'reached_last': reached,
+        'stats': stats,
+    }
+
+
+def main():
+    print("=" * 50)
+    print("MAVLink Command Delivery Benchmark")
+    print("=" * 50)
+    print(f"{UPDATE_HZ} repositions/s for {RUN_S:.0f}s, then {DRAIN_S:.0f}s to settle")
+
+    devnull = open(os.devnull, "w")
+    rows = []
+    for name, loss, delay in PROFILES:
+        for mode in ("legacy", "queue"):
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                rows.append((name, mode, run(mode, loss, delay)))
+            finally:
+                sys.stdout = stdout
+            time.sleep(0.5)
+
+    def fmt(value, suffix="ms"):
+        return f"{value:.0f}{suffix}" if value is not None else "—"
+
+    print(f"\n{'profile':<18}{'mode':<8}{'asked':>7}{'wire':>6}{'acted':>7}{'last?':>7}"
+          f"{'merged':>8}{'acked':>7}{'t/o':>5}{'p50':>8}{'p99':>8}")
+    print("-" * 83)
+    for name, mode, r in rows:
+        s = r['stats']
+        wire = s.get('sent', 0) + s.get('retries', 0) if mode == "queue" else r['requested']
+        merged = s.get('coalesced', 0) + s.get('superseded', 0)
+        print(f"{name:<18}{mode:<8}{r['requested']:>7}{wire:>6}{r['acted_on']:>7}"
+              f"{'yes' if r['reached_last'] else 'NO':>7}"
+              + (f"{merged:>8}{s.get('accepted', 0):>7}{s.get('timeouts', 0):>5}"
+                 f"{fmt(s.get('p50_ms')):>8}{fmt(s.get('p99_ms')):>8}" if mode == "queue" else
+                 f"{'—':>8}{'?':>7}{'?':>5}{'—':>8}{'—':>8}"))
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark MAVLink telemetry reception: GUI-timer polling vs receive pump
+
+A local sender streams GLOBAL_POSITION_INT, ATTITUDE and SYS_STATUS at a
+range of rates (plus 1 Hz HEARTBEAT). The legacy path polls with
+recv_match(type=..., blocking=False) from a 100 ms timer, as
+MAVLinkHandler used to; the pump path reads MAVLinkHandler's message store
+at the same cadence. Reports how many position/attitude messages were ever
+seen, how old the value read was, and how many heartbeats were noticed.
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymavlink import mavutil
+from gimbal_app.mavlink.handler import MAVLinkHandler
+
+RATES_HZ = (10, 50, 200)
+RUN_S = 5.0
+POLL_S = 0.1                # Config.GUI_UPDATE_MS
+PORT = 14671
+
+
+class TelemetrySender:
+    """Streams telemetry to udpin:127.0.0.1:PORT with send time in time_boot_ms"""
+
+    def __init__(self, rate_hz):
+        self.period = 1.0 / rate_hz
+        self.sent = 0
+        self._alive = True
+        self.link = mavutil.mavlink_connection(f'udpout:127.0.0.1:{PORT}', source_system=1, source_component=1)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        next_send = time.perf_counter()
+        next_heartbeat = 0.0
+        while self._alive:
+            now = time.perf_counter()
+            if now >= next_heartbeat:
+                next_heartbeat = now + 1.0
+                self.link.mav.heartbeat_send(2, 3, 0, 0, 4)
+            t_ms = int(time.time() * 1000) & 0xFFFFFFFF
+            self.link.mav.global_position_int_send(t_ms, 473977508, 85455938, 500000, 100000, 0, 0, 0, 0)
+            self.link.mav.attitude_send(t_ms, 0.0, 0.0, 0.5, 0.0, 0.0, 0.0)
+            self.link.mav.sys_status_send(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+            self.sent += 1
+            next_send += self.period
+            time.sleep(max(0.0, next_send - time.perf_counter()))
+
+    def stop(self):
+        self._alive = False
+        self.thread.join(1.0)
+        self.link.close()
+
+
+def age_ms(msg):
+    return ((int(time.time() * 1000) & 0xFFFFFFFF) - msg.time_boot_ms)
+
+
+def run_legacy(rate_hz):
+    sender = TelemetrySender(rate_hz)
+    link = mavutil.mavlink_connection(f'udpin:127.0.0.1:{PORT}')
+    link.wait_heartbeat(timeout=5)
+    seen_pos, seen_att, heartbeats, ages = set(), set(), 0, []
+    t_end = time.perf_counter() + RUN_S
+    while time.perf_counter() < t_end:
+        if link.recv_match(type='HEARTBEAT', blocking=False):
+            heartbeats += 1
+        pos = link.recv_match(type='GLOBAL_POSITION_INT', blocking=False)
+        if pos:
+            seen_pos.add(pos.time_boot_ms)
+            ages.append(age_ms(pos))
+        att = link.recv_match(type='ATTITUDE', blocking=False)
+        if att:
+            seen_att.add(att.time_boot_ms)
+        time.sleep(POLL_S)
+    sender.stop()
+    link.close()
+    return len(seen_pos), len(seen_att), heartbeats, ages, sender.sent
+
+
+def run_pump(rate_hz):
+    sender = TelemetrySender(rate_hz)
+    handler = MAVLinkHandler(f'udpin:127.0.0.1:{PORT}')
+    start_counts = {t: s['count'] for t, s in handler.get_rx_stats()['types'].items()}
+    ages = []
+    t_end = time.perf_counter() + RUN_S
+    while time.perf_counter() < t_end:
+        entry = handler.get_message('GLOBAL_POSITION_INT')
+        if entry is not None:
+            ages.append(age_ms(entry.msg))
+        time.sleep(POLL_S)
+    types = handler.get_rx_stats()['types']
+    count = lambda t: types.get(t, {}).get('count', 0) - start_counts.get(t, 0)
+    sender.stop()
+    handler.close()
+    return count('GLOBAL_POSITION_INT'), count('ATTITUDE'), count('HEARTBEAT'), ages, sender.sent
+
+
+def main():
+    print("=" * 50)
+    print("MAVLink Receive Benchmark")
+    print("=" * 50)
+    print(f"{RUN_S:.0f}s per run, reader polls every {POLL_S * 1000:.0f} ms")
+
+    devnull = open(os.devnull, "w")
+    rows = []
+    for rate in RATES_HZ:
+        for name, run in (("recv_match", run_legacy), ("pump", run_pump)):
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                pos, att, hb, ages, sent = run(rate)
+            finally:
+                sys.stdout = stdout
+            ages.sort()
+            median = ages[len(ages) // 2] if ages else None
+            rows.append((rate, name, sent, pos, att, hb, median, ages[-1] if ages else None))
+            time.sleep(0.5)
+
+    print(f"\n{'rate':>6}  {'reader':<12}{'sent':>7}{'pos seen':>10}{'att seen':>10}{'hb':>5}"
+          f"{'age p50':>10}{'age max':>10}")
+    print("-" * 70)
+    for rate, name, sent, pos, att, hb, median, worst in rows:
+        fmt = lambda v: f"{v}ms" if v is not None else "—"
+        print(f"{rate:>4}Hz  {name:<12}{sent:>7}{pos:>10}{att:>10}{hb:>5}{fmt(median):>10}{fmt(worst):>10}")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
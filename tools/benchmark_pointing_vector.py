@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the gimbal pointing-vector kernel
+
+Compares the original NumPy matrix implementation (two 3x3 rotation matrices,
+a matrix product and a unit vector per call) against the closed-form kernel
+and its quantized-angle memoized variant, and checks they agree.
+"""
+
+import sys
+import os
+import math
+import time
+import random
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.calc.target_calculator import (
+    pointing_vector_ned, cached_pointing_vector_ned, POINTING_CACHE_QUANTUM_RAD
+)
+
+def _rotation_matrix(roll, pitch, yaw):
+    """Original per-call implementation (ZYX rotation matrix)."""
+    cr, sr = math.cos(roll), math.sin(roll)
+    cp, sp = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    return np.array([
+        [cy*cp, cy*sp*sr - sy*cr, cy*sp*cr + sy*sr],
+        [sy*cp, sy*sp*sr + cy*cr, sy*sp*cr - cy*sr],
+        [-sp,   cp*sr,            cp*cr           ]
+    ])
+
+def matrix_pointing_vector(gimbal_pitch, gimbal_yaw, roll, pitch, yaw):
+    R_total = _rotation_matrix(roll, pitch, yaw) @ _rotation_matrix(0.0, gimbal_pitch, gimbal_yaw)
+    return R_total @ np.array([1.0, 0.0, 0.0])
+
+def random_angles(count, seed=1):
+    rng = random.Random(seed)
+    return [(math.radians(rng.uniform(-90, 0)), math.radians(rng.uniform(-180, 180)),
+             math.radians(rng.uniform(-30, 30)), math.radians(rng.uniform(-20, 20)),
+             math.radians(rng.uniform(0, 360))) for _ in range(count)]
+
+def time_per_call(func, angle_sets, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for angles in angle_sets:
+            func(*angles)
+    return (time.perf_counter() - start) / (repeats * len(angle_sets))
+
+def main():
+    print("="*50)
+    print("Pointing Vector Micro-benchmark")
+    print("="*50)
+    
+    angle_sets = random_angles(1000)
+    
+    # Agreement check against the matrix implementation
+    max_diff = 0.0
+    max_cached_diff = 0.0
+    for angles in angle_sets:
+        reference = matrix_pointing_vector(*angles)
+        max_diff = max(max_diff, float(np.max(np.abs(reference - pointing_vector_ned(*angles)))))
+        max_cached_diff = max(max_cached_diff,
+                              float(np.max(np.abs(reference - cached_pointing_vector_ned(*angles)))))
+    print(f"\nMax |difference| vs matrix implementation:")
+    print(f"  closed form: {max_diff:.2e}")
+    print(f"  memoized:    {max_cached_diff:.2e} (quantum {POINTING_CACHE_QUANTUM_RAD:g} rad)")
+    
+    # A held target: the same few quantized attitudes repeat
+    held = random_angles(50, seed=2)
+    
+    results = [
+        ("NumPy matrices", time_per_call(matrix_pointing_vector, angle_sets, 20)),
+        ("Closed form", time_per_call(pointing_vector_ned, angle_sets, 20)),
+        ("Memoized (hits)", time_per_call(cached_pointing_vector_ned, held, 400)),
+    ]
+    
+    # Cost of the benchmark loop and a Python call with five arguments
+    overhead = time_per_call(lambda *angles: None, angle_sets, 20)
+    
+    baseline = results[0][1] - overhead
+    print(f"\n{'Kernel':<20} {'us/call':>10} {'net us':>10} {'speedup':>10}")
+    print("-" * 53)
+    for name, seconds in results:
+        net = max(seconds - overhead, 1e-9)
+        print(f"{name:<20} {seconds * 1e6:>10.3f} {net * 1e6:>10.3f} {baseline / net:>9.1f}x")
+    print(f"\n(net = minus {overhead * 1e6:.3f} us loop and call overhead)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SIYI frame encoding and decoding
+
+Compares the original implementation (bit-by-bit CRC16, bytes concatenation
+and struct.pack per frame) with the table-driven CRC and the preallocated
+SiyiFrameEncoder, and reports frames per second for encode and decode.
+"""
+
+import sys
+import os
+import struct
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.shared import crc16_ccitt
+from gimbal_app.gimbal.siyi_protocol import (
+    SiyiFrameEncoder, SiyiFrameDecoder, encode_frame, HEADER, CRC, HEADER_SIZE, STX_WORD,
+    JOG_PAYLOAD, ATTITUDE_PAYLOAD, CMD_GIMBAL_ROTATION, CMD_GIMBAL_ATTITUDE
+)
+
+def legacy_crc16(data: bytes) -> int:
+    crc = 0
+    for b in data:
+        crc ^= (b << 8) & 0xFFFF
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+class LegacyEncoder:
+    def __init__(self):
+        self.seq = 1
+
+    def create_frame(self, cmd: int, payload: bytes = b"") -> bytes:
+        stx = b"\x55\x66"
+        ctrl = b"\x00"
+        dlen = struct.pack("<H", len(payload))
+        seq = struct.pack("<H", self.seq & 0xFFFF); self.seq = (self.seq + 1) & 0xFFFF
+        body = stx + ctrl + dlen + seq + bytes([cmd]) + payload
+        return body + struct.pack("<H", legacy_crc16(body))
+
+def legacy_decode(packet: bytes):
+    if len(packet) < 12 or packet[:2] != b"\x55\x66":
+        return None
+    dlen = struct.unpack_from("<H", packet, 3)[0]
+    end = 8 + dlen
+    if legacy_crc16(packet[:end]) != struct.unpack_from("<H", packet, end)[0]:
+        return None
+    return packet[7], packet[8:end]
+
+def table_decode(packet: bytes):
+    stx, _, dlen, _, cmd = HEADER.unpack_from(packet, 0)
+    if stx != STX_WORD:
+        return None
+    end = HEADER_SIZE + dlen
+    if crc16_ccitt(packet[:end]) != CRC.unpack_from(packet, end)[0]:
+        return None
+    return cmd, packet[HEADER_SIZE:end]
+
+def rate(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+def main():
+    print("="*50)
+    print("SIYI Frame Encode/Decode Benchmark")
+    print("="*50)
+
+    legacy = LegacyEncoder()
+    encoder = SiyiFrameEncoder()
+
+    # The new encoder must produce byte-identical frames
+    legacy.seq = encoder.seq = 42
+    assert legacy.create_frame(0x07, struct.pack("<bb", 25, -40)) == \
+        encoder.encode_struct(CMD_GIMBAL_ROTATION, JOG_PAYLOAD, 25, -40)
+    assert legacy_crc16(b"123456789") == crc16_ccitt(b"123456789") == 0x31C3
+    print("\nEncoders produce identical frames (CRC check value 0x31C3)")
+
+    count = 50000
+    attitude = encode_frame(CMD_GIMBAL_ATTITUDE, ATTITUDE_PAYLOAD.pack(1234, 1800, -5, 0, 0, 0), seq=7)
+    results = [
+        ("Encode jog (legacy)", rate(lambda: legacy.create_frame(0x07, struct.pack("<bb", 25, -40)), count)),
+        ("Encode jog (encoder)", rate(lambda: encoder.encode_struct(CMD_GIMBAL_ROTATION, JOG_PAYLOAD, 25, -40), count)),
+        ("Decode attitude (legacy CRC)", rate(lambda: legacy_decode(attitude), count)),
+        ("Decode attitude (table CRC)", rate(lambda: table_decode(attitude), count)),
+    ]
+
+    # Streaming decoder with handler dispatch: one frame per datagram, then
+    # a byte stream of concatenated frames fed in 64-byte reads
+    decoder = SiyiFrameDecoder({CMD_GIMBAL_ATTITUDE: lambda frame: None})
+    results.append(("Decode datagram (decoder)", rate(lambda: decoder.feed_datagram(attitude), count)))
+    stream = attitude * 1000
+    chunks = [stream[i:i + 64] for i in range(0, len(stream), 64)]
+    start = time.perf_counter()
+    decoded = 0
+    for _ in range(count // 1000):
+        for chunk in chunks:
+            decoded += decoder.feed(chunk)
+    results.append(("Decode byte stream (decoder)", decoded / (time.perf_counter() - start)))
+    assert decoder.crc_errors == decoder.malformed == 0
+
+    print(f"\n{'Operation':<32} {'frames/s':>12}")
+    print("-" * 46)
+    for name, fps in results:
+        print(f"{name:<32} {fps:>12,.0f}")
+    print(f"\nEncode speedup: {results[1][1] / results[0][1]:.1f}x  "
+          f"Decode speedup: {results[3][1] / results[2][1]:.1f}x")
+
+if __name__ == "__main__":
+    main()
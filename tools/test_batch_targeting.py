@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test that the batch target solver agrees with the scalar one
+
+Writes a synthetic SRTM3 tile of gentle relief crossed by thin ridges (one
+post wide, 400 m high) to a temporary directory and solves the same poses
+with calculate_target_3d and calculate_targets_3d:
+  - with the SRTM service (min/max pyramid) every ray must give the same
+    fix, shallow rays grazing a ridge crest included
+  - with a terrain service that has no pyramid the batch solver falls back
+    to a fixed BATCH_STEP_M march, which must still agree with the scalar
+    pyramid solver on steep rays; on grazing rays it can step over a ridge
+    crest thinner than a step, which the pyramid path must not
+"""
+
+import sys
+import os
+import math
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.elevation import OfflineSRTMService
+from gimbal_app.calc.target_calculator import TargetCalculator
+
+TILE = "N47E008"
+TILE_SIZE = 1201
+RIDGE_SPACING = 40
+POSES = 150
+MAX_RANGE_M = 20000.0
+POST_M = math.radians(1.0 / (TILE_SIZE - 1)) * 6378137.0
+
+failures = []
+
+
+class GridTerrain:
+    """The same surface without intersect_ray: forces the fixed-step batch march"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def get_elevation(self, lat, lon):
+        return self.service.get_elevation(lat, lon)
+
+    def get_elevations(self, lats, lons):
+        return self.service.get_elevations(lats, lons)
+
+
+def check(label, ok, detail=""):
+    print(f"  {'PASS' if ok else 'FAIL'}  {label}" + (f"  ({detail})" if detail else ""))
+    if not ok:
+        failures.append(label)
+
+
+def write_ridge_tile(data_dir):
+    """Rolling relief with one-post ridges every RIDGE_SPACING rows and columns"""
+    rows, cols = np.mgrid[0:TILE_SIZE, 0:TILE_SIZE]
+    posts = 300.0 + 80.0 * np.sin(rows / 53.0) * np.cos(cols / 41.0)
+    posts[::RIDGE_SPACING, :] += 400.0
+    posts[:, ::RIDGE_SPACING] += 400.0
+    posts = np.rint(posts).astype('>i2')
+    posts.tofile(os.path.join(data_dir, f"{TILE}.hgt"))
+    return posts
+
+
+def make_poses(service, count, pitch_range, seed):
+    """(lat, lon, alt, pitch, yaw) arrays of random poses over the tile"""
+    rng = np.random.default_rng(seed)
+    lat = 47.3 + rng.uniform(0.0, 0.4, count)
+    lon = 8.3 + rng.uniform(0.0, 0.4, count)
+    alt = service.get_elevations(lat, lon) + rng.uniform(450.0, 900.0, count)
+    pitch = rng.uniform(*pitch_range, count)
+    yaw = rng.uniform(0.0, 360.0, count)
+    return lat, lon, alt, pitch, yaw
+
+
+def scalar_fixes(calculator, poses):
+    """calculate_target_3d per pose: (lat, lon) arrays, NaN where it did not converge"""
+    lats, lons = np.full(len(poses[0]), np.nan), np.full(len(poses[0]), np.nan)
+    for i, pose in enumerate(zip(*poses)):
+        result = calculator.calculate_target_3d(*map(float, pose))
+        if result.converged:
+            lats[i], lons[i] = result.target_position.lat, result.target_position.lon
+    return lats, lons
+
+
+def offsets_m(lat_a, lon_a, lat_b, lon_b):
+    """Horizontal distance between two sets of fixes (small-offset approximation)"""
+    north = np.radians(lat_a - lat_b) * 6371000.0
+    east = np.radians(lon_a - lon_b) * 6371000.0 * np.cos(np.radians(lat_b))
+    return np.hypot(north, east)
+
+
+def compare(calculator, poses, reference):
+    """(fixes where only one solver hit, max offset in metres where both hit)"""
+    batch = calculator.calculate_targets_3d(*poses)
+    ref_lat, ref_lon = reference
+    ref_hit = np.isfinite(ref_lat)
+    mismatched = int(np.count_nonzero(batch.converged != ref_hit))
+    both = batch.converged & ref_hit
+    worst = offsets_m(batch.lat[both], batch.lon[both], ref_lat[both], ref_lon[both])
+    return mismatched, float(worst.max()) if worst.size else 0.0, int(np.count_nonzero(both))
+
+
+def check_pyramid_batch(service):
+    """Batch solver with a terrain pyramid"""
+    calculator = TargetCalculator(terrain_service=service, max_range_m=MAX_RANGE_M)
+    for name, pitch_range, seed in (("steep", (-80.0, -20.0), 1), ("grazing", (-6.0, -0.5), 2)):
+        poses = make_poses(service, POSES, pitch_range, seed)
+        mismatched, worst, hits = compare(calculator, poses, scalar_fixes(calculator, poses))
+        check(f"{name} rays: same hits as the scalar solver", mismatched == 0,
+              f"{hits} hits, {mismatched} mismatched")
+        check(f"{name} rays: same fixes as the scalar solver", worst < 1e-6, f"max {worst:.2e} m")
+
+
+def check_fixed_step_batch(service):
+    """Batch solver without a terrain pyramid (fixed-step march)"""
+    scalar = TargetCalculator(terrain_service=service, max_range_m=MAX_RANGE_M)
+    pyramid = TargetCalculator(terrain_service=service, max_range_m=MAX_RANGE_M)
+    marched = TargetCalculator(terrain_service=GridTerrain(service), max_range_m=MAX_RANGE_M)
+
+    poses = make_poses(service, POSES, (-80.0, -20.0), 3)
+    mismatched, worst, hits = compare(marched, poses, scalar_fixes(scalar, poses))
+    check("steep rays: same hits as the scalar solver", mismatched == 0, f"{hits} hits, {mismatched} mismatched")
+    check("steep rays: fixes within one post of the scalar solver", worst < POST_M, f"max {worst:.2f} m")
+
+    # Grazing rays: the march may step over a ridge crest, the pyramid may not
+    poses = make_poses(service, POSES * 4, (-3.0, -0.2), 4)
+    reference = scalar_fixes(scalar, poses)
+    stepped_over, _, _ = compare(marched, poses, reference)
+    mismatched, worst, _ = compare(pyramid, poses, reference)
+    print(f"  ----  fixed-step march disagrees on {stepped_over} of {POSES * 4} grazing rays")
+    check("grazing rays: pyramid batch matches the scalar solver", mismatched == 0 and worst < 1e-6,
+          f"{mismatched} mismatched, max {worst:.2e} m")
+
+
+def main():
+    print("=" * 50)
+    print("Batch vs Scalar Targeting Test")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        posts = write_ridge_tile(data_dir)
+        print(f"\nSynthetic {TILE} ({TILE_SIZE}x{TILE_SIZE}), {posts.min()}..{posts.max()} m, "
+              f"ridges every {RIDGE_SPACING} posts")
+        service = OfflineSRTMService(data_dir=data_dir)
+        for section in (check_pyramid_batch, check_fixed_step_batch):
+            print(f"\n{section.__doc__}")
+            print("-" * 50)
+            section(service)
+
+    print("\n" + "=" * 50)
+    print("Test completed!" if not failures else f"{len(failures)} check(s) FAILED: {', '.join(failures)}")
+    return not failures
+
+
+def test_batch_targeting():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
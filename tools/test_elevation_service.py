@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from gimbal_app.elevation import OfflineSRTMService
+from gimbal_app.elevation.srtm_service import SRTM_TILE_SIZES, INTERPOLATION_MODES
 from gimbal_app.calc.target_calculator import TargetCalculator
 
 def test_elevation_service():
@@ -23,6 +24,16 @@ def test_elevation_service():
     print(f"\nSRTM Service Info:")
     print(srtm.get_coverage_info())
     
+    # Resolution is detected from the file size (see SRTM_TILE_SIZES)
+    for tile_name in sorted(srtm.available_tiles):
+        file_size = os.path.getsize(os.path.join(srtm.data_dir, f"{tile_name}.hgt"))
+        tile_size = SRTM_TILE_SIZES.get(file_size)
+        resolution = {3601: "SRTM1", 1201: "SRTM3"}.get(tile_size, f"unsupported size {file_size}")
+        print(f"  {tile_name}: {resolution}")
+    
+    # One service per sampling mode, sharing the same tiles
+    services = {mode: OfflineSRTMService(interpolation=mode) for mode in INTERPOLATION_MODES}
+    
     # Test coordinates in Switzerland area
     test_points = [
         (47.4085, 8.5490, "Zurich Airport area"),
@@ -43,6 +54,8 @@ def test_elevation_service():
         print(f"  Location: {lat:.4f}°N, {lon:.4f}°E")
         print(f"  Tile: {tile_name} ({'Available' if tile_available else 'Missing'})")
         print(f"  Elevation: {elevation:.1f}m")
+        for mode, service in services.items():
+            print(f"    {mode:<9} {service.get_elevation(lat, lon):.1f}m")
         print()
     
     # Test target calculator integration
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the WGS84 geodesy helpers
+
+Round-trips points through the conversions in gimbal_app.calc.geodesy:
+  - geodetic <-> ECEF (array and scalar paths), including the poles and
+    the antimeridian
+  - Vincenty direct <-> inverse, plus Vincenty's published Flinders Peak -
+    Buninyong example
+  - NED offsets via LocalTangentPlane and the module functions
+"""
+
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.calc.geodesy import (
+    WGS84_A, WGS84_B, LocalTangentPlane, geodetic_to_ecef, ecef_to_geodetic,
+    geodetic_to_ned, ned_to_geodetic, vincenty_inverse, vincenty_direct, _ecef_to_geodetic_scalar,
+)
+
+failures = []
+
+
+def check(label, ok, detail=""):
+    print(f"  {'PASS' if ok else 'FAIL'}  {label}" + (f"  ({detail})" if detail else ""))
+    if not ok:
+        failures.append(label)
+
+
+def dms(degrees, minutes, seconds):
+    sign = -1.0 if degrees < 0 else 1.0
+    return sign * (abs(degrees) + minutes / 60.0 + seconds / 3600.0)
+
+
+def angle_diff(a, b):
+    """Smallest difference between two angles in degrees"""
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+
+def sample_points(count=2000, seed=8):
+    """Random points plus the poles, the equator and both sides of the antimeridian"""
+    rng = np.random.default_rng(seed)
+    lats = np.concatenate([rng.uniform(-90.0, 90.0, count), [90.0, -90.0, 0.0, 0.0, 45.0, -45.0, 89.9999]])
+    lons = np.concatenate([rng.uniform(-180.0, 180.0, count), [0.0, 0.0, 180.0, -180.0, 179.9999, -179.9999, 180.0]])
+    alts = np.concatenate([rng.uniform(-500.0, 20000.0, count), [0.0, 100.0, 0.0, 5000.0, -400.0, 12000.0, 300.0]])
+    return lats, lons, alts
+
+
+def check_ecef():
+    """Geodetic <-> ECEF"""
+    x, y, z = geodetic_to_ecef(0.0, 0.0, 0.0)
+    check("equator/prime meridian on the x axis", abs(x - WGS84_A) < 1e-9 and abs(y) < 1e-9 and abs(z) < 1e-9)
+    x, y, z = geodetic_to_ecef(90.0, 0.0, 0.0)
+    check("north pole at the semi-minor axis", math.hypot(x, y) < 1e-6 and abs(z - WGS84_B) < 1e-6)
+
+    lats, lons, alts = sample_points()
+    x, y, z = geodetic_to_ecef(lats, lons, alts)
+    lat2, lon2, alt2 = ecef_to_geodetic(x, y, z)
+    # Compare positions rather than longitudes, which are undefined at the poles
+    x2, y2, z2 = geodetic_to_ecef(lat2, lon2, alt2)
+    error = np.sqrt((x2 - x) ** 2 + (y2 - y) ** 2 + (z2 - z) ** 2)
+    check("array round trip", error.max() < 1e-3, f"max {error.max() * 1000:.3f} mm")
+    check("altitude recovered", np.abs(alt2 - alts).max() < 1e-3, f"max {np.abs(alt2 - alts).max() * 1000:.3f} mm")
+    off_pole = np.abs(lats) < 89.0
+    check("longitude recovered (off the poles)", angle_diff(lon2[off_pole], lons[off_pole]).max() < 1e-9)
+
+    scalar = np.array([_ecef_to_geodetic_scalar(*p) for p in zip(x, y, z)])
+    x3, y3, z3 = geodetic_to_ecef(scalar[:, 0], scalar[:, 1], scalar[:, 2])
+    error = np.sqrt((x3 - x) ** 2 + (y3 - y) ** 2 + (z3 - z) ** 2)
+    check("scalar round trip", error.max() < 1e-3, f"max {error.max() * 1000:.3f} mm")
+
+
+def check_vincenty():
+    """Vincenty direct <-> inverse"""
+    # Vincenty (1975): Flinders Peak -> Buninyong
+    lat1, lon1 = dms(-37, 57, 3.72030), dms(144, 25, 29.52440)
+    lat2, lon2 = dms(-37, 39, 10.15610), dms(143, 55, 35.38390)
+    distance, initial, final = vincenty_inverse(lat1, lon1, lat2, lon2)
+    check("published distance", abs(distance - 54972.271) < 1e-3, f"{distance:.3f} m")
+    check("published bearings", angle_diff(initial, dms(306, 52, 5.37)) < 1e-5 and
+          angle_diff(final, dms(307, 10, 25.07)) < 1e-5, f"{initial:.6f}, {final:.6f} deg")
+    lat3, lon3, _ = vincenty_direct(lat1, lon1, initial, distance)
+    check("published destination", abs(lat3 - lat2) < 1e-8 and angle_diff(lon3, lon2) < 1e-8)
+
+    rng = np.random.default_rng(9)
+    count = 2000
+    lats = rng.uniform(-80.0, 80.0, count)
+    lons = rng.uniform(-180.0, 180.0, count)
+    bearings = rng.uniform(0.0, 360.0, count)
+    distances = 10.0 ** rng.uniform(1.0, 6.7, count)          # 10 m .. 5000 km
+    lats[:4], lons[:4], bearings[:4] = 10.0, 179.99, [90.0, 45.0, 135.0, 270.0]   # across the antimeridian
+    lat2, lon2, final = vincenty_direct(lats, lons, bearings, distances)
+    check("destinations normalised to [-180, 180)", ((lon2 >= -180.0) & (lon2 < 180.0)).all())
+    distance, initial, final2 = vincenty_inverse(lats, lons, lat2, lon2)
+    check("distance recovered", np.abs(distance - distances).max() < 1e-3,
+          f"max {np.abs(distance - distances).max() * 1000:.3f} mm")
+    check("bearings recovered", angle_diff(initial, bearings).max() < 1e-6 and angle_diff(final2, final).max() < 1e-6,
+          f"max {max(angle_diff(initial, bearings).max(), angle_diff(final2, final).max()):.1e} deg")
+
+    scalar = np.array([vincenty_inverse(*map(float, p)) for p in zip(lats, lons, lat2, lon2)])
+    # The scalar path stops iterating per point, the array path once every point has converged
+    check("scalar inverse matches array inverse", np.abs(scalar[:, 0] - distance).max() < 1e-5 and
+          angle_diff(scalar[:, 1], initial).max() < 1e-7,
+          f"max {np.abs(scalar[:, 0] - distance).max() * 1000:.4f} mm")
+    check("coincident points", vincenty_inverse(47.0, 8.0, 47.0, 8.0)[0] == 0.0)
+
+
+def check_ned():
+    """NED offsets via LocalTangentPlane"""
+    rng = np.random.default_rng(10)
+    worst = worst_module = worst_offset = 0.0
+    for lat0, lon0, alt0 in zip(*sample_points(200, seed=11)):
+        if abs(lat0) > 89.0:
+            continue
+        plane = LocalTangentPlane(lat0, lon0, alt0)
+        north, east, down = rng.uniform(-20000.0, 20000.0, 3)
+        lat, lon, alt = plane.ned_to_geodetic(north, east, down)
+        back = np.array(plane.geodetic_to_ned(lat, lon, alt))
+        worst = max(worst, np.abs(back - (north, east, down)).max())
+        module = np.array(ned_to_geodetic(north, east, down, lat0, lon0, alt0))
+        worst_module = max(worst_module, np.abs(module - (lat, lon, alt))[:2].max() * 111320.0,
+                           abs(module[2] - alt))
+        worst_offset = max(worst_offset, np.abs(np.array(geodetic_to_ned(lat, lon, alt, lat0, lon0, alt0))
+                                                - (north, east, down)).max())
+    check("LocalTangentPlane round trip", worst < 1e-3, f"max {worst * 1000:.3f} mm")
+    check("module functions round trip", worst_offset < 1e-3, f"max {worst_offset * 1000:.3f} mm")
+    check("LocalTangentPlane matches module functions", worst_module < 1e-3, f"max {worst_module * 1000:.3f} mm")
+
+    plane = LocalTangentPlane(47.4, 8.5, 500.0)
+    _, _, alt = plane.ned_to_geodetic(10000.0, 0.0, 0.0)
+    check("10 km level offset rises by the Earth's curvature", 7.0 < alt - 500.0 < 9.0, f"{alt - 500.0:.2f} m")
+
+
+def main():
+    print("=" * 50)
+    print("WGS84 Geodesy Test")
+    print("=" * 50)
+
+    for section in (check_ecef, check_vincenty, check_ned):
+        print(f"\n{section.__doc__}")
+        print("-" * 50)
+        section()
+
+    print("\n" + "=" * 50)
+    print("Test completed!" if not failures else f"{len(failures)} check(s) FAILED: {', '.join(failures)}")
+    return not failures
+
+
+def test_geodesy():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Test SRTM tile decoding and sampling on synthetic tiles
+
+Writes small synthetic .hgt files to a temporary directory and checks
+OfflineSRTMService against known post values:
+  - tile size detection (SRTM1 / SRTM3) and big-endian decoding
+  - get_elevations() against per-point get_elevation() across tiles
+  - bilinear / bicubic values at and between known posts
+  - void fill and its on-disk record (.voidfill.npz)
+  - LRU tile cache budget and background prefetch
+Needs no downloaded tiles, so it can run in CI.
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.elevation import OfflineSRTMService
+from gimbal_app.elevation.srtm_service import SRTM_VOID
+
+SRTM1, SRTM3 = 3601, 1201
+
+failures = []
+
+
+def check(label, ok, detail=""):
+    print(f"  {'PASS' if ok else 'FAIL'}  {label}" + (f"  ({detail})" if detail else ""))
+    if not ok:
+        failures.append(label)
+
+
+def write_tile(data_dir, name, posts):
+    """Write posts as a big-endian int16 .hgt file"""
+    np.asarray(posts).astype('>i2').tofile(os.path.join(data_dir, f"{name}.hgt"))
+
+
+def post_position(tile_lat, tile_lon, size, row, col):
+    """Latitude/longitude of post (row, col); row 0 is the northern edge"""
+    return tile_lat + 1 - row / (size - 1), tile_lon + col / (size - 1)
+
+
+def check_tile_detection(data_dir):
+    """Tile size detection (SRTM1 / SRTM3) and big-endian decoding"""
+    rng = np.random.default_rng(1)
+    srtm1 = rng.integers(-400, 4800, size=(SRTM1, SRTM1))
+    srtm3 = rng.integers(-400, 4800, size=(SRTM3, SRTM3))
+    write_tile(data_dir, "N47E008", srtm1)
+    write_tile(data_dir, "N47E009", srtm3)
+    write_tile(data_dir, "N47E010", np.zeros((100, 100)))      # not an SRTM size
+
+    service = OfflineSRTMService(data_dir=data_dir, interpolation="nearest")
+    tile1 = service._load_tile("N47E008")
+    tile3 = service._load_tile("N47E009")
+    check("SRTM1 detected from file size", tile1 is not None and tile1.shape == (SRTM1, SRTM1))
+    check("SRTM3 detected from file size", tile3 is not None and tile3.shape == (SRTM3, SRTM3))
+    check("unexpected file size rejected", service._load_tile("N47E010") is None)
+    check("void-free tile stays memory-mapped", isinstance(tile1, np.memmap))
+    check("SRTM1 posts decoded big-endian", np.array_equal(tile1, srtm1))
+    check("SRTM3 posts decoded big-endian", np.array_equal(tile3, srtm3))
+
+    # Known posts, including values whose two bytes differ and negative ones
+    # (the northern row and eastern column belong to the neighbouring tiles)
+    posts = [(1, 0), (1, SRTM3 - 2), (SRTM3 - 1, 0), (600, 601), (SRTM3 - 1, SRTM3 - 2)]
+    srtm3[600, 601] = 258     # 0x0102: reads as 513 if the byte order is wrong
+    srtm3[1, 0] = -5
+    write_tile(data_dir, "N47E009", srtm3)
+    service = OfflineSRTMService(data_dir=data_dir, interpolation="nearest")
+    values = [service.get_elevation(*post_position(47, 9, SRTM3, r, c)) for r, c in posts]
+    expected = [float(srtm3[r, c]) for r, c in posts]
+    check("get_elevation at posts (north-west origin)", values == expected, f"{values} vs {expected}")
+
+
+def check_batch_matches_scalar(data_dir):
+    """get_elevations() against get_elevation() across tiles"""
+    rng = np.random.default_rng(2)
+    write_tile(data_dir, "N47E008", rng.integers(0, 3000, size=(SRTM3, SRTM3)))
+    write_tile(data_dir, "N46E008", rng.integers(0, 3000, size=(SRTM3, SRTM3)))
+
+    for mode in ("nearest", "bilinear", "bicubic"):
+        service = OfflineSRTMService(data_dir=data_dir, interpolation=mode)
+        # Two tiles, a missing one (N47E009) and a non-finite point, as a 2D array
+        lats = rng.uniform(46.0, 48.0, size=(40, 25))
+        lons = rng.uniform(8.0, 10.0, size=(40, 25))
+        lats[0, 0] = np.nan
+        batch = service.get_elevations(lats, lons)
+        single = np.array([service.get_elevation(lat, lon) if np.isfinite(lat) else 0.0
+                           for lat, lon in zip(lats.ravel(), lons.ravel())]).reshape(lats.shape)
+        missing = lons >= 9.0
+        check(f"{mode}: same values as get_elevation", np.allclose(batch, single, atol=1e-9),
+              f"max diff {np.nanmax(np.abs(batch - single)):.2e} m")
+        check(f"{mode}: shape kept, missing tile and NaN read 0",
+              batch.shape == lats.shape and not batch[missing].any() and batch[0, 0] == 0.0)
+
+
+def check_interpolation(data_dir):
+    """Bilinear / bicubic values at and between known posts"""
+    rng = np.random.default_rng(3)
+    posts = rng.integers(0, 3000, size=(SRTM3, SRTM3))
+    rows, cols = np.mgrid[0:SRTM3, 0:SRTM3]
+    write_tile(data_dir, "N47E008", posts)
+    write_tile(data_dir, "N46E008", 100 + rows + 2 * cols)       # linear ramp, 100..3700 m
+
+    # Interior posts and cell centres away from the tile edges
+    r = rng.integers(2, SRTM3 - 3, size=200)
+    c = rng.integers(2, SRTM3 - 3, size=200)
+    at_posts = post_position(47, 8, SRTM3, r, c)
+    centres = post_position(47, 8, SRTM3, r + 0.5, c + 0.5)
+    ramp_points = post_position(46, 8, SRTM3, r + rng.uniform(0, 1, 200), c + rng.uniform(0, 1, 200))
+    ramp_rows = (47 - ramp_points[0]) * (SRTM3 - 1)
+    ramp_cols = (ramp_points[1] - 8) * (SRTM3 - 1)
+
+    for mode in ("bilinear", "bicubic"):
+        service = OfflineSRTMService(data_dir=data_dir, interpolation=mode)
+        values = service.get_elevations(*at_posts)
+        check(f"{mode}: post values reproduced", np.allclose(values, posts[r, c], atol=1e-6),
+              f"max diff {np.max(np.abs(values - posts[r, c])):.2e} m")
+        ramp = service.get_elevations(*ramp_points)
+        expected = 100 + ramp_rows + 2 * ramp_cols
+        check(f"{mode}: linear ramp reproduced", np.allclose(ramp, expected, atol=1e-6),
+              f"max diff {np.max(np.abs(ramp - expected)):.2e} m")
+
+    service = OfflineSRTMService(data_dir=data_dir, interpolation="bilinear")
+    values = service.get_elevations(*centres)
+    expected = (posts[r, c] + posts[r + 1, c] + posts[r, c + 1] + posts[r + 1, c + 1]) / 4.0
+    check("bilinear: cell centre is the mean of its corners", np.allclose(values, expected, atol=1e-6),
+          f"max diff {np.max(np.abs(values - expected)):.2e} m")
+
+    # Catmull-Rom at a cell centre: (-z0 + 9 z1 + 9 z2 - z3) / 16 per axis
+    service = OfflineSRTMService(data_dir=data_dir, interpolation="bicubic")
+    weights = np.array([-1.0, 9.0, 9.0, -1.0]) / 16.0
+    expected = np.array([weights @ posts[i - 1:i + 3, j - 1:j + 3] @ weights for i, j in zip(r, c)])
+    values = service.get_elevations(*centres)
+    check("bicubic: cell centre uses Catmull-Rom weights", np.allclose(values, expected, atol=1e-6),
+          f"max diff {np.max(np.abs(values - expected)):.2e} m")
+
+
+def check_void_fill(data_dir):
+    """Void fill and its on-disk record (.voidfill.npz)"""
+    rows, cols = np.mgrid[0:SRTM3, 0:SRTM3]
+    plateau = np.full((SRTM3, SRTM3), 700)
+    plateau[100:160, 200:290] = SRTM_VOID
+    plateau[900:905, 50:52] = SRTM_VOID
+    write_tile(data_dir, "N47E008", plateau)
+    ramp = 100 + rows + 2 * cols
+    ramp[400:480, 500:530] = SRTM_VOID
+    write_tile(data_dir, "N47E009", ramp)
+
+    service = OfflineSRTMService(data_dir=data_dir)
+    filled = service._load_tile("N47E008")
+    check("no voids left", filled is not None and not (filled == SRTM_VOID).any())
+    check("plateau voids fill to the plateau height", filled is not None and (filled == 700).all())
+
+    filled = service._load_tile("N47E009")
+    patch = filled[400:480, 500:530]
+    border = np.concatenate([ramp[399, 499:531], ramp[480, 499:531], ramp[399:481, 499], ramp[399:481, 530]])
+    check("ramp voids stay within the surrounding posts",
+          border.min() <= patch.min() and patch.max() <= border.max(),
+          f"{patch.min()}..{patch.max()} m within {border.min()}..{border.max()} m")
+    check("valid posts untouched", np.array_equal(np.delete(filled.ravel(), np.flatnonzero(ramp == SRTM_VOID)),
+                                                   np.delete(ramp.ravel(), np.flatnonzero(ramp == SRTM_VOID))))
+
+    fill_path = os.path.join(data_dir, "N47E009.voidfill.npz")
+    check("fill cached next to the tile", os.path.exists(fill_path))
+    if not os.path.exists(fill_path):
+        return
+    built = os.stat(fill_path).st_mtime_ns
+    reloaded = OfflineSRTMService(data_dir=data_dir)._load_tile("N47E009")
+    check("cached fill reused with identical result",
+          os.stat(fill_path).st_mtime_ns == built and np.array_equal(reloaded, filled))
+
+    # Rewriting the tile makes the cached fill stale
+    ramp[400:480, 500:530] = 1234
+    ramp[10:12, 10:12] = SRTM_VOID
+    write_tile(data_dir, "N47E009", ramp)
+    rebuilt = OfflineSRTMService(data_dir=data_dir)._load_tile("N47E009")
+    check("stale fill rebuilt after the tile changes",
+          rebuilt is not None and (rebuilt[400:480, 500:530] == 1234).all() and not (rebuilt == SRTM_VOID).any())
+
+    # Void-free tiles get a record too, so later cold loads skip the scan
+    write_tile(data_dir, "N46E008", np.full((SRTM3, SRTM3), 300))
+    clean = OfflineSRTMService(data_dir=data_dir)._load_tile("N46E008")
+    check("void-free tile recorded and left mapped",
+          os.path.exists(os.path.join(data_dir, "N46E008.voidfill.npz")) and isinstance(clean, np.memmap))
+
+    # A void slipped in behind the record's back (same size and mtime) is not looked for
+    tile_path = os.path.join(data_dir, "N46E008.hgt")
+    source = os.stat(tile_path)
+    with open(tile_path, "r+b") as f:
+        f.seek(2 * (600 * SRTM3 + 600))
+        f.write(np.array([SRTM_VOID], dtype='>i2').tobytes())
+    os.utime(tile_path, ns=(source.st_atime_ns, source.st_mtime_ns))
+    reloaded = OfflineSRTMService(data_dir=data_dir)._load_tile("N46E008")
+    check("cold load trusts a current record without scanning",
+          isinstance(reloaded, np.memmap) and reloaded[600, 600] == SRTM_VOID)
+
+
+def wait_for(condition, timeout_s=30.0):
+    """Poll condition() until it holds or timeout_s passes"""
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def check_cache_and_prefetch(data_dir):
+    """LRU tile cache budget and background prefetch"""
+    for name in ("N47E008", "N47E009", "N47E010", "N48E008", "N48E009", "N45E008"):
+        write_tile(data_dir, name, np.full((SRTM3, SRTM3), 500))
+    budget = 2 * SRTM3 * SRTM3 * 2      # two SRTM3 tiles
+
+    service = OfflineSRTMService(data_dir=data_dir, cache_budget_bytes=budget)
+    service._load_tile("N47E008")
+    service._load_tile("N47E009")
+    service._load_tile("N47E008")       # touch: N47E009 is now the oldest
+    service._load_tile("N47E010")
+    stats = service.get_cache_stats()
+    check("least recently used tile evicted", stats['tiles'] == ["N47E008", "N47E010"], f"{stats['tiles']}")
+    check("cache within budget", stats['bytes'] <= budget, f"{stats['bytes']} of {budget} bytes")
+
+    # Heading east from near the E009 boundary: the tile ahead is prefetched
+    service = OfflineSRTMService(data_dir=data_dir, cache_budget_bytes=budget)
+    service.start_prefetch(radius_m=1000.0, lookahead_m=5000.0)
+    service.update_aircraft_state({'lat': 47.5, 'lon': 8.98, 'heading': 90.0})
+    loaded = wait_for(lambda: {"N47E008", "N47E009"} <= set(service.pyramid_cache))
+    stats = service.get_cache_stats()
+    check("tiles around and ahead prefetched with pyramids", loaded, f"{stats['tiles']}")
+    check("tiles off the track not loaded", "N45E008" not in stats['tiles'] and "N47E010" not in stats['tiles'])
+
+    # Four tiles around a corner, room for two: the prefetcher stays within budget
+    service.update_aircraft_state({'lat': 47.99, 'lon': 8.99, 'heading': 0.0})
+    time.sleep(1.0)
+    worker = service._prefetch_thread
+    check("stop_prefetch waits for the worker", service.stop_prefetch() and not worker.is_alive())
+
+    # Restarting right after a stop that has not finished still leaves one worker
+    service.start_prefetch()
+    service.stop_prefetch(timeout_s=0.0)
+    service.start_prefetch()
+    workers = [t for t in threading.enumerate() if t.name == "srtm-prefetch"]
+    check("restart runs a single worker", len(workers) == 1, f"{len(workers)} running")
+    service.stop_prefetch()
+    stats = service.get_cache_stats()
+    check("prefetch stays within budget", stats['bytes'] <= budget and "N47E008" in stats['tiles'],
+          f"{stats['tiles']}, {stats['bytes']} of {budget} bytes")
+
+
+def main():
+    print("=" * 50)
+    print("SRTM Tile Decoding and Sampling Test")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as root:
+        for section in (check_tile_detection, check_batch_matches_scalar, check_interpolation,
+                        check_void_fill, check_cache_and_prefetch):
+            print(f"\n{section.__doc__}")
+            print("-" * 50)
+            section(tempfile.mkdtemp(dir=root))
+
+    print("\n" + "=" * 50)
+    print("Test completed!" if not failures else f"{len(failures)} check(s) FAILED: {', '.join(failures)}")
+    return not failures
+
+
+def test_srtm_tiles():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
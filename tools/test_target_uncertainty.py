@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the Monte Carlo target uncertainty against closed-form cases
+
+Over flat terrain a single error source has a known effect on the fix:
+  - a horizontal GPS error of sigma per axis moves the target by the same
+    offset, so the fixes form a circular Gaussian with CEP50 = sigma *
+    sqrt(2 ln 2) (~1.1774 sigma)
+  - an altitude error of sigma seen at a 45 degree depression moves the
+    target by the same distance along the line of sight, so the ellipse
+    degenerates to a line of 1-sigma half-length sigma along the gimbal yaw
+"""
+
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.calc.target_calculator import TargetCalculator, TargetingSigmas
+
+TERRAIN_ALT_M = 400.0
+HEIGHT_M = 300.0
+SAMPLES = 4000
+CEP50_PER_SIGMA = math.sqrt(2.0 * math.log(2.0))
+
+failures = []
+
+
+class FlatTerrain:
+    """Terrain service with the same elevation everywhere"""
+
+    def get_elevation(self, lat, lon):
+        return TERRAIN_ALT_M
+
+    def get_elevations(self, lats, lons):
+        return np.full(np.shape(lats), TERRAIN_ALT_M)
+
+
+def check(label, ok, detail=""):
+    print(f"  {'PASS' if ok else 'FAIL'}  {label}" + (f"  ({detail})" if detail else ""))
+    if not ok:
+        failures.append(label)
+
+
+def only(**sigmas):
+    """TargetingSigmas with every source but the given ones set to zero"""
+    zero = dict(gps_horizontal_m=0.0, altitude_m=0.0, attitude_deg=0.0,
+                heading_deg=0.0, gimbal_deg=0.0, dem_m=0.0)
+    zero.update(sigmas)
+    return TargetingSigmas(**zero)
+
+
+def check_gps_cep(calculator):
+    """GPS horizontal error only: CEP50 = 1.1774 sigma"""
+    for sigma in (2.5, 10.0):
+        result = calculator.estimate_uncertainty(
+            47.4, 8.5, TERRAIN_ALT_M + HEIGHT_M, -30.0, 20.0,
+            sigmas=only(gps_horizontal_m=sigma), samples=SAMPLES, rng=np.random.default_rng(1)
+        )
+        if result is None:
+            check(f"sigma {sigma} m: estimate available", False)
+            continue
+        expected = CEP50_PER_SIGMA * sigma
+        check(f"sigma {sigma} m: CEP50", abs(result.cep50_m - expected) < 0.05 * expected,
+              f"{result.cep50_m:.3f} m, expected {expected:.3f} m")
+        check(f"sigma {sigma} m: circular 1-sigma ellipse",
+              abs(result.semi_major_m - sigma) < 0.05 * sigma and abs(result.semi_minor_m - sigma) < 0.05 * sigma,
+              f"{result.semi_major_m:.3f} x {result.semi_minor_m:.3f} m")
+        bias = math.hypot(result.bias_north_m, result.bias_east_m)
+        check(f"sigma {sigma} m: unbiased, every sample hits",
+              bias < 4.0 * sigma / math.sqrt(SAMPLES) and result.hit_fraction == 1.0,
+              f"bias {bias:.3f} m, hits {result.hit_fraction:.0%}")
+
+
+def check_altitude_line(calculator):
+    """Altitude error only at 45 degrees: a line along the gimbal yaw"""
+    sigma = 3.0
+    yaw = 60.0
+    result = calculator.estimate_uncertainty(
+        47.4, 8.5, TERRAIN_ALT_M + HEIGHT_M, -45.0, yaw,
+        sigmas=only(altitude_m=sigma), samples=SAMPLES, rng=np.random.default_rng(2)
+    )
+    if result is None:
+        check("estimate available", False)
+        return
+    check("semi-major equals the altitude sigma", abs(result.semi_major_m - sigma) < 0.05 * sigma,
+          f"{result.semi_major_m:.3f} m")
+    check("semi-minor vanishes", result.semi_minor_m < 0.01 * sigma, f"{result.semi_minor_m:.4f} m")
+    check("major axis along the gimbal yaw", abs(result.orientation_deg - yaw) < 0.5,
+          f"{result.orientation_deg:.2f} deg")
+
+
+def main():
+    print("=" * 50)
+    print("Target Uncertainty Test")
+    print("=" * 50)
+
+    calculator = TargetCalculator(terrain_service=FlatTerrain())
+    for section in (check_gps_cep, check_altitude_line):
+        print(f"\n{section.__doc__}")
+        print("-" * 50)
+        section(calculator)
+
+    print("\n" + "=" * 50)
+    print("Test completed!" if not failures else f"{len(failures)} check(s) FAILED: {', '.join(failures)}")
+    return not failures
+
+
+def test_target_uncertainty():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test the min/max pyramid ray march against a brute-force march
+
+Writes a steep synthetic SRTM3 tile (1000 m cliffs between plateaus, the
+case where Catmull-Rom overshoots the posts by tens of metres) to a
+temporary directory, then casts shallow rays with the pyramid solver and
+with a fine fixed-step march over the same interpolated surface. Every
+ray must agree to within one post spacing; a brute-force hit the pyramid
+misses is only excused when it is a sliver, i.e. the ray is below the
+surface for less than the pyramid's half-post sample spacing (it clips a
+cliff edge between two samples). As a sensitivity check, the bicubic surface is
+also marched with pyramid bounds taken from the corner posts only, which
+must miss some of the crossings.
+"""
+
+import sys
+import os
+import math
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gimbal_app.elevation import OfflineSRTMService
+from gimbal_app.elevation.terrain_pyramid import TerrainPyramid
+from gimbal_app.calc.geodesy import LocalTangentPlane
+
+TILE = "N47E008"
+TILE_SIZE = 1201
+RAYS = 200
+MAX_RANGE_M = 20000.0
+BRUTE_STEPS_PER_POST = 16
+POST_M = math.radians(1.0 / (TILE_SIZE - 1)) * 6378137.0
+
+
+def write_steep_tile(data_dir):
+    """Plateaus of 0/1000 m on a 6-post checkerboard plus rolling relief"""
+    rng = np.random.default_rng(5)
+    blocks = rng.integers(0, 2, size=(TILE_SIZE // 6 + 1, TILE_SIZE // 6 + 1))
+    plateaus = np.kron(blocks, np.ones((6, 6)))[:TILE_SIZE, :TILE_SIZE] * 1000.0
+    rows, cols = np.mgrid[0:TILE_SIZE, 0:TILE_SIZE]
+    relief = 150.0 * np.sin(rows / 37.0) * np.cos(cols / 23.0)
+    posts = np.rint(500.0 + plateaus + relief).astype('>i2')
+    posts.tofile(os.path.join(data_dir, f"{TILE}.hgt"))
+    return posts
+
+
+def brute_force(service, lat0, lon0, alt0, direction):
+    """First crossing by fixed-step march and bisection: (t, chord length) or None"""
+    north, east, down = direction
+    dlat_dt, dlon_dt, curvature = LocalTangentPlane(lat0, lon0, alt0).ray_coefficients(north, east)
+    step = POST_M / BRUTE_STEPS_PER_POST
+    t_end = MAX_RANGE_M / math.hypot(north, east)
+    ts = np.arange(0.0, t_end, step)
+    ray = alt0 - down * ts + curvature * ts * ts
+    clearance = ray - service.get_elevations(lat0 + ts * dlat_dt, lon0 + ts * dlon_dt)
+    below = np.flatnonzero(clearance <= 0.0)
+    if below.size == 0:
+        return None
+    i = int(below[0])
+    lo, hi = ts[max(i - 1, 0)], ts[i]
+    for _ in range(40):
+        mid = 0.5 * (lo + hi)
+        alt = alt0 - down * mid + curvature * mid * mid
+        if alt - service.get_elevation(lat0 + mid * dlat_dt, lon0 + mid * dlon_dt) > 0:
+            lo = mid
+        else:
+            hi = mid
+    # How long the ray stays below the surface
+    above = np.flatnonzero(clearance[i:] > 0.0)
+    chord = (above[0] if above.size else ts.size - i) * step
+    return hi, chord
+
+
+def make_rays(service, count, seed=11):
+    rng = np.random.default_rng(seed)
+    rays = []
+    while len(rays) < count:
+        lat = 47.3 + rng.uniform(0.0, 0.4)
+        lon = 8.3 + rng.uniform(0.0, 0.4)
+        alt = service.get_elevation(lat, lon) + rng.uniform(30.0, 600.0)
+        pitch = math.radians(rng.uniform(-8.0, -0.3))
+        azimuth = math.radians(rng.uniform(0.0, 360.0))
+        direction = (math.cos(pitch) * math.cos(azimuth), math.cos(pitch) * math.sin(azimuth), -math.sin(pitch))
+        rays.append((lat, lon, alt, direction))
+    return rays
+
+
+def compare(service, rays):
+    """Count rays where the pyramid disagrees with the brute-force march"""
+    hits = disagreements = slivers = 0
+    for lat, lon, alt, direction in rays:
+        pyramid_hit = service.intersect_ray(lat, lon, alt, direction, MAX_RANGE_M, 0.5)
+        reference = brute_force(service, lat, lon, alt, direction)
+        if reference is None:
+            if pyramid_hit is not None:
+                disagreements += 1
+            continue
+        hits += 1
+        t_ref, chord = reference
+        if pyramid_hit is not None and abs(pyramid_hit[3] - t_ref) <= POST_M:
+            continue
+        if chord < 0.5 * POST_M:
+            slivers += 1
+        else:
+            disagreements += 1
+    return hits, disagreements, slivers
+
+
+def main():
+    print("=" * 50)
+    print("Terrain Pyramid vs Brute-Force March")
+    print("=" * 50)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as data_dir:
+        posts = write_steep_tile(data_dir)
+        print(f"\nSynthetic {TILE} ({TILE_SIZE}x{TILE_SIZE}), "
+              f"{posts.min()}..{posts.max()} m, {RAYS} shallow rays")
+        print("-" * 50)
+
+        for mode in ("bilinear", "bicubic"):
+            service = OfflineSRTMService(data_dir=data_dir, interpolation=mode)
+            rays = make_rays(service, RAYS)
+            hits, disagreements, slivers = compare(service, rays)
+            ok = disagreements == 0
+            failures += not ok
+            print(f"{mode:<9} hits {hits:>4}  disagreements {disagreements:>3}  "
+                  f"slivers {slivers:>3}  {'PASS' if ok else 'FAIL'}")
+
+        # Corner-post bounds under a bicubic surface: the old behaviour
+        service = OfflineSRTMService(data_dir=data_dir, interpolation="bicubic")
+        service.pyramid_cache[TILE] = TerrainPyramid.build(service._load_tile(TILE), interpolation="bilinear")
+        _, disagreements, _ = compare(service, make_rays(service, RAYS))
+        ok = disagreements > 0
+        failures += not ok
+        print(f"{'corner-bounds bicubic':<9} disagreements {disagreements:>3}  "
+              f"{'PASS (overshoot detected)' if ok else 'FAIL (test not sensitive)'}")
+
+    print("\n" + "=" * 50)
+    print("Test completed!" if not failures else f"{failures} check(s) FAILED")
+    return failures == 0
+
+
+def test_terrain_pyramid():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)